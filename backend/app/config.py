@@ -14,10 +14,92 @@ load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 # Database URL (SQLAlchemy or any DB)
-DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./resume_evaluation.db")
+
+# Connection pool sizing for server databases (ignored for SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# How long SQLite writers wait for a lock before failing, in milliseconds
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
 
 # Frontend URL for CORS
 FRONTEND_URL = os.getenv("FRONTEND_URL", "*")
 
+# Embedding backend: "torch", "onnx" (ONNX Runtime) or "int8" (dynamically quantized)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+
+# On-disk embedding cache (SQLite); empty string keeps it in memory only
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "data/embedding_cache.db")
+
+# Store cached embeddings in a memory-mapped matrix instead: "float32", "float16" or "int8";
+# empty keeps float32 blobs in SQLite. Also used by the numpy candidate index
+EMBEDDING_STORE_DTYPE = os.getenv("EMBEDDING_STORE_DTYPE", "")
+
+# Nearest-neighbour index of resume embeddings (chromadb, else a memory-mapped matrix); empty keeps it in memory
+CANDIDATE_INDEX_PATH = os.getenv("CANDIDATE_INDEX_PATH", "data/candidate_index")
+
+# Top-K ranking fully scores this many nearest neighbours per requested candidate
+CANDIDATE_SHORTLIST_FACTOR = int(os.getenv("CANDIDATE_SHORTLIST_FACTOR", "4"))
+
+# Corpus-level TF-IDF model used for keyword similarity
+KEYWORD_MODEL_PATH = os.getenv("KEYWORD_MODEL_PATH", "data/keyword_model.joblib")
+
+# PDF text extraction: per-document budget (0 disables a limit) and page-range threads
+# for long documents (1 keeps extraction on the calling thread)
+PDF_EXTRACT_MAX_SECONDS = float(os.getenv("PDF_EXTRACT_MAX_SECONDS", "20"))
+PDF_EXTRACT_MAX_CHARS = int(os.getenv("PDF_EXTRACT_MAX_CHARS", "500000"))
+PDF_PAGE_WORKERS = int(os.getenv("PDF_PAGE_WORKERS", "1"))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+
+# Cache of extracted file text keyed by file SHA-256 (SQLite); empty disables it
+EXTRACTED_TEXT_CACHE_PATH = os.getenv("EXTRACTED_TEXT_CACHE_PATH", "data/extracted_text.db")
+EXTRACTED_TEXT_CACHE_MAX_MB = int(os.getenv("EXTRACTED_TEXT_CACHE_MAX_MB", "512"))
+
+# Skill dictionary used by the resume and JD parsers; empty uses the bundled one
+SKILL_TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH", "")
+
+# Background evaluation queue
+EVALUATION_QUEUE_PATH = os.getenv("EVALUATION_QUEUE_PATH", "data/evaluation_jobs.db")
+EVALUATION_WORKERS = int(os.getenv("EVALUATION_WORKERS", "2"))
+EVALUATION_QUEUE_MAX_PENDING = int(os.getenv("EVALUATION_QUEUE_MAX_PENDING", "100"))
+# Seconds a running job stays claimed without a heartbeat before another process may retry it
+EVALUATION_JOB_LEASE_SECONDS = float(os.getenv("EVALUATION_JOB_LEASE_SECONDS", "60"))
+
+# Load spaCy and embedding models at import time (before workers fork)
+PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "False").lower() in ("true", "1", "t")
+
 # Other configurable settings
 DEBUG = os.getenv("DEBUG", "False").lower() in ("true", "1", "t")
+
+# LLM feedback is only generated when explicitly enabled and a key is set
+ENABLE_LLM = os.getenv("ENABLE_LLM", "True").lower() in ("true", "1", "t")
+
+# Server
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+
+# Scoring weights and verdict thresholds
+HARD_MATCH_WEIGHT = float(os.getenv("HARD_MATCH_WEIGHT", "0.4"))
+SEMANTIC_MATCH_WEIGHT = float(os.getenv("SEMANTIC_MATCH_WEIGHT", "0.6"))
+HIGH_SUITABILITY_THRESHOLD = float(os.getenv("HIGH_SUITABILITY_THRESHOLD", "80.0"))
+MEDIUM_SUITABILITY_THRESHOLD = float(os.getenv("MEDIUM_SUITABILITY_THRESHOLD", "60.0"))
+
+
+class Settings:
+    """Attribute-style access to the settings above, as used by services and evaluators."""
+
+    openai_api_key = OPENAI_API_KEY
+    enable_llm = ENABLE_LLM
+    database_url = DATABASE_URL
+    host = HOST
+    port = PORT
+    debug = DEBUG
+    hard_match_weight = HARD_MATCH_WEIGHT
+    semantic_match_weight = SEMANTIC_MATCH_WEIGHT
+    high_suitability_threshold = HIGH_SUITABILITY_THRESHOLD
+    medium_suitability_threshold = MEDIUM_SUITABILITY_THRESHOLD
+
+
+settings = Settings()
@@ -1,19 +1,174 @@
 """Database setup and session management."""
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, delete, event, func, insert, inspect, select, text, update
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
-from backend.app.config import settings
-from backend.app.models.database import Base
+from app.config import (
+    settings,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_RECYCLE,
+    SQLITE_BUSY_TIMEOUT_MS
+)
+from app.models.database import (
+    Base,
+    JobDescription,
+    Resume,
+    ResumeEvaluation,
+    ResumeSkill,
+    EvaluationMissingSkill
+)
+from app.evaluators.skill_index import normalized_skills
+
+def build_engine(database_url: str):
+    """Create an engine tuned for the database backend.
+
+    SQLite connections run in WAL mode with a busy timeout so several
+    uvicorn workers can read while one writes; server databases get a
+    sized, pre-pinged connection pool.
+    """
+    if make_url(database_url).get_backend_name() == "sqlite":
+        sqlite_engine = create_engine(
+            database_url,
+            connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+        )
+
+        @event.listens_for(sqlite_engine, "connect")
+        def _configure_sqlite(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+
+        return sqlite_engine
+
+    return create_engine(
+        database_url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True
+    )
 
 # Create database engine
-engine = create_engine(settings.database_url, connect_args={"check_same_thread": False})
+engine = build_engine(settings.database_url)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def create_tables():
     """Create all database tables."""
+    existing_tables = set(inspect(engine).get_table_names())
     Base.metadata.create_all(bind=engine)
+    upgrade_schema()
+    if not {ResumeSkill.__tablename__, EvaluationMissingSkill.__tablename__} <= existing_tables:
+        backfill_skill_tables()
+
+# Columns that refer to resume and job description rows: (repointed to the row a
+# duplicate is merged into, deleted with the duplicate)
+DUPLICATE_REFERENCES = {
+    Resume.__tablename__: (
+        [ResumeEvaluation.__table__.c.resume_id, EvaluationMissingSkill.__table__.c.resume_id],
+        [ResumeSkill.__table__.c.resume_id]
+    ),
+    JobDescription.__tablename__: (
+        [ResumeEvaluation.__table__.c.job_description_id, EvaluationMissingSkill.__table__.c.job_description_id],
+        []
+    )
+}
+
+def upgrade_schema():
+    """Bring tables created by an older version up to date.
+
+    ``create_all`` skips tables that already exist, so nullable columns and
+    indexes added to the models since then are created here. An index that
+    has become unique is rebuilt after merging the rows that share its key.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns and column.nullable:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+            existing_indexes = {index['name']: index for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                existing = existing_indexes.get(index.name)
+                if index.unique and existing is not None and not existing['unique']:
+                    collapse_duplicates(conn, index)
+                    index.drop(bind=conn)
+                index.create(bind=conn, checkfirst=True)
+
+def collapse_duplicates(conn, index):
+    """Merge rows sharing a key of the single-column ``index`` into the oldest one.
+
+    References listed in ``DUPLICATE_REFERENCES`` are pointed at the kept row
+    and rows owned by a duplicate are deleted with it.
+    """
+    table = index.table
+    key = next(iter(index.columns))
+    repointed, owned = DUPLICATE_REFERENCES.get(table.name, ([], []))
+    groups = conn.execute(
+        select(key, func.min(table.c.id)).where(key.isnot(None)).group_by(key).having(func.count() > 1)
+    ).fetchall()
+    for value, keep_id in groups:
+        duplicate_ids = conn.execute(
+            select(table.c.id).where(key == value, table.c.id != keep_id)
+        ).scalars().all()
+        for column in repointed:
+            conn.execute(update(column.table).where(column.in_(duplicate_ids)).values({column.name: keep_id}))
+        for column in owned:
+            conn.execute(delete(column.table).where(column.in_(duplicate_ids)))
+        conn.execute(delete(table).where(table.c.id.in_(duplicate_ids)))
+
+def backfill_skill_tables(batch_size: int = 1000):
+    """Populate the normalized skill tables from the JSON skill columns.
+
+    Runs once, when the tables are first created on an existing database.
+    """
+    def flush(model, rows):
+        if rows:
+            db.execute(insert(model), rows)
+            rows.clear()
+
+    db = SessionLocal()
+    try:
+        skill_rows = []
+        for resume_id, skills in db.query(Resume.id, Resume.skills).yield_per(batch_size):
+            for skill in normalized_skills(skills):
+                skill_rows.append({'resume_id': resume_id, 'skill': skill})
+            if len(skill_rows) >= batch_size:
+                flush(ResumeSkill, skill_rows)
+        flush(ResumeSkill, skill_rows)
+
+        missing_rows = []
+        evaluations = db.query(
+            ResumeEvaluation.id, ResumeEvaluation.job_description_id,
+            ResumeEvaluation.resume_id, ResumeEvaluation.missing_skills
+        ).yield_per(batch_size)
+        for evaluation_id, job_description_id, resume_id, missing_skills in evaluations:
+            for skill in normalized_skills(missing_skills):
+                missing_rows.append({
+                    'evaluation_id': evaluation_id,
+                    'job_description_id': job_description_id,
+                    'resume_id': resume_id,
+                    'skill': skill
+                })
+            if len(missing_rows) >= batch_size:
+                flush(EvaluationMissingSkill, missing_rows)
+        flush(EvaluationMissingSkill, missing_rows)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
 
 def get_db():
     """Get database session."""
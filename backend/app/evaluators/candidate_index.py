@@ -0,0 +1,108 @@
+"""Nearest-neighbour index over resume embeddings for shortlisting candidates."""
+
+import os
+import re
+from typing import Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.evaluators.embedding_store import EmbeddingMatrix
+
+try:
+    import chromadb
+except ImportError:
+    chromadb = None
+
+
+class CandidateIndex:
+    """Approximate nearest-neighbour lookup of resumes by embedding.
+
+    Backed by a persistent chromadb HNSW collection (cosine space) when
+    chromadb is installed and ``path`` is set; otherwise an exact search
+    over an ``EmbeddingMatrix`` of normalized vectors is used, memory-mapped
+    under ``path`` (or in memory without one) and stored as ``dtype``. One
+    collection is kept per embedding model so vectors from different models
+    are never compared.
+    """
+
+    def __init__(self, model_name: str, path: Optional[str] = None, dtype: str = 'float32'):
+        """Open the index for ``model_name`` at ``path`` (``None`` keeps it in memory)."""
+        self.model_name = model_name
+        self._collection = None
+        self._matrix: Optional[EmbeddingMatrix] = None
+        name = re.sub(r'[^A-Za-z0-9._-]', '-', f"resumes_{model_name}")[:63]
+
+        if path and chromadb is not None:
+            client = chromadb.PersistentClient(path=path)
+            self._collection = client.get_or_create_collection(name, metadata={"hnsw:space": "cosine"})
+        else:
+            self._matrix = EmbeddingMatrix(os.path.join(path, f"{name}.{dtype}") if path else None, dtype=dtype)
+
+    @property
+    def backend(self) -> str:
+        """``'chromadb'`` or ``'numpy'``."""
+        return "chromadb" if self._collection is not None else "numpy"
+
+    def __len__(self) -> int:
+        """Number of indexed resumes."""
+        if self._collection is not None:
+            return self._collection.count()
+        return len(self._matrix)
+
+    def ids(self) -> Set[int]:
+        """Resume ids currently in the index."""
+        if self._collection is not None:
+            return {int(resume_id) for resume_id in self._collection.get(include=[])['ids']}
+        return {int(resume_id) for resume_id in self._matrix.keys()}
+
+    def add(self, resume_ids: List[int], embeddings: np.ndarray):
+        """Insert or replace the vectors of ``resume_ids``."""
+        if not resume_ids:
+            return
+        embeddings = np.asarray(embeddings, dtype=np.float32).reshape(len(resume_ids), -1)
+
+        if self._collection is not None:
+            self._collection.upsert(
+                ids=[str(resume_id) for resume_id in resume_ids],
+                embeddings=embeddings.tolist()
+            )
+            return
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self._matrix.add([str(resume_id) for resume_id in resume_ids], embeddings / norms)
+
+    def remove(self, resume_ids: Iterable[int]):
+        """Drop resumes from the index."""
+        resume_ids = list(resume_ids)
+        if self._collection is not None:
+            if resume_ids:
+                self._collection.delete(ids=[str(resume_id) for resume_id in resume_ids])
+            return
+
+        self._matrix.remove(str(resume_id) for resume_id in resume_ids)
+
+    def query(self, embedding: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """The ``k`` resumes closest to ``embedding`` as ``(resume_id, cosine_similarity)``, best first."""
+        embedding = np.asarray(embedding, dtype=np.float32).ravel()
+
+        if self._collection is not None:
+            k = min(k, self._collection.count())
+            if k <= 0:
+                return []
+            result = self._collection.query(query_embeddings=[embedding.tolist()], n_results=k, include=["distances"])
+            # Cosine space distances are 1 - similarity
+            return [
+                (int(resume_id), 1.0 - float(distance))
+                for resume_id, distance in zip(result['ids'][0], result['distances'][0])
+            ]
+
+        row_keys, similarities = self._matrix.dot(embedding / (np.linalg.norm(embedding) or 1.0))
+        live = np.array([key is not None for key in row_keys], dtype=bool)
+        similarities[~live] = -np.inf
+        k = min(k, int(live.sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        return [(int(row_keys[row]), float(similarities[row])) for row in top]
@@ -0,0 +1,181 @@
+"""Content-addressed embedding cache with an in-process LRU and a SQLite or memory-mapped store."""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.evaluators.embedding_store import EmbeddingMatrix
+
+
+class EmbeddingCache:
+    """Cache sentence embeddings keyed by the SHA-256 of the embedded text.
+
+    Lookups hit a bounded in-memory LRU first and fall back to a SQLite table
+    on disk. Every row records the model name and version that produced it, so
+    switching models never serves stale vectors.
+
+    With ``store_dtype`` set (``'float32'``, ``'float16'`` or ``'int8'``) the
+    on-disk store is an ``EmbeddingMatrix`` next to ``path`` instead, one
+    file per model and version, so vectors are kept compact and read
+    through a memory map rather than as per-row blobs.
+    """
+
+    def __init__(self, model_name: str, model_version: str, path: Optional[str] = None, max_memory_items: int = 4096,
+                 store_dtype: Optional[str] = None):
+        """Open (or create) the on-disk store at ``path``; ``None`` keeps the cache in memory only."""
+        self.model_name = model_name
+        self.model_version = model_version
+        self.max_memory_items = max_memory_items
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._matrix: Optional[EmbeddingMatrix] = None
+
+        if path and store_dtype:
+            name = re.sub(r'[^A-Za-z0-9._-]', '-', f"{model_name}-{model_version}")
+            self._matrix = EmbeddingMatrix(f"{os.path.splitext(path)[0]}.{name}.{store_dtype}", dtype=store_dtype)
+        elif path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    content_hash TEXT NOT NULL,
+                    model_name TEXT NOT NULL,
+                    model_version TEXT NOT NULL,
+                    dim INTEGER NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (content_hash, model_name, model_version)
+                )
+                """
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Return the cache key for ``text``."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vector: np.ndarray):
+        """Insert into the LRU layer, evicting the least recently used entry when full."""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Return the cached embedding for ``text``, or ``None`` on a miss."""
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: Iterable[str], keys: Optional[List[str]] = None) -> List[Optional[np.ndarray]]:
+        """Look up several texts at once; misses are returned as ``None``.
+
+        ``keys`` may carry precomputed ``content_hash`` values for ``texts``.
+        """
+        if keys is None:
+            keys = [self.content_hash(text) for text in texts]
+        found: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            missing = []
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                elif key not in found:
+                    missing.append(key)
+
+            if missing and self._matrix is not None:
+                for key, vector in zip(missing, self._matrix.get(missing)):
+                    if vector is not None:
+                        found[key] = vector
+                        self._remember(key, vector)
+
+            elif missing and self._conn is not None:
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT content_hash, vector FROM embeddings "
+                        f"WHERE model_name = ? AND model_version = ? AND content_hash IN ({placeholders})",
+                        [self.model_name, self.model_version, *chunk],
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        found[key] = vector
+                        self._remember(key, vector)
+
+        return [found.get(key) for key in keys]
+
+    def get_matrix(self, texts: List[str], keys: Optional[List[str]] = None) -> Tuple[Optional[np.ndarray], np.ndarray]:
+        """Look up several texts as one ``(len(texts), dim)`` matrix plus a mask of the rows found.
+
+        Missing rows are zeros; the matrix is ``None`` when nothing was found.
+        A memory-mapped store is read with a single gather of the requested
+        rows instead of one array per text.
+        """
+        if keys is None:
+            keys = [self.content_hash(text) for text in texts]
+        if self._matrix is not None:
+            return self._matrix.take(keys)
+
+        vectors = self.get_many(texts, keys=keys)
+        found = np.array([vector is not None for vector in vectors], dtype=bool)
+        if not found.any():
+            return None, found
+        dim = next(vector for vector in vectors if vector is not None).shape[-1]
+        matrix = np.zeros((len(keys), dim), dtype=np.float32)
+        for i, vector in enumerate(vectors):
+            if vector is not None:
+                matrix[i] = vector
+        return matrix, found
+
+    def put(self, text: str, embedding: np.ndarray):
+        """Store the embedding for ``text``."""
+        self.put_many([text], [embedding])
+
+    def put_many(self, texts: Iterable[str], embeddings: Iterable[np.ndarray], keys: Optional[List[str]] = None):
+        """Store several embeddings in one transaction."""
+        now = datetime.utcnow().isoformat()
+        rows = []
+        vectors = []
+        if keys is None:
+            keys = [self.content_hash(text) for text in texts]
+
+        with self._lock:
+            for key, embedding in zip(keys, embeddings):
+                vector = np.asarray(embedding, dtype=np.float32)
+                self._remember(key, vector)
+                vectors.append(vector)
+                rows.append((key, self.model_name, self.model_version, int(vector.shape[-1]), vector.tobytes(), now))
+
+            if rows and self._matrix is not None:
+                self._matrix.add([row[0] for row in rows], np.vstack(vectors))
+
+            elif rows and self._conn is not None:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings "
+                    "(content_hash, model_name, model_version, dim, vector, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.commit()
+
+    def close(self):
+        """Close the on-disk store."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            if self._matrix is not None:
+                self._matrix.flush()
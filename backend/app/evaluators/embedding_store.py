@@ -0,0 +1,309 @@
+"""Contiguous, memory-mapped embedding matrix with optional float16/int8 quantization."""
+
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+STORAGE_DTYPES = {
+    'float32': np.float32,
+    'float16': np.float16,
+    'int8': np.int8
+}
+
+
+class EmbeddingMatrix:
+    """Row-per-key embedding matrix stored as one flat file.
+
+    ``<path>.vectors`` holds the rows back to back in the storage dtype and is
+    memory-mapped, so scans read pages straight from the OS cache instead of
+    loading the matrix into the Python heap. ``<path>.keys`` is an append-only
+    log of ``+key`` / ``-key`` lines mapping keys to rows. int8 rows carry a
+    per-row scale and offset in ``<path>.scales`` (``value = (q + 128) *
+    scale + offset``). Appends take an exclusive file lock where available
+    and the key is logged only after its row is written, so other processes
+    sharing the files never see a partial row.
+
+    With ``path=None`` the same layout is kept in memory.
+    """
+
+    def __init__(self, path: Optional[str], dim: Optional[int] = None, dtype: str = 'float16',
+                 initial_capacity: int = 1024):
+        """Open (or create) the matrix; ``dim`` may be left out until the first ``add``."""
+        if dtype not in STORAGE_DTYPES:
+            raise ValueError(f"Unknown storage dtype '{dtype}', expected one of {', '.join(STORAGE_DTYPES)}")
+        self.path = path
+        self.dtype = dtype
+        self.dim = dim
+        self.initial_capacity = initial_capacity
+        self._storage_dtype = np.dtype(STORAGE_DTYPES[dtype])
+        self._lock = threading.RLock()
+        self._rows: Dict[str, int] = {}
+        self._row_keys: List[Optional[str]] = []
+        self._keys_offset = 0
+        self._vectors: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._refresh()
+
+    # ----------------------------------------------------------------- storage
+
+    def _file_rows(self) -> int:
+        """Rows the vector file currently has room for."""
+        if not self.dim or not os.path.exists(self.path + ".vectors"):
+            return 0
+        return os.path.getsize(self.path + ".vectors") // (self.dim * self._storage_dtype.itemsize)
+
+    def _map(self):
+        """(Re)map the on-disk files at their current size."""
+        rows = self._file_rows()
+        if rows == 0:
+            self._vectors = self._scales = None
+            return
+        self._vectors = np.memmap(self.path + ".vectors", dtype=self._storage_dtype, mode="r+", shape=(rows, self.dim))
+        if self.dtype == 'int8':
+            self._scales = np.memmap(self.path + ".scales", dtype=np.float32, mode="r+", shape=(rows, 2))
+
+    def _reserve(self, rows: int):
+        """Make room for at least ``rows`` rows, growing geometrically."""
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if rows <= capacity:
+            return
+        capacity = max(rows, capacity * 2, self.initial_capacity)
+
+        if self.path is None:
+            vectors = np.zeros((capacity, self.dim), dtype=self._storage_dtype)
+            scales = np.zeros((capacity, 2), dtype=np.float32)
+            if self._vectors is not None:
+                vectors[:self._vectors.shape[0]] = self._vectors
+                scales[:self._scales.shape[0]] = self._scales
+            self._vectors, self._scales = vectors, scales
+            return
+
+        if self._vectors is not None:
+            self._vectors.flush()
+        with open(self.path + ".vectors", "ab") as f:
+            f.truncate(capacity * self.dim * self._storage_dtype.itemsize)
+        if self.dtype == 'int8':
+            with open(self.path + ".scales", "ab") as f:
+                f.truncate(capacity * 2 * 4)
+        self._map()
+
+    def _refresh(self):
+        """Pick up keys appended by other processes since the last read."""
+        if not self.path or not os.path.exists(self.path + ".keys"):
+            return
+        with open(self.path + ".keys", "r", encoding="utf-8") as f:
+            f.seek(self._keys_offset)
+            lines = f.read()
+            self._keys_offset = f.tell()
+        if not lines:
+            return
+
+        for line in lines.splitlines():
+            op, _, rest = line.partition(" ")
+            if op == "dim":
+                self.dim = int(rest)
+                continue
+            row_text, _, key = rest.partition(" ")
+            row = int(row_text)
+            while len(self._row_keys) <= row:
+                self._row_keys.append(None)
+            if op == "+":
+                self._rows[key] = row
+                self._row_keys[row] = key
+            elif op == "-" and self._rows.get(key) == row:
+                del self._rows[key]
+                self._row_keys[row] = None
+
+        if self.dim and (self._vectors is None or self._vectors.shape[0] < len(self._row_keys)):
+            self._map()
+
+    def _log(self, lines: List[str]):
+        """Append lines to the key log."""
+        if not self.path:
+            return
+        with open(self.path + ".keys", "a", encoding="utf-8") as f:
+            f.write("".join(line + "\n" for line in lines))
+            self._keys_offset = f.tell()
+
+    def _file_lock(self):
+        """Exclusive lock shared with other processes writing the same files."""
+        matrix = self
+
+        class _Lock:
+            def __enter__(self):
+                self.handle = None
+                if matrix.path and fcntl is not None:
+                    self.handle = open(matrix.path + ".lock", "w")
+                    fcntl.flock(self.handle, fcntl.LOCK_EX)
+
+            def __exit__(self, *exc):
+                if self.handle is not None:
+                    fcntl.flock(self.handle, fcntl.LOCK_UN)
+                    self.handle.close()
+
+        return _Lock()
+
+    # ----------------------------------------------------------- quantization
+
+    def _encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Convert float32 rows to the storage dtype (plus int8 scale/offset)."""
+        if self.dtype != 'int8':
+            return vectors.astype(self._storage_dtype), None
+        low = vectors.min(axis=1)
+        high = vectors.max(axis=1)
+        scale = (high - low) / 255.0
+        scale[scale == 0] = 1.0
+        quantized = np.clip(np.rint((vectors - low[:, None]) / scale[:, None]) - 128, -128, 127).astype(np.int8)
+        return quantized, np.stack([scale, low], axis=1).astype(np.float32)
+
+    def _decode(self, rows: np.ndarray, scales: Optional[np.ndarray]) -> np.ndarray:
+        """Dequantize stored rows to float32."""
+        if self.dtype != 'int8':
+            return rows.astype(np.float32)
+        return (rows.astype(np.float32) + 128.0) * scales[:, :1] + scales[:, 1:]
+
+    # ------------------------------------------------------------------ public
+
+    def __len__(self) -> int:
+        """Number of live keys."""
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def keys(self) -> List[str]:
+        """All live keys."""
+        with self._lock:
+            self._refresh()
+            return list(self._rows)
+
+    def add(self, keys: List[str], vectors: np.ndarray):
+        """Store ``vectors`` under ``keys``, overwriting rows of keys already present."""
+        if not keys:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(keys), -1)
+
+        with self._lock, self._file_lock():
+            self._refresh()
+            log = []
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                log.append(f"dim {self.dim}")
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+
+            rows = []
+            for key in keys:
+                row = self._rows.get(key)
+                if row is None:
+                    row = len(self._row_keys)
+                    self._row_keys.append(key)
+                    self._rows[key] = row
+                    log.append(f"+ {row} {key}")
+                rows.append(row)
+
+            self._reserve(len(self._row_keys))
+            encoded, scales = self._encode(vectors)
+            self._vectors[rows] = encoded
+            if scales is not None:
+                self._scales[rows] = scales
+            if self.path:
+                self._vectors.flush()
+                if scales is not None:
+                    self._scales.flush()
+            # Rows are on disk before their keys become visible
+            self._log(log)
+
+    def remove(self, keys: Iterable[str]):
+        """Forget ``keys``; their rows are zeroed and reused only if the key is added again."""
+        with self._lock, self._file_lock():
+            self._refresh()
+            log = []
+            for key in keys:
+                row = self._rows.pop(key, None)
+                if row is None:
+                    continue
+                self._row_keys[row] = None
+                self._vectors[row] = 0
+                if self._scales is not None:
+                    self._scales[row] = 0
+                log.append(f"- {row} {key}")
+            self._log(log)
+
+    def take(self, keys: List[str]) -> Tuple[Optional[np.ndarray], np.ndarray]:
+        """Gather the rows of ``keys`` as one ``(len(keys), dim)`` float32 matrix.
+
+        Only the requested rows are read from the memory map, in the compact
+        storage dtype, and dequantized in one pass. Returns the matrix (zero
+        rows for unknown keys; ``None`` when the matrix is still empty) and a
+        boolean mask of the keys that were found.
+        """
+        with self._lock:
+            if any(key not in self._rows for key in keys):
+                self._refresh()
+            found = np.array([key in self._rows for key in keys], dtype=bool)
+            if self.dim is None or self._vectors is None:
+                return None, found
+
+            result = np.zeros((len(keys), self.dim), dtype=np.float32)
+            if found.any():
+                rows = np.array([self._rows[key] for key in keys if key in self._rows])
+                scales = self._scales[rows] if self.dtype == 'int8' else None
+                result[found] = self._decode(self._vectors[rows], scales)
+            return result, found
+
+    def get(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """Dequantized float32 vectors for ``keys`` (``None`` for unknown keys)."""
+        matrix, found = self.take(keys)
+        return [matrix[i] if hit else None for i, hit in enumerate(found)]
+
+    def dot(self, queries: np.ndarray, block_rows: int = 65536) -> Tuple[List[Optional[str]], np.ndarray]:
+        """Dot products of every stored row with ``queries`` (``(q, dim)`` or ``(dim,)``).
+
+        The matrix is scanned in zero-copy blocks of the memory map and each
+        block is dequantized on the fly; for int8 the per-row affine transform
+        is applied to the block's products instead of to the rows. Returns
+        the row keys (``None`` for removed rows) and a ``(rows, q)`` array.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        single = queries.ndim == 1
+        queries = queries.reshape(-1, queries.shape[-1])
+
+        with self._lock:
+            self._refresh()
+            total = len(self._row_keys)
+            row_keys = list(self._row_keys)
+            scores = np.zeros((total, queries.shape[0]), dtype=np.float32)
+            query_sums = queries.sum(axis=1)
+
+            for start in range(0, total, block_rows):
+                stop = min(start + block_rows, total)
+                block = self._vectors[start:stop]
+                if self.dtype == 'int8':
+                    scales = self._scales[start:stop]
+                    raw = (block.astype(np.float32) + 128.0) @ queries.T
+                    scores[start:stop] = raw * scales[:, :1] + scales[:, 1:] * query_sums
+                else:
+                    scores[start:stop] = block.astype(np.float32, copy=False) @ queries.T
+
+        return row_keys, scores[:, 0] if single else scores
+
+    def flush(self):
+        """Write pending changes of the memory map to disk."""
+        with self._lock:
+            if self.path and self._vectors is not None:
+                self._vectors.flush()
+                if self._scales is not None:
+                    self._scales.flush()
@@ -0,0 +1,120 @@
+"""Precomputed feature records for resumes and job descriptions.
+
+A feature record holds everything the hard matcher needs in already
+normalized form, so scoring a resume against a job description is set
+arithmetic over two records instead of re-decoding and re-normalizing the
+parsed JSON columns on every evaluation.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from app.evaluators.embedding_cache import EmbeddingCache
+from app.evaluators.skill_index import normalize_skill, normalized_skills
+
+# Bump whenever the parsers or the derivation below change; records with an
+# older version are rebuilt the next time they are used
+FEATURE_VERSION = 2
+
+# Degree levels, lowest first; a higher degree satisfies a lower requirement
+DEGREE_RANKS = {
+    'diploma': 1,
+    'bachelor': 2,
+    'master': 3,
+    'phd': 4
+}
+
+DEGREE_PATTERNS = [
+    ('phd', re.compile(r'\b(?:ph\.?\s?d|doctorate|doctor\s+of)\b', re.IGNORECASE)),
+    ('master', re.compile(r'\b(?:masters?|m\.?\s?sc|m\.?\s?tech|mba|m\.s\.|m\.e\.|m\.a\.)(?!\w)', re.IGNORECASE)),
+    ('bachelor', re.compile(r'\b(?:bachelors?|b\.?\s?sc|b\.?\s?tech|b\.s\.|b\.e\.|b\.a\.)(?!\w)', re.IGNORECASE)),
+    ('diploma', re.compile(r'\b(?:diploma|associate)\b', re.IGNORECASE))
+]
+
+KEYWORD_PATTERN = re.compile(r'\b[a-zA-Z]{3,}\b')
+KEYWORD_STOP_WORDS = frozenset({
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
+    'by', 'from', 'up', 'about', 'into', 'through', 'during', 'before',
+    'after', 'above', 'below', 'between', 'among', 'within', 'without'
+})
+
+YEARS_PATTERN = re.compile(r'(\d+)')
+
+
+def degree_code(text: str) -> Optional[str]:
+    """Highest degree level mentioned in ``text`` (``'bachelor'``, ``'phd'``...), or ``None``."""
+    for code, pattern in DEGREE_PATTERNS:
+        if pattern.search(text):
+            return code
+    return None
+
+
+def keyword_set(text: str) -> List[str]:
+    """Distinct lowercase keywords of three or more letters, stop words removed."""
+    return sorted(set(KEYWORD_PATTERN.findall(text.lower())) - KEYWORD_STOP_WORDS)
+
+
+def required_years(experience_required: Optional[str]) -> int:
+    """Years of experience asked for by a job description (0 when not specified)."""
+    if experience_required and experience_required != "Not specified":
+        match = YEARS_PATTERN.search(experience_required)
+        if match:
+            return int(match.group(1))
+    return 0
+
+
+def embedding_id(text: str) -> str:
+    """Key of ``text`` in the embedding cache."""
+    return EmbeddingCache.content_hash(text)
+
+
+def is_current(features: Optional[Dict[str, Any]]) -> bool:
+    """Whether a stored record was built by this version of the code."""
+    return bool(features) and features.get('version') == FEATURE_VERSION
+
+
+def resume_features(resume_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the feature record for a parsed resume."""
+    content = resume_data.get('content', '') or ''
+    degrees = [
+        edu['degree'].lower()
+        for edu in resume_data.get('education', []) or []
+        if isinstance(edu, dict) and 'degree' in edu
+    ]
+    codes = [code for code in (degree_code(degree) for degree in degrees) if code]
+
+    return {
+        'version': FEATURE_VERSION,
+        'skills': normalized_skills(resume_data.get('skills', [])),
+        'degrees': degrees,
+        'degree_rank': max((DEGREE_RANKS[code] for code in codes), default=0),
+        # Rough estimate, two years per listed position
+        'experience_years': len(resume_data.get('experience', []) or []) * 2,
+        'embedding_id': embedding_id(content)
+    }
+
+
+def job_features(job_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the feature record for a parsed job description.
+
+    Skill lists keep the original spelling next to the normalized id so
+    results can still report skills the way the posting wrote them.
+    """
+    content = job_data.get('content', '') or ''
+    qualifications = []
+    for qualification in job_data.get('qualifications', []) or []:
+        code = degree_code(qualification)
+        qualifications.append({
+            'text': qualification,
+            'lower': qualification.lower(),
+            'degree_rank': DEGREE_RANKS[code] if code else 0
+        })
+
+    return {
+        'version': FEATURE_VERSION,
+        'must_have_skills': [[skill, normalize_skill(skill)] for skill in job_data.get('must_have_skills', []) or []],
+        'good_to_have_skills': [[skill, normalize_skill(skill)] for skill in job_data.get('good_to_have_skills', []) or []],
+        'qualifications': qualifications,
+        'required_years': required_years(job_data.get('experience_required')),
+        'embedding_id': embedding_id(content)
+    }
@@ -1,81 +1,116 @@
 """Hard matching system for keyword and skill-based resume evaluation."""
 
+import os
 import re
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
 from difflib import SequenceMatcher
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from app.evaluators.keyword_model import KeywordModel
+from app.evaluators.skill_index import SkillIndex
+from app.evaluators.features import job_features, keyword_set, resume_features
+
+# Weights of the components of the hard match score
+MUST_HAVE_WEIGHT = 0.4
+GOOD_TO_HAVE_WEIGHT = 0.2
+EDUCATION_WEIGHT = 0.2
+EXPERIENCE_WEIGHT = 0.2
 
 
 class HardMatcher:
     """Hard matching system for exact and fuzzy keyword matching."""
     
-    def __init__(self):
-        """Initialize the hard matcher."""
-        self.vectorizer = TfidfVectorizer(
-            stop_words='english',
-            ngram_range=(1, 2),
-            max_features=1000
-        )
+    def __init__(self, keyword_model: Optional[KeywordModel] = None):
+        """Initialize the hard matcher.
+        
+        Keyword similarity uses ``keyword_model`` or, if not given, the
+        corpus model persisted at ``KEYWORD_MODEL_PATH``, reloaded whenever
+        that file is refitted (possibly by another process). Without a
+        fitted model keyword similarity is ``None``.
+        """
+        self._keyword_model_path: Optional[str] = None
+        self._keyword_model_mtime: Optional[float] = None
+        if keyword_model is None:
+            from app.config import KEYWORD_MODEL_PATH
+            self._keyword_model_path = KEYWORD_MODEL_PATH
+            self._keyword_model_mtime = self._model_mtime()
+            keyword_model = KeywordModel.load(KEYWORD_MODEL_PATH)
+        self.keyword_model = keyword_model
     
-    def calculate_keyword_similarity(self, text1: str, text2: str) -> float:
-        """Calculate keyword similarity using TF-IDF and cosine similarity."""
+    def _model_mtime(self) -> Optional[float]:
+        """Modification time of the persisted keyword model, or ``None`` if there is none."""
         try:
-            # Create TF-IDF vectors
-            tfidf_matrix = self.vectorizer.fit_transform([text1, text2])
-            
-            # Calculate cosine similarity
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            return float(similarity)
+            return os.path.getmtime(self._keyword_model_path) if self._keyword_model_path else None
+        except OSError:
+            return None
+    
+    def current_keyword_model(self) -> Optional[KeywordModel]:
+        """The fitted keyword model, reloaded if the persisted one changed; ``None`` if unfitted."""
+        if self._keyword_model_path:
+            mtime = self._model_mtime()
+            if mtime != self._keyword_model_mtime:
+                self._keyword_model_mtime = mtime
+                self.keyword_model = KeywordModel.load(self._keyword_model_path) or self.keyword_model
+        if self.keyword_model is not None and self.keyword_model.is_fitted:
+            return self.keyword_model
+        return None
+    
+    def use_keyword_model(self, keyword_model: KeywordModel):
+        """Score with ``keyword_model``, e.g. right after it was refitted and saved."""
+        self.keyword_model = keyword_model
+        self._keyword_model_mtime = self._model_mtime()
+    
+    def calculate_keyword_similarity(self, text1: str, text2: str) -> Optional[float]:
+        """TF-IDF cosine similarity under the corpus model; ``None`` until a model is fitted."""
+        keyword_model = self.current_keyword_model()
+        if keyword_model is None:
+            return None
+        try:
+            return keyword_model.similarity(text1, text2)
         except Exception:
             return 0.0
     
+    def batch_keyword_similarity(self, job_text: str, resume_texts: List[str]) -> List[Optional[float]]:
+        """Keyword similarity of one job description against many resumes (``None`` each without a model)."""
+        keyword_model = self.current_keyword_model()
+        if keyword_model is None:
+            return [None] * len(resume_texts)
+        try:
+            return [float(score) for score in keyword_model.batch_similarity(job_text, resume_texts)]
+        except Exception:
+            return [0.0] * len(resume_texts)
+    
     def fuzzy_match(self, text1: str, text2: str, threshold: float = 0.6) -> float:
         """Calculate fuzzy string matching score."""
         return SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
     
     def extract_keywords(self, text: str) -> List[str]:
         """Extract keywords from text."""
-        # Remove common stop words and extract meaningful words
-        words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-        
-        # Filter out common words
-        stop_words = {
-            'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
-            'by', 'from', 'up', 'about', 'into', 'through', 'during', 'before',
-            'after', 'above', 'below', 'between', 'among', 'within', 'without'
-        }
-        
-        keywords = [word for word in words if word not in stop_words and len(word) > 2]
-        return list(set(keywords))
+        return keyword_set(text)
     
-    def match_skills(self, resume_skills: List[str], required_skills: List[str]) -> Dict[str, Any]:
-        """Match resume skills against required skills."""
+    def match_skills(self, resume_skills: List[str], required_skills: List[str],
+                     skill_index: Optional[SkillIndex] = None) -> Dict[str, Any]:
+        """Match resume skills against required skills.
+        
+        Pass a prebuilt ``skill_index`` for ``resume_skills`` to reuse it
+        across several calls for the same resume.
+        """
         matched_skills = []
         missing_skills = []
         partial_matches = []
         
-        resume_skills_lower = [skill.lower() for skill in resume_skills]
-        required_skills_lower = [skill.lower() for skill in required_skills]
+        if skill_index is None:
+            skill_index = SkillIndex(resume_skills)
         
         for required_skill in required_skills:
             skill_found = False
             
             # Exact match
-            if required_skill.lower() in resume_skills_lower:
+            if skill_index.exact(required_skill) is not None:
                 matched_skills.append(required_skill)
                 skill_found = True
             else:
-                # Fuzzy match
-                best_match_score = 0
-                best_match_skill = None
-                
-                for resume_skill in resume_skills:
-                    similarity = self.fuzzy_match(required_skill, resume_skill)
-                    if similarity > best_match_score and similarity > 0.7:
-                        best_match_score = similarity
-                        best_match_skill = resume_skill
+                # Fuzzy match against the trigram candidates only
+                best_match_skill, best_match_score = skill_index.fuzzy(required_skill, threshold=0.7)
                 
                 if best_match_skill:
                     partial_matches.append({
@@ -164,39 +199,128 @@ class HardMatcher:
             'meets_requirement': resume_years >= exp_years
         }
     
+    def match_skill_features(self, resume_skills: List[str], required_skills: List[List[str]],
+                             skill_index: Optional[SkillIndex] = None) -> Dict[str, Any]:
+        """``match_skills`` over feature records.
+        
+        ``resume_skills`` are normalized skill ids and ``required_skills``
+        ``[original, normalized]`` pairs; exact hits are set lookups and only
+        the remaining skills go through the fuzzy index.
+        """
+        resume_skill_set = set(resume_skills)
+        matched_skills = []
+        missing_skills = []
+        partial_matches = []
+        
+        for required_skill, skill_id in required_skills:
+            if skill_id in resume_skill_set:
+                matched_skills.append(required_skill)
+                continue
+            
+            if skill_index is None:
+                skill_index = SkillIndex(resume_skills)
+            best_match_skill, best_match_score = skill_index.fuzzy(skill_id, threshold=0.7)
+            if best_match_skill:
+                partial_matches.append({
+                    'required': required_skill,
+                    'matched': best_match_skill,
+                    'score': best_match_score
+                })
+            else:
+                missing_skills.append(required_skill)
+        
+        total_skills = len(required_skills)
+        exact_matches = len(matched_skills)
+        partial_matches_count = len(partial_matches)
+        
+        skill_score = ((exact_matches + partial_matches_count * 0.7) / total_skills) * 100 if total_skills > 0 else 0
+        
+        return {
+            'matched_skills': matched_skills,
+            'missing_skills': missing_skills,
+            'partial_matches': partial_matches,
+            'skill_score': skill_score,
+            'total_required': total_skills,
+            'exact_matches': exact_matches,
+            'partial_matches_count': partial_matches_count
+        }
+    
+    def match_education_features(self, resume: Dict[str, Any], qualifications: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """``match_education`` over feature records.
+        
+        A qualification naming a degree level is met by any resume degree of
+        that level or higher; other qualifications fall back to fuzzy matching
+        against the resume's degree lines.
+        """
+        matched_qualifications = []
+        missing_qualifications = []
+        
+        for qualification in qualifications:
+            if qualification['degree_rank']:
+                qual_found = resume['degree_rank'] >= qualification['degree_rank']
+            else:
+                qual_found = any(
+                    SequenceMatcher(None, qualification['lower'], degree).ratio() > 0.6
+                    for degree in resume['degrees']
+                )
+            
+            if qual_found:
+                matched_qualifications.append(qualification['text'])
+            else:
+                missing_qualifications.append(qualification['text'])
+        
+        total_qualifications = len(qualifications)
+        education_score = (len(matched_qualifications) / total_qualifications) * 100 if total_qualifications > 0 else 100
+        
+        return {
+            'matched_qualifications': matched_qualifications,
+            'missing_qualifications': missing_qualifications,
+            'education_score': education_score,
+            'total_required': total_qualifications,
+            'matched_count': len(matched_qualifications)
+        }
+    
     def calculate_hard_match_score(self, resume_data: Dict[str, Any], job_data: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate overall hard match score."""
-        # Extract data
-        resume_skills = resume_data.get('skills', [])
-        resume_education = resume_data.get('education', [])
-        resume_experience = resume_data.get('experience', [])
-        
-        required_skills = job_data.get('must_have_skills', [])
-        good_to_have_skills = job_data.get('good_to_have_skills', [])
-        required_qualifications = job_data.get('qualifications', [])
-        required_experience = job_data.get('experience_required', 'Not specified')
+        keyword_similarity = self.calculate_keyword_similarity(
+            resume_data.get('content', '') or '', job_data.get('content', '') or ''
+        )
+        return self.score_features(resume_features(resume_data), job_features(job_data), keyword_similarity)
+    
+    def score_features(self, resume: Dict[str, Any], job: Dict[str, Any],
+                       keyword_similarity: Optional[float] = None) -> Dict[str, Any]:
+        """Calculate the hard match score from precomputed feature records.
         
-        # Match skills
-        must_have_skill_match = self.match_skills(resume_skills, required_skills)
-        good_to_have_skill_match = self.match_skills(resume_skills, good_to_have_skills)
+        See ``app.evaluators.features``; the result has the same shape as
+        ``calculate_hard_match_score``. ``keyword_similarity`` is the TF-IDF
+        similarity of the two texts (``calculate_keyword_similarity`` or
+        ``batch_keyword_similarity``); it is reported, not weighted, and
+        ``None`` when it was not computed or no keyword model is fitted yet.
+        """
+        # Match skills (one index serves both skill lists)
+        skill_index = SkillIndex(resume['skills'])
+        must_have_skill_match = self.match_skill_features(resume['skills'], job['must_have_skills'], skill_index)
+        good_to_have_skill_match = self.match_skill_features(resume['skills'], job['good_to_have_skills'], skill_index)
         
         # Match education
-        education_match = self.match_education(resume_education, required_qualifications)
+        education_match = self.match_education_features(resume, job['qualifications'])
         
         # Match experience
-        experience_match = self.match_experience(resume_experience, required_experience)
+        exp_years = job['required_years']
+        resume_years = resume['experience_years']
+        experience_match = {
+            'required_years': exp_years,
+            'estimated_resume_years': resume_years,
+            'experience_score': 100 if resume_years >= exp_years else (resume_years / exp_years) * 100,
+            'meets_requirement': resume_years >= exp_years
+        }
         
         # Calculate weighted scores
-        must_have_weight = 0.4
-        good_to_have_weight = 0.2
-        education_weight = 0.2
-        experience_weight = 0.2
-        
         hard_match_score = (
-            must_have_skill_match['skill_score'] * must_have_weight +
-            good_to_have_skill_match['skill_score'] * good_to_have_weight +
-            education_match['education_score'] * education_weight +
-            experience_match['experience_score'] * experience_weight
+            must_have_skill_match['skill_score'] * MUST_HAVE_WEIGHT +
+            good_to_have_skill_match['skill_score'] * GOOD_TO_HAVE_WEIGHT +
+            education_match['education_score'] * EDUCATION_WEIGHT +
+            experience_match['experience_score'] * EXPERIENCE_WEIGHT
         )
         
         return {
@@ -205,6 +329,7 @@ class HardMatcher:
             'good_to_have_skills': good_to_have_skill_match,
             'education': education_match,
             'experience': experience_match,
+            'keyword_similarity': round(keyword_similarity, 4) if keyword_similarity is not None else None,
             'missing_skills': must_have_skill_match['missing_skills'],
             'missing_qualifications': education_match['missing_qualifications']
         }
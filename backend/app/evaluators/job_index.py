@@ -0,0 +1,172 @@
+"""In-memory index of job descriptions for ranking all of them against one resume."""
+
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+
+from app.evaluators.features import DEGREE_RANKS
+from app.evaluators.hard_matcher import (
+    MUST_HAVE_WEIGHT,
+    GOOD_TO_HAVE_WEIGHT,
+    EDUCATION_WEIGHT,
+    EXPERIENCE_WEIGHT
+)
+
+MAX_DEGREE_RANK = max(DEGREE_RANKS.values())
+
+
+class JobIndex:
+    """Job description embeddings and requirements laid out for vectorized scoring.
+
+    Holds a normalized embedding matrix (one row per job description), the
+    per-JD requirement totals, and an inverted index from normalized skill
+    id to the JD rows requiring it. ``rank`` scores a resume against every
+    JD at once: one matrix-vector product for semantic similarity and one
+    posting-list walk per resume skill for exact skill hits. The arrays are
+    rebuilt lazily after ``add``/``remove``.
+    """
+
+    def __init__(self):
+        """Create an empty index."""
+        self._lock = threading.Lock()
+        self._entries: Dict[int, Tuple[np.ndarray, Dict[str, Any]]] = {}
+        self._dirty = True
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        """Number of indexed job descriptions."""
+        return len(self._entries)
+
+    def ids(self) -> Set[int]:
+        """Job description ids currently in the index."""
+        with self._lock:
+            return set(self._entries)
+
+    def add(self, job_ids: List[int], embeddings: np.ndarray, features: List[Dict[str, Any]]):
+        """Insert or replace job descriptions with their embeddings and feature records."""
+        embeddings = np.asarray(embeddings, dtype=np.float32).reshape(len(job_ids), -1)
+        with self._lock:
+            for job_id, embedding, record in zip(job_ids, embeddings, features):
+                self._entries[job_id] = (embedding, record)
+            self._dirty = True
+
+    def features(self, job_id: int) -> Dict[str, Any]:
+        """Feature record stored for ``job_id``."""
+        with self._lock:
+            return self._entries[job_id][1]
+
+    def remove(self, job_ids: Iterable[int]):
+        """Drop job descriptions from the index."""
+        with self._lock:
+            for job_id in job_ids:
+                self._entries.pop(job_id, None)
+            self._dirty = True
+
+    def _build(self):
+        """Lay the entries out as arrays and posting lists (called with the lock held)."""
+        job_ids = sorted(self._entries)
+        n = len(job_ids)
+        dim = next(iter(self._entries.values()))[0].shape[0] if n else 0
+
+        matrix = np.zeros((n, dim), dtype=np.float32)
+        must_total = np.zeros(n, dtype=np.float32)
+        good_total = np.zeros(n, dtype=np.float32)
+        qual_total = np.zeros(n, dtype=np.float32)
+        quals_by_rank = np.zeros((n, MAX_DEGREE_RANK + 1), dtype=np.float32)
+        required_years = np.zeros(n, dtype=np.float32)
+        must_postings = defaultdict(list)
+        good_postings = defaultdict(list)
+
+        for row, job_id in enumerate(job_ids):
+            embedding, record = self._entries[job_id]
+            matrix[row] = embedding
+            must_total[row] = len(record['must_have_skills'])
+            good_total[row] = len(record['good_to_have_skills'])
+            qual_total[row] = len(record['qualifications'])
+            required_years[row] = record['required_years']
+            # Repeated skill ids count once per occurrence, as in match_skills
+            for _, skill_id in record['must_have_skills']:
+                must_postings[skill_id].append(row)
+            for _, skill_id in record['good_to_have_skills']:
+                good_postings[skill_id].append(row)
+            for qualification in record['qualifications']:
+                quals_by_rank[row, qualification['degree_rank']] += 1
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        empty = np.zeros(0, dtype=np.int64)
+
+        self._ids = np.asarray(job_ids, dtype=np.int64)
+        self._matrix = matrix / norms
+        self._must_total = must_total
+        self._good_total = good_total
+        self._qual_total = qual_total
+        # Qualifications met by a degree of rank r: cumulative counts over ranks 1..r
+        self._quals_met_by_rank = np.cumsum(quals_by_rank[:, 1:], axis=1)
+        self._required_years = required_years
+        self._postings = {
+            skill_id: (
+                np.asarray(must_postings.get(skill_id, empty), dtype=np.int64),
+                np.asarray(good_postings.get(skill_id, empty), dtype=np.int64)
+            )
+            for skill_id in set(must_postings) | set(good_postings)
+        }
+        self._dirty = False
+
+    def rank(self, resume_embedding: np.ndarray, resume_features: Dict[str, Any], k: int,
+             hard_weight: float, semantic_weight: float) -> List[Tuple[int, float, float]]:
+        """Approximate top ``k`` job descriptions as ``(job_id, relevance, cosine_similarity)``.
+
+        Relevance combines the hard and semantic scores with the given
+        weights, like ``ResumeEvaluator.calculate_final_score``. The hard
+        score here counts exact skill hits and degree-level qualifications
+        only, so it is a lower bound of ``HardMatcher.score_features``;
+        callers re-score the returned shortlist exactly.
+        """
+        with self._lock:
+            if self._dirty:
+                self._build()
+            n = len(self._ids)
+            k = min(k, n)
+            if k <= 0:
+                return []
+
+            vector = np.asarray(resume_embedding, dtype=np.float32).ravel()
+            similarities = self._matrix @ (vector / (np.linalg.norm(vector) or 1.0))
+
+            must_hits = np.zeros(n, dtype=np.float32)
+            good_hits = np.zeros(n, dtype=np.float32)
+            for skill_id in resume_features['skills']:
+                postings = self._postings.get(skill_id)
+                if postings is not None:
+                    np.add.at(must_hits, postings[0], 1)
+                    np.add.at(good_hits, postings[1], 1)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                must_score = np.where(self._must_total > 0, must_hits / self._must_total * 100, 0)
+                good_score = np.where(self._good_total > 0, good_hits / self._good_total * 100, 0)
+
+                degree_rank = min(resume_features['degree_rank'], MAX_DEGREE_RANK)
+                quals_met = self._quals_met_by_rank[:, degree_rank - 1] if degree_rank else np.zeros(n, dtype=np.float32)
+                education_score = np.where(self._qual_total > 0, quals_met / self._qual_total * 100, 100)
+
+                resume_years = resume_features['experience_years']
+                experience_score = np.where(
+                    self._required_years <= resume_years, 100, resume_years / self._required_years * 100
+                )
+
+            hard_score = (
+                must_score * MUST_HAVE_WEIGHT +
+                good_score * GOOD_TO_HAVE_WEIGHT +
+                education_score * EDUCATION_WEIGHT +
+                experience_score * EXPERIENCE_WEIGHT
+            )
+            relevance = hard_score * hard_weight + similarities * 100 * semantic_weight
+
+            top = np.argpartition(-relevance, k - 1)[:k]
+            top = top[np.argsort(-relevance[top])]
+            return [(int(self._ids[row]), float(relevance[row]), float(similarities[row])) for row in top]
@@ -0,0 +1,104 @@
+"""Corpus-level TF-IDF model for keyword similarity scoring."""
+
+import os
+import tempfile
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Bump when the vectorizer settings change so stale models on disk are refitted
+KEYWORD_MODEL_VERSION = 1
+
+
+class KeywordModel:
+    """TF-IDF vocabulary and IDF weights fitted once over the resume/JD corpus.
+
+    Scoring only calls ``transform``, so weights are stable across pairs and
+    the fit cost is paid once per corpus refresh instead of once per pair.
+    """
+
+    def __init__(self):
+        """Create an unfitted model."""
+        self.vectorizer = TfidfVectorizer(
+            stop_words='english',
+            ngram_range=(1, 2),
+            max_features=1000
+        )
+        self.version = KEYWORD_MODEL_VERSION
+        self.fitted_at: Optional[str] = None
+        self.document_count = 0
+
+    @property
+    def is_fitted(self) -> bool:
+        """Whether the vocabulary has been fitted."""
+        return self.fitted_at is not None
+
+    def fit(self, documents: Iterable[str]) -> "KeywordModel":
+        """Fit vocabulary and IDF weights over the corpus."""
+        documents = [doc for doc in documents if doc]
+        if not documents:
+            raise ValueError("Cannot fit keyword model on an empty corpus")
+        self.vectorizer.fit(documents)
+        self.document_count = len(documents)
+        self.fitted_at = datetime.utcnow().isoformat()
+        return self
+
+    def similarity(self, text1: str, text2: str) -> float:
+        """Cosine similarity between two texts under the fitted weights."""
+        vectors = self.vectorizer.transform([text1, text2])
+        # Rows are L2-normalized by TfidfVectorizer, so the dot product is the cosine
+        return float(vectors[0].multiply(vectors[1]).sum())
+
+    def batch_similarity(self, query: str, documents: List[str]) -> np.ndarray:
+        """Cosine similarity of ``query`` against every document as one sparse product."""
+        if not documents:
+            return np.zeros(0)
+        query_vector = self.vectorizer.transform([query])
+        document_matrix = self.vectorizer.transform(documents)
+        return np.asarray((document_matrix @ query_vector.T).todense()).ravel()
+
+    def save(self, path: str):
+        """Persist the fitted model together with its version.
+
+        The model is written to a temporary file and moved into place, so
+        processes reloading ``path`` on a new mtime never read a partial file.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory or None, prefix=".keyword-model-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                joblib.dump({
+                    'version': self.version,
+                    'fitted_at': self.fitted_at,
+                    'document_count': self.document_count,
+                    'vectorizer': self.vectorizer
+                }, out)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> Optional["KeywordModel"]:
+        """Load a persisted model, or return ``None`` if it is missing or outdated."""
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            payload = joblib.load(path)
+        except Exception as e:
+            print(f"Error loading keyword model: {e}")
+            return None
+        if payload.get('version') != KEYWORD_MODEL_VERSION:
+            return None
+
+        model = cls()
+        model.vectorizer = payload['vectorizer']
+        model.fitted_at = payload['fitted_at']
+        model.document_count = payload['document_count']
+        return model
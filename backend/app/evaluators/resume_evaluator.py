@@ -1,10 +1,10 @@
 """Main resume evaluation system combining hard and semantic matching."""
 
 import time
-from typing import Dict, List, Any, Tuple
-from backend.app.evaluators.hard_matcher import HardMatcher
-from backend.app.evaluators.semantic_matcher import SemanticMatcher
-from backend.app.config import settings
+from typing import Dict, List, Any, Optional, Tuple
+from app.evaluators.hard_matcher import HardMatcher
+from app.evaluators.semantic_matcher import SemanticMatcher
+from app.config import settings
 import openai
 
 # Set OpenAI API key from config (only if LLM is enabled)
@@ -77,17 +77,38 @@ class ResumeEvaluator:
             'missing_certifications': missing_certifications
         }
     
-    def evaluate_resume(self, resume_data: Dict[str, Any], job_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Evaluate a resume against a job description."""
+    def evaluate_resume(self, resume_data: Dict[str, Any], job_data: Dict[str, Any],
+                        semantic_match_results: Optional[Dict[str, Any]] = None,
+                        resume_features: Optional[Dict[str, Any]] = None,
+                        job_features: Optional[Dict[str, Any]] = None,
+                        keyword_similarity: Optional[float] = None) -> Dict[str, Any]:
+        """Evaluate a resume against a job description.
+        
+        ``semantic_match_results`` may be supplied when the semantic score was
+        already computed (e.g. by a batched pass) to skip re-embedding. With
+        precomputed ``resume_features`` and ``job_features`` (see
+        ``app.evaluators.features``) the hard match is scored from them and
+        the data dicts only need what semantic matching reads: ``content``
+        plus the resume's ``sections`` and the job's ``responsibilities``.
+        ``keyword_similarity`` may likewise come from a batched TF-IDF pass.
+        """
         start_time = time.time()
         
         try:
             # Hard matching
-            hard_match_results = self.hard_matcher.calculate_hard_match_score(resume_data, job_data)
+            if resume_features is not None and job_features is not None:
+                if keyword_similarity is None:
+                    keyword_similarity = self.hard_matcher.calculate_keyword_similarity(
+                        resume_data.get('content', '') or '', job_data.get('content', '') or ''
+                    )
+                hard_match_results = self.hard_matcher.score_features(resume_features, job_features, keyword_similarity)
+            else:
+                hard_match_results = self.hard_matcher.calculate_hard_match_score(resume_data, job_data)
             hard_score = hard_match_results['hard_match_score']
             
             # Semantic matching
-            semantic_match_results = self.semantic_matcher.calculate_semantic_match_score(resume_data, job_data)
+            if semantic_match_results is None:
+                semantic_match_results = self.semantic_matcher.calculate_semantic_match_score(resume_data, job_data)
             semantic_score = semantic_match_results['semantic_match_score']
             
             # Calculate final score
@@ -149,12 +170,36 @@ class ResumeEvaluator:
                 'evaluation_time': time.time() - start_time
             }
     
-    def batch_evaluate(self, resumes: List[Dict[str, Any]], job_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Evaluate multiple resumes against a job description."""
+    def batch_evaluate(self, resumes: List[Dict[str, Any]], job_data: Dict[str, Any], batch_size: int = 64,
+                       resume_features: Optional[List[Dict[str, Any]]] = None,
+                       job_features: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Evaluate multiple resumes against a job description.
+        
+        Semantic scores and TF-IDF keyword similarities for the whole batch are
+        computed in one vectorized pass each before the per-resume hard
+        matching runs. ``resume_features`` (one
+        per resume) and ``job_features`` are passed on to ``evaluate_resume``.
+        """
+        if resume_features is None or job_features is None:
+            resume_features = [None] * len(resumes)
+            job_features = None
+        
+        try:
+            semantic_results = self.semantic_matcher.batch_semantic_match_scores(resumes, job_data, batch_size=batch_size)
+        except Exception:
+            # Fall back to per-pair scoring so errors surface per resume
+            semantic_results = [None] * len(resumes)
+        
+        keyword_similarities = self.hard_matcher.batch_keyword_similarity(
+            job_data.get('content', '') or '', [resume.get('content', '') or '' for resume in resumes]
+        )
+        
         results = []
         
-        for resume in resumes:
-            result = self.evaluate_resume(resume, job_data)
+        for resume, semantic_match_results, features, keyword_similarity in zip(
+                resumes, semantic_results, resume_features, keyword_similarities):
+            result = self.evaluate_resume(resume, job_data, semantic_match_results, features, job_features,
+                                          keyword_similarity)
             results.append(result)
         
         return results
@@ -1,17 +1,84 @@
 # app/evaluators/semantic_matcher.py
 
-from sentence_transformers import SentenceTransformer
+import sentence_transformers
 import openai
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import numpy as np
+from app.evaluators.embedding_cache import EmbeddingCache
+from app.model_registry import DEFAULT_EMBEDDING_MODEL, embedding_model_id, get_sentence_transformer
+
+EMBEDDING_MODEL_NAME = DEFAULT_EMBEDDING_MODEL
+
+# Words per chunk; keeps chunks under MiniLM's 256 word-piece input limit
+CHUNK_MAX_WORDS = 180
+
+# Parsed sections are used as chunks only when they cover at least this
+# share of the document's words; otherwise the whole text is windowed
+MIN_SECTION_COVERAGE = 0.5
+
+
+def chunk_text(text: str, max_words: int = CHUNK_MAX_WORDS) -> List[str]:
+    """Split ``text`` into consecutive windows of at most ``max_words`` words."""
+    words = text.split()
+    return [' '.join(words[i:i + max_words]) for i in range(0, len(words), max_words)]
+
+
+def pack_lines(lines: List[str], max_words: int = CHUNK_MAX_WORDS) -> List[str]:
+    """Join consecutive short lines into chunks of at most ``max_words`` words."""
+    chunks, current, size = [], [], 0
+    for line in lines:
+        count = len(line.split())
+        if current and size + count > max_words:
+            chunks.append(' '.join(current))
+            current, size = [], 0
+        if count > max_words:
+            chunks.extend(chunk_text(line, max_words))
+        elif count:
+            current.append(line.strip())
+            size += count
+    if current:
+        chunks.append(' '.join(current))
+    return chunks
+
+
+def resume_chunks(resume_data: Dict[str, Any]) -> List[str]:
+    """Chunks to embed for a resume: its parsed sections, or windows over the whole text."""
+    content = resume_data.get('content', '') or ''
+    sections = [body for body in (resume_data.get('sections') or {}).values() if isinstance(body, str) and body.strip()]
+    section_words = sum(len(body.split()) for body in sections)
+    if sections and section_words >= MIN_SECTION_COVERAGE * len(content.split()):
+        chunks = [chunk for body in sections for chunk in chunk_text(body)]
+    else:
+        chunks = chunk_text(content)
+    return chunks or ['']
+
+
+def job_chunks(job_data: Dict[str, Any]) -> List[str]:
+    """Chunks to embed for a job description: its responsibilities, or windows over the whole text."""
+    responsibilities = [line for line in job_data.get('responsibilities') or [] if isinstance(line, str)]
+    chunks = pack_lines(responsibilities) or chunk_text(job_data.get('content', '') or '')
+    return chunks or ['']
 
 class SemanticMatcher:
     """Semantic matching system using embeddings and LLM for resume evaluation."""
 
     def __init__(self):
         """Initialize the semantic matcher."""
-        # SentenceTransformer model for embeddings
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+        from app.config import EMBEDDING_BACKEND, EMBEDDING_CACHE_PATH, EMBEDDING_STORE_DTYPE
+        
+        # SentenceTransformer model for embeddings, shared across instances
+        self.embedding_backend = EMBEDDING_BACKEND
+        self.embedding_model = get_sentence_transformer(EMBEDDING_MODEL_NAME, EMBEDDING_BACKEND)
+        # Vectors from different backends differ slightly, so caches and indexes keep them apart
+        self.model_id = embedding_model_id(EMBEDDING_MODEL_NAME, EMBEDDING_BACKEND)
+        
+        # Embeddings are cached by content hash so repeated texts skip the model
+        self.embedding_cache = EmbeddingCache(
+            self.model_id,
+            sentence_transformers.__version__,
+            path=EMBEDDING_CACHE_PATH or None,
+            store_dtype=EMBEDDING_STORE_DTYPE or None
+        )
         
         # Load OpenAI API key from config (only if LLM is enabled)
         from app.config import settings
@@ -19,8 +86,68 @@ class SemanticMatcher:
             openai.api_key = settings.openai_api_key
 
     def embed_text(self, text: str) -> np.ndarray:
-        """Generate embedding for a given text using SentenceTransformer."""
-        return self.embedding_model.encode(text)
+        """Generate embedding for a given text, reusing a cached vector when available."""
+        cached = self.embedding_cache.get(text)
+        if cached is not None:
+            return cached
+        embedding = self.embedding_model.encode(text)
+        self.embedding_cache.put(text, embedding)
+        return embedding
+
+    def embed_texts(self, texts: List[str], batch_size: int = 64, embedding_ids: Optional[List[str]] = None) -> np.ndarray:
+        """Embed many texts as a ``(len(texts), dim)`` matrix.
+
+        Cached vectors are gathered from the store as one matrix; all misses
+        are encoded in a single ``encode(list, batch_size=...)`` call. ``embedding_ids`` are the
+        texts' precomputed cache keys (see ``app.evaluators.features``).
+        """
+        embeddings, found = self.embedding_cache.get_matrix(texts, keys=embedding_ids)
+        missing = np.flatnonzero(~found)
+        
+        if len(missing):
+            # Encode each distinct missing text once
+            unique_texts = list(dict.fromkeys(texts[i] for i in missing))
+            encoded = np.asarray(self.embedding_model.encode(unique_texts, batch_size=batch_size), dtype=np.float32)
+            self.embedding_cache.put_many(unique_texts, encoded)
+            if embeddings is None:
+                embeddings = np.zeros((len(texts), encoded.shape[1]), dtype=np.float32)
+            position = {text: i for i, text in enumerate(unique_texts)}
+            embeddings[missing] = encoded[[position[texts[i]] for i in missing]]
+        
+        if embeddings is None:
+            return np.zeros((0, self.embedding_model.get_sentence_embedding_dimension()), dtype=np.float32)
+        return embeddings
+
+    @staticmethod
+    def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        """Scale every row of ``matrix`` to unit length (zero rows are left as is)."""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    @staticmethod
+    def max_sim(job_embeddings: np.ndarray, resume_embeddings: np.ndarray, chunk_counts: List[int]) -> np.ndarray:
+        """Chunk max-sim of one job description against several resumes.
+
+        ``resume_embeddings`` stacks each resume's chunk rows in order,
+        ``chunk_counts`` giving how many rows belong to each resume; all rows
+        must be unit length. For every job chunk the best resume chunk is
+        taken and the maxima are averaged, one value per resume.
+        """
+        if not chunk_counts:
+            return np.zeros(0, dtype=np.float32)
+        offsets = np.cumsum([0] + list(chunk_counts[:-1]))
+        # (resume chunks x job chunks) -> best resume chunk per job chunk, per resume
+        best = np.maximum.reduceat(resume_embeddings @ job_embeddings.T, offsets, axis=0)
+        return best.mean(axis=1)
+
+    @staticmethod
+    def cosine_similarities(matrix: np.ndarray, vector: np.ndarray) -> np.ndarray:
+        """Cosine similarity of every row of ``matrix`` against ``vector`` in one matrix-vector product."""
+        row_norms = np.linalg.norm(matrix, axis=1)
+        row_norms[row_norms == 0] = 1.0
+        vector_norm = np.linalg.norm(vector) or 1.0
+        return (matrix / row_norms[:, None]) @ (vector / vector_norm)
 
     def semantic_similarity(self, text1: str, text2: str) -> float:
         """Compute cosine similarity between two texts."""
@@ -66,23 +193,72 @@ class SemanticMatcher:
         }
     
     def calculate_semantic_match_score(self, resume_data: Dict[str, Any], job_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Calculate semantic match score between resume and job description."""
-        # Extract text content
-        resume_text = resume_data.get('content', '')
+        """Calculate semantic match score between resume and job description.
+
+        See ``batch_semantic_match_scores`` for how the score is computed.
+        """
+        return self.batch_semantic_match_scores([resume_data], job_data)[0]
+    
+    def batch_semantic_match_scores(self, resumes: List[Dict[str, Any]], job_data: Dict[str, Any], batch_size: int = 64) -> List[Dict[str, Any]]:
+        """Calculate semantic match scores for many resumes against one job description.
+
+        Documents are compared chunk by chunk (``resume_chunks`` and
+        ``job_chunks``) so long resumes are not cut off at the model's input
+        limit. For every job description chunk the best matching resume
+        chunk is taken, and the score is the mean of those maxima. All
+        chunks are encoded in one batch; the max-sim for the whole batch is
+        one matrix product followed by a segmented max over each resume's
+        rows. Results have the same shape as ``calculate_semantic_match_score``.
+        """
         job_text = job_data.get('content', '')
+        chunks_per_resume = [resume_chunks(resume) for resume in resumes]
+        job_chunk_texts = job_chunks(job_data)
+        resume_chunk_texts = [chunk for chunks in chunks_per_resume for chunk in chunks]
         
-        # Calculate semantic similarity
-        similarity_score = self.semantic_similarity(resume_text, job_text)
+        embeddings = self.normalize_rows(
+            self.embed_texts(job_chunk_texts + resume_chunk_texts, batch_size=batch_size)
+        )
+        job_embeddings = embeddings[:len(job_chunk_texts)]
+        resume_embeddings = embeddings[len(job_chunk_texts):]
         
-        # Convert to percentage
-        semantic_score = similarity_score * 100
+        similarities = self.max_sim(job_embeddings, resume_embeddings, [len(chunks) for chunks in chunks_per_resume])
         
-        return {
-            'semantic_match_score': round(semantic_score, 2),
-            'similarity_score': round(similarity_score, 4),
-            'resume_length': len(resume_text),
-            'job_length': len(job_text)
-        }
+        return [
+            {
+                'semantic_match_score': round(float(similarity) * 100, 2),
+                'similarity_score': round(float(similarity), 4),
+                'resume_length': len(resume.get('content', '')),
+                'job_length': len(job_text),
+                'resume_chunks': len(chunks),
+                'job_chunks': len(job_chunk_texts)
+            }
+            for resume, chunks, similarity in zip(resumes, chunks_per_resume, similarities)
+        ]
+    
+    def job_similarities(self, resume_data: Dict[str, Any], jobs: List[Dict[str, Any]], batch_size: int = 64) -> np.ndarray:
+        """Chunk max-sim similarity of one resume against many job descriptions.
+
+        The counterpart of ``batch_semantic_match_scores`` for ranking job
+        descriptions; returns one similarity in ``[-1, 1]`` per job.
+        """
+        if not jobs:
+            return np.zeros(0, dtype=np.float32)
+        
+        resume_chunk_texts = resume_chunks(resume_data)
+        chunks_per_job = [job_chunks(job) for job in jobs]
+        job_chunk_texts = [chunk for chunks in chunks_per_job for chunk in chunks]
+        
+        embeddings = self.normalize_rows(
+            self.embed_texts(resume_chunk_texts + job_chunk_texts, batch_size=batch_size)
+        )
+        resume_embeddings = embeddings[:len(resume_chunk_texts)]
+        job_embeddings = embeddings[len(resume_chunk_texts):]
+        
+        # Best resume chunk for every job chunk, then averaged per job
+        best = (job_embeddings @ resume_embeddings.T).max(axis=1)
+        counts = np.array([len(chunks) for chunks in chunks_per_job])
+        offsets = np.cumsum(np.concatenate([[0], counts[:-1]]))
+        return np.add.reduceat(best, offsets) / counts
     
     def generate_llm_feedback(self, resume_data: Dict[str, Any], job_data: Dict[str, Any], hard_match_results: Dict[str, Any]) -> Dict[str, Any]:
         """Generate LLM feedback for resume evaluation."""
@@ -0,0 +1,128 @@
+"""Precomputed skill index for exact, alias and fuzzy skill lookups."""
+
+import json
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+# Common spellings mapped to one canonical skill name
+SKILL_ALIASES = {
+    'js': 'javascript',
+    'java script': 'javascript',
+    'ts': 'typescript',
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'node js': 'node.js',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'react js': 'react',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'angularjs': 'angular',
+    'postgres': 'postgresql',
+    'psql': 'postgresql',
+    'mongo': 'mongodb',
+    'k8s': 'kubernetes',
+    'amazon web services': 'aws',
+    'google cloud': 'gcp',
+    'google cloud platform': 'gcp',
+    'microsoft azure': 'azure',
+    'ml': 'machine learning',
+    'dl': 'deep learning',
+    'natural language processing': 'nlp',
+    'cv': 'computer vision',
+    'sklearn': 'scikit-learn',
+    'scikit learn': 'scikit-learn',
+    'tf': 'tensorflow',
+    'py': 'python',
+    'python3': 'python',
+    'golang': 'go',
+    'cpp': 'c++',
+    'csharp': 'c#',
+    'dotnet': '.net',
+    'ci cd': 'ci/cd',
+    'cicd': 'ci/cd',
+}
+
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase, collapse whitespace and resolve aliases to a canonical name."""
+    normalized = re.sub(r'\s+', ' ', skill.strip().lower())
+    return SKILL_ALIASES.get(normalized, normalized)
+
+
+def normalized_skills(value: Union[str, List[str], None]) -> List[str]:
+    """Distinct normalized skills from a JSON list column or an already decoded list."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value or '[]')
+        except ValueError:
+            return []
+    if not isinstance(value, list):
+        return []
+    return list(dict.fromkeys(
+        normalize_skill(skill)[:255] for skill in value if isinstance(skill, str) and skill.strip()
+    ))
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Character trigrams of ``text`` padded so short skills still produce grams."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SkillIndex:
+    """Index of a resume's skills for O(1) exact hits and trigram-filtered fuzzy hits.
+
+    Fuzzy candidates are the skills sharing the most trigrams with the query;
+    only those are verified with ``SequenceMatcher``, so lookups do not scan
+    every resume skill.
+    """
+
+    def __init__(self, skills: List[str], max_candidates: int = 8):
+        """Build the exact-match table and trigram postings for ``skills``."""
+        self.skills = list(skills)
+        self.max_candidates = max_candidates
+        self._exact: Dict[str, str] = {}
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._lowered: List[str] = []
+
+        for position, skill in enumerate(self.skills):
+            lowered = skill.lower()
+            self._lowered.append(lowered)
+            self._exact.setdefault(lowered, skill)
+            self._exact.setdefault(normalize_skill(skill), skill)
+            for gram in _trigrams(lowered):
+                self._postings[gram].append(position)
+
+    def exact(self, skill: str) -> Optional[str]:
+        """Return the indexed skill equal to ``skill`` (case- and alias-insensitive)."""
+        lowered = skill.lower()
+        if lowered in self._exact:
+            return self._exact[lowered]
+        return self._exact.get(normalize_skill(skill))
+
+    def fuzzy(self, skill: str, threshold: float = 0.7) -> Tuple[Optional[str], float]:
+        """Return the best fuzzy match above ``threshold`` and its ratio, or ``(None, 0)``."""
+        query = skill.lower()
+        overlap: Dict[int, int] = defaultdict(int)
+        for gram in _trigrams(query):
+            for position in self._postings.get(gram, ()):
+                overlap[position] += 1
+
+        candidates = sorted(overlap, key=lambda position: (-overlap[position], position))[:self.max_candidates]
+
+        best_skill = None
+        best_score = 0.0
+        for position in sorted(candidates):
+            matcher = SequenceMatcher(None, query, self._lowered[position])
+            # Cheap upper bounds first; only a few candidates reach ratio()
+            if matcher.real_quick_ratio() <= threshold or matcher.quick_ratio() <= threshold:
+                continue
+            score = matcher.ratio()
+            if score > best_score and score > threshold:
+                best_score = score
+                best_skill = self.skills[position]
+
+        return best_skill, best_score
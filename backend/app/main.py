@@ -4,12 +4,31 @@ FastAPI application for Resume Evaluation System.
 Exposes API endpoints for resume parsing, evaluation, and AI processing.
 """
 
-import os
-from fastapi import FastAPI, APIRouter, UploadFile, File
+import json
+import threading
+from typing import List, Optional
+from fastapi import FastAPI, APIRouter, UploadFile, File, HTTPException, Depends, Query, Response
 from fastapi import Form
 from fastapi.middleware.cors import CORSMiddleware
-from app.config import FRONTEND_URL
-from datetime import datetime
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.config import (
+    FRONTEND_URL,
+    EVALUATION_QUEUE_PATH,
+    EVALUATION_WORKERS,
+    EVALUATION_QUEUE_MAX_PENDING,
+    EVALUATION_JOB_LEASE_SECONDS,
+    PRELOAD_MODELS
+)
+from app.model_registry import DEFAULT_SPACY_MODEL, get_spacy_model, model_stats, warm_up
+from app.services.evaluation_queue import EvaluationQueue, QueueFullError
+from app.services.upload_store import discard_upload, keep_upload, save_upload
+from app.services.resume_service import ResumeService
+from app.parsers.resume_parser import ResumeParser
+from app.database import SessionLocal, create_tables, get_db
+from app.models.database import Resume, JobDescription, ResumeEvaluation, EvaluationMissingSkill
+from app.evaluators.skill_index import normalize_skill
 
 # -----------------------------
 # App setup
@@ -22,6 +41,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-After-Id", "X-Total-Count"],
 )
 
 @app.get("/")
@@ -31,51 +51,171 @@ async def root():
 # -----------------------------
 # Setup spaCy NLP
 # -----------------------------
-try:
-    import spacy
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
+nlp = get_spacy_model()
+if nlp is None:
     import spacy.cli
-    spacy.cli.download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+    spacy.cli.download(DEFAULT_SPACY_MODEL)
+    nlp = get_spacy_model()
+
+# Load the remaining models now so forked workers share them
+if PRELOAD_MODELS:
+    warm_up()
+
+@app.get("/models")
+async def list_models():
+    return model_stats()
 
 # -----------------------------
-# In-memory "databases"
+# Database
 # -----------------------------
-resumes_db = []
-job_descriptions_db = []
-evaluations_db = []
+create_tables()
+resume_service = ResumeService()
+
+def _sync_candidate_index():
+    """Bring the candidate index up to date with the stored resumes."""
+    db = SessionLocal()
+    try:
+        print(f"Candidate index sync: {resume_service.sync_candidate_index(db)}")
+    except Exception as e:
+        print(f"Candidate index sync failed: {e}")
+    finally:
+        db.close()
+
+@app.on_event("startup")
+async def start_candidate_index_sync():
+    # Embedding a large backlog can take a while, so do not block startup on it
+    threading.Thread(target=_sync_candidate_index, name="candidate-index-sync", daemon=True).start()
+
+def _fit_keyword_model():
+    """Fit the TF-IDF keyword model over the stored corpus if none is persisted yet."""
+    db = SessionLocal()
+    try:
+        model = resume_service.ensure_keyword_model(db)
+        if model is not None:
+            print(f"Keyword model: {model.document_count} documents, fitted at {model.fitted_at}")
+    except Exception as e:
+        print(f"Keyword model fit failed: {e}")
+    finally:
+        db.close()
+
+@app.on_event("startup")
+async def start_keyword_model_fit():
+    threading.Thread(target=_fit_keyword_model, name="keyword-model-fit", daemon=True).start()
+
+@app.post("/keyword-model/refit")
+def refit_keyword_model(db: Session = Depends(get_db)):
+    try:
+        model = resume_service.refit_keyword_model(db)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"version": model.version, "document_count": model.document_count, "fitted_at": model.fitted_at}
 
 # -----------------------------
 # Resumes Router
 # -----------------------------
 resumes_router = APIRouter()
 
+# -----------------------------
+# Pagination
+# -----------------------------
+RESUME_LIST_FIELDS = "filename,student_name,student_email,skills,created_at"
+JOB_DESCRIPTION_LIST_FIELDS = "title,company,location,experience_required,created_at"
+EVALUATION_LIST_FIELDS = (
+    "resume_id,job_description_id,relevance_score,hard_match_score,semantic_match_score,verdict,created_at"
+)
+
+# Page size of the list endpoints when the client does not send ``limit``
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def _paginated(response: Response, model, fields: str, filters=None, sort: str = "id",
+               after_id: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE, count: bool = False,
+               db: Session = None):
+    """Run a keyset page query; the next page's cursor goes in ``X-Next-After-Id``.
+
+    With ``count`` the number of rows matching the filters, regardless of
+    paging, goes in ``X-Total-Count``; it costs a full count, so clients
+    ask for it explicitly.
+    """
+    try:
+        rows, next_after_id, total = resume_service.paginate(
+            db, model, [field.strip() for field in fields.split(",") if field.strip()],
+            filters, sort, after_id, limit, count
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_after_id is not None:
+        response.headers["X-Next-After-Id"] = str(next_after_id)
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    return rows
+
 @resumes_router.get("/")
-async def list_resumes():
-    return resumes_db
+def list_resumes(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after_id: Optional[int] = None,
+    count: bool = False,
+    sort: str = "id",
+    fields: str = RESUME_LIST_FIELDS,
+    db: Session = Depends(get_db)
+):
+    return _paginated(response, Resume, fields, None, sort, after_id, limit, count, db)
 
 @resumes_router.post("/")
 async def upload_resume(
     file: UploadFile = File(...),
     student_name: str = Form(...),
-    student_email: str = Form(...)
+    student_email: str = Form(...),
+    db: Session = Depends(get_db)
 ):
-    upload_dir = "data/uploads"
-    os.makedirs(upload_dir, exist_ok=True)
-    file_path = os.path.join(upload_dir, file.filename)
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
-    # Add to in-memory DB
-    resume_entry = {
-        "id": len(resumes_db) + 1,
-        "filename": file.filename,
-        "student_name": student_name,
-        "student_email": student_email,
-        "created_at": datetime.now().isoformat()
-    }
-    resumes_db.append(resume_entry)
-    return {"message": f"Resume '{file.filename}' uploaded successfully"}
+    stored = await save_upload(file, "data/uploads")
+
+    def save():
+        # Identical content was uploaded before: reuse that record and drop the new copy
+        existing = resume_service.find_resume_by_hash(db, stored["sha256"])
+        if existing:
+            discard_upload(stored)
+            return existing, True
+        # Parsed from the temporary file; it is only kept once the resume is stored
+        resume, created = resume_service.create_resume(
+            db, stored["file_path"], student_name, student_email, stored["sha256"], file.filename,
+            source_path=stored["temp_path"]
+        )
+        if created:
+            keep_upload(stored)
+        return resume, not created
+
+    try:
+        resume, duplicate = await run_in_threadpool(save)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    finally:
+        discard_upload(stored)
+    if duplicate:
+        return {
+            "message": f"Resume '{file.filename}' already uploaded",
+            "id": resume.id,
+            "duplicate": True
+        }
+    return {"message": f"Resume '{file.filename}' uploaded successfully", "id": resume.id, "duplicate": False}
+
+@resumes_router.get("/{resume_id}/top-job-descriptions")
+def resume_top_job_descriptions(
+    resume_id: int,
+    k: int = Query(20, ge=1, le=500),
+    shortlist: Optional[int] = Query(None, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    if not resume_service.get_resume_by_id(db, resume_id):
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return resume_service.top_job_descriptions(db, resume_id, k, shortlist)
+
+@resumes_router.delete("/{resume_id}")
+def delete_resume(resume_id: int, db: Session = Depends(get_db)):
+    if not resume_service.delete_resume(db, resume_id):
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return {"message": "Resume deleted successfully"}
 
 # -----------------------------
 # Job Descriptions Router
@@ -83,25 +223,66 @@ async def upload_resume(
 jobs_router = APIRouter()
 
 @jobs_router.get("/")
-async def list_job_descriptions():
-    return job_descriptions_db
+def list_job_descriptions(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after_id: Optional[int] = None,
+    count: bool = False,
+    sort: str = "id",
+    fields: str = JOB_DESCRIPTION_LIST_FIELDS,
+    db: Session = Depends(get_db)
+):
+    return _paginated(response, JobDescription, fields, None, sort, after_id, limit, count, db)
 
 @jobs_router.post("/")
-async def upload_job_description(file: UploadFile = File(...)):
-    upload_dir = "data/job_descriptions"
-    os.makedirs(upload_dir, exist_ok=True)
-    file_path = os.path.join(upload_dir, file.filename)
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
-    jd_entry = {
-        "id": len(job_descriptions_db) + 1,
-        "title": file.filename,
-        "company": "Unknown",
-        "location": "Unknown",
-        "created_at": datetime.now().isoformat()
-    }
-    job_descriptions_db.append(jd_entry)
-    return {"message": f"Job description '{file.filename}' uploaded successfully"}
+async def upload_job_description(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    stored = await save_upload(file, "data/job_descriptions")
+
+    def save():
+        content, _ = ResumeParser.load_text(stored["temp_path"], stored["sha256"])
+        existing = resume_service.find_job_description_by_content(db, content)
+        if existing:
+            discard_upload(stored)
+            return existing, True
+        job_description, created = resume_service.create_job_description(db, content)
+        if created:
+            keep_upload(stored)
+        return job_description, not created
+
+    try:
+        job_description, duplicate = await run_in_threadpool(save)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    finally:
+        discard_upload(stored)
+    if duplicate:
+        return {
+            "message": f"Job description '{file.filename}' already uploaded",
+            "id": job_description.id,
+            "duplicate": True
+        }
+    return {"message": f"Job description '{file.filename}' uploaded successfully", "id": job_description.id, "duplicate": False}
+
+@jobs_router.get("/{job_description_id}/skill-gaps")
+def job_description_skill_gaps(job_description_id: int, limit: int = Query(20, ge=1, le=200), db: Session = Depends(get_db)):
+    return resume_service.get_skill_gaps(db, job_description_id, limit)
+
+@jobs_router.get("/{job_description_id}/top-candidates")
+def job_description_top_candidates(
+    job_description_id: int,
+    k: int = Query(50, ge=1, le=500),
+    shortlist: Optional[int] = Query(None, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    if not resume_service.get_job_description_by_id(db, job_description_id):
+        raise HTTPException(status_code=404, detail="Job description not found")
+    return resume_service.top_candidates(db, job_description_id, k, shortlist)
+
+@jobs_router.delete("/{job_description_id}")
+def delete_job_description(job_description_id: int, db: Session = Depends(get_db)):
+    if not resume_service.delete_job_description(db, job_description_id):
+        raise HTTPException(status_code=404, detail="Job description not found")
+    return {"message": "Job description deleted successfully"}
 
 # -----------------------------
 # Evaluations Router
@@ -109,16 +290,124 @@ async def upload_job_description(file: UploadFile = File(...)):
 evaluations_router = APIRouter()
 
 @evaluations_router.get("/")
-async def list_evaluations():
-    return evaluations_db
+def list_evaluations(
+    response: Response,
+    job_description_id: Optional[int] = None,
+    resume_id: Optional[int] = None,
+    verdict: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    missing_skill: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after_id: Optional[int] = None,
+    count: bool = False,
+    sort: str = "id",
+    fields: str = EVALUATION_LIST_FIELDS,
+    db: Session = Depends(get_db)
+):
+    filters = []
+    if job_description_id is not None:
+        filters.append(ResumeEvaluation.job_description_id == job_description_id)
+    if resume_id is not None:
+        filters.append(ResumeEvaluation.resume_id == resume_id)
+    if verdict:
+        filters.append(ResumeEvaluation.verdict == verdict)
+    if min_score is not None:
+        filters.append(ResumeEvaluation.relevance_score >= min_score)
+    if max_score is not None:
+        filters.append(ResumeEvaluation.relevance_score <= max_score)
+    if missing_skill:
+        filters.append(ResumeEvaluation.id.in_(
+            db.query(EvaluationMissingSkill.evaluation_id).filter(
+                EvaluationMissingSkill.skill == normalize_skill(missing_skill)
+            )
+        ))
+    return _paginated(response, ResumeEvaluation, fields, filters, sort, after_id, limit, count, db)
+
+@evaluations_router.get("/summary")
+def evaluation_summary(job_description_id: Optional[int] = None, db: Session = Depends(get_db)):
+    return resume_service.get_evaluation_summary(db, job_description_id)
 
 @evaluations_router.post("/")
-async def create_evaluation(evaluation: dict):
-    evaluation_entry = evaluation.copy()
-    evaluation_entry["id"] = len(evaluations_db) + 1
-    evaluation_entry["created_at"] = datetime.now().isoformat()
-    evaluations_db.append(evaluation_entry)
-    return evaluation_entry
+def create_evaluation(evaluation: dict, db: Session = Depends(get_db)):
+    columns = {column.name for column in ResumeEvaluation.__table__.columns} - {"id", "created_at"}
+    values = {
+        key: json.dumps(value) if isinstance(value, (list, dict)) else value
+        for key, value in evaluation.items() if key in columns
+    }
+    try:
+        evaluation_entry = ResumeEvaluation(**values)
+        db.add(evaluation_entry)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=422, detail=f"Invalid evaluation: {e}")
+    db.refresh(evaluation_entry)
+    return evaluation_entry.to_dict()
+
+class EvaluationBatchRequest(BaseModel):
+    resume_ids: List[int]
+    job_description_id: int
+
+@evaluations_router.post("/batch")
+def evaluate_batch(request: EvaluationBatchRequest, db: Session = Depends(get_db)):
+    if not resume_service.get_job_description_by_id(db, request.job_description_id):
+        raise HTTPException(status_code=404, detail="Job description not found")
+    try:
+        evaluations = resume_service.evaluate_many(db, request.resume_ids, request.job_description_id)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return [evaluation.to_dict() for evaluation in evaluations]
+
+# -----------------------------
+# Evaluation job queue
+# -----------------------------
+evaluation_queue = EvaluationQueue(
+    EVALUATION_QUEUE_PATH,
+    workers=EVALUATION_WORKERS,
+    max_pending=EVALUATION_QUEUE_MAX_PENDING,
+    lease_seconds=EVALUATION_JOB_LEASE_SECONDS
+)
+
+@app.on_event("startup")
+async def start_evaluation_queue():
+    evaluation_queue.start()
+
+@app.on_event("shutdown")
+async def stop_evaluation_queue():
+    evaluation_queue.stop()
+
+class EvaluationJobRequest(BaseModel):
+    resume_id: int
+    job_description_id: int
+
+@evaluations_router.post("/jobs", status_code=202)
+def submit_evaluation_job(request: EvaluationJobRequest, db: Session = Depends(get_db)):
+    resume = resume_service.get_resume_by_id(db, request.resume_id)
+    job_description = resume_service.get_job_description_by_id(db, request.job_description_id)
+    if not resume or not job_description:
+        raise HTTPException(status_code=404, detail="Resume or job description not found")
+
+    payload = {
+        "resume_id": resume.id,
+        "job_description_id": job_description.id
+    }
+    try:
+        job_id = evaluation_queue.submit(payload)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    return {"job_id": job_id, "status": "pending"}
+
+@evaluations_router.get("/jobs/metrics")
+async def evaluation_queue_metrics():
+    return evaluation_queue.metrics()
+
+@evaluations_router.get("/jobs/{job_id}")
+async def get_evaluation_job(job_id: str):
+    job = evaluation_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Evaluation job not found")
+    return job
 
 # -----------------------------
 # Register routers
@@ -0,0 +1,122 @@
+"""Process-wide registry of NLP models shared by parsers and evaluators.
+
+Each model is loaded at most once per process and handed out as a shared,
+read-only instance. ``warm_up`` loads everything eagerly; calling it before
+the server forks its workers (e.g. ``gunicorn --preload``) lets the workers
+share the model pages copy-on-write instead of each loading their own copy.
+"""
+
+import gc
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_SPACY_MODEL = "en_core_web_sm"
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# "torch" runs the stock PyTorch model; "onnx" runs an exported ONNX Runtime
+# model (needs sentence-transformers>=3.2 with onnxruntime/optimum installed);
+# "int8" applies PyTorch dynamic int8 quantization to the Linear layers
+EMBEDDING_BACKENDS = ("torch", "onnx", "int8")
+
+_models: Dict[str, Any] = {}
+_stats: Dict[str, Dict[str, float]] = {}
+_lock = threading.Lock()
+
+
+def _resident_memory_mb() -> float:
+    """Current resident set size of this process in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        import resource
+        # ru_maxrss is the peak, in KB on Linux; good enough where /proc is missing
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _get_or_load(key: str, loader: Callable[[], Any]) -> Any:
+    """Return the cached model for ``key``, loading it once if needed."""
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            rss_before = _resident_memory_mb()
+            start = time.perf_counter()
+            model = loader()
+            _stats[key] = {
+                'load_time': round(time.perf_counter() - start, 3),
+                'rss_mb': round(_resident_memory_mb() - rss_before, 1)
+            }
+            _models[key] = model
+    return model
+
+
+def get_spacy_model(name: str = DEFAULT_SPACY_MODEL):
+    """Shared spaCy pipeline, or ``None`` if the model is not installed."""
+    import spacy
+
+    try:
+        return _get_or_load(f"spacy:{name}", lambda: spacy.load(name))
+    except OSError:
+        print(f"spaCy model not found. Please install with: python -m spacy download {name}")
+        return None
+
+
+def _load_sentence_transformer(name: str, backend: str):
+    """Load ``name`` for the given embedding backend."""
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "onnx":
+        # Uses the ONNX weights published with the model, exporting them on first load otherwise
+        return SentenceTransformer(name, backend="onnx", device="cpu")
+
+    if backend == "int8":
+        import torch
+
+        model = SentenceTransformer(name, device="cpu")
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    return SentenceTransformer(name)
+
+
+def embedding_model_id(name: str = DEFAULT_EMBEDDING_MODEL, backend: str = "torch") -> str:
+    """Identifier of the vectors a model/backend pair produces, for caches and indexes."""
+    return name if backend == "torch" else f"{name}:{backend}"
+
+
+def get_sentence_transformer(name: str = DEFAULT_EMBEDDING_MODEL, backend: Optional[str] = None):
+    """Shared SentenceTransformer model for ``backend`` (defaults to ``EMBEDDING_BACKEND``)."""
+    if backend is None:
+        from app.config import EMBEDDING_BACKEND
+        backend = EMBEDDING_BACKEND
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{backend}', expected one of {', '.join(EMBEDDING_BACKENDS)}")
+
+    return _get_or_load(
+        f"sentence-transformers:{embedding_model_id(name, backend)}",
+        lambda: _load_sentence_transformer(name, backend)
+    )
+
+
+def warm_up(spacy_models=(DEFAULT_SPACY_MODEL,), embedding_models=(DEFAULT_EMBEDDING_MODEL,)) -> Dict[str, Dict[str, float]]:
+    """Load the given models now and return their load statistics."""
+    for name in spacy_models:
+        get_spacy_model(name)
+    for name in embedding_models:
+        get_sentence_transformer(name)
+
+    # Keep the loaded objects out of future GC passes so forked workers
+    # do not dirty (and un-share) their pages just by scanning them
+    gc.freeze()
+    return model_stats()
+
+
+def model_stats() -> Dict[str, Dict[str, float]]:
+    """Load time (seconds) and resident memory added (MB) per loaded model."""
+    return {key: dict(stats) for key, stats in _stats.items()}
@@ -1,40 +1,93 @@
 """Database models for the Resume Evaluation System."""
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey
+import json
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
-from typing import Optional
-from backend.app.config import settings
+from typing import Any, Dict, List, Optional
+from app.config import settings
 
 Base = declarative_base()
 
 
+def _load_json(value: Optional[str], default: Any = None) -> Any:
+    """Decode a JSON text column, tolerating NULLs and legacy plain strings."""
+    if not value:
+        return [] if default is None else default
+    try:
+        return json.loads(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    """Serialize a datetime column for API responses."""
+    return value.isoformat() if value else None
+
+
+def project_row(model, fields: List[str], row) -> Dict[str, Any]:
+    """Serialize a column-projected query row, decoding the model's JSON columns."""
+    result = {}
+    for field, value in zip(fields, row):
+        if field in model.json_columns:
+            value = _load_json(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        result[field] = value
+    return result
+
+
 class JobDescription(Base):
     """Job description model."""
     
     __tablename__ = "job_descriptions"
+    json_columns = frozenset({
+        'must_have_skills', 'good_to_have_skills', 'qualifications', 'responsibilities', 'features'
+    })
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     company = Column(String(255), nullable=False)
     location = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)
+    content_hash = Column(String(64), index=True, unique=True)  # SHA-256 of content, dedup key
     must_have_skills = Column(Text)  # JSON string
     good_to_have_skills = Column(Text)  # JSON string
     qualifications = Column(Text)  # JSON string
     experience_required = Column(String(100))
+    responsibilities = Column(Text)  # JSON string
+    features = Column(Text)  # JSON feature record, see app.evaluators.features
+    features_version = Column(Integer)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     evaluations = relationship("ResumeEvaluation", back_populates="job_description")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """API representation with JSON columns decoded."""
+        return {
+            'id': self.id,
+            'title': self.title,
+            'company': self.company,
+            'location': self.location,
+            'content': self.content,
+            'must_have_skills': _load_json(self.must_have_skills),
+            'good_to_have_skills': _load_json(self.good_to_have_skills),
+            'qualifications': _load_json(self.qualifications),
+            'experience_required': self.experience_required,
+            'created_at': _isoformat(self.created_at)
+        }
 
 
 class Resume(Base):
     """Resume model."""
     
     __tablename__ = "resumes"
+    json_columns = frozenset({
+        'skills', 'education', 'experience', 'projects', 'certifications', 'sections', 'features'
+    })
     
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String(255), nullable=False)
@@ -46,18 +99,42 @@ class Resume(Base):
     experience = Column(Text)  # JSON string
     projects = Column(Text)  # JSON string
     certifications = Column(Text)  # JSON string
+    sections = Column(Text)  # JSON object, parsed section name -> text
     file_path = Column(String(500), nullable=False)
+    file_hash = Column(String(64), index=True, unique=True)  # SHA-256 of the uploaded file, dedup key
+    features = Column(Text)  # JSON feature record, see app.evaluators.features
+    features_version = Column(Integer)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     evaluations = relationship("ResumeEvaluation", back_populates="resume")
+    skill_rows = relationship("ResumeSkill", back_populates="resume", cascade="all, delete-orphan", passive_deletes=True)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """API representation with JSON columns decoded."""
+        return {
+            'id': self.id,
+            'filename': self.filename,
+            'student_name': self.student_name,
+            'student_email': self.student_email,
+            'skills': _load_json(self.skills),
+            'education': _load_json(self.education),
+            'experience': _load_json(self.experience),
+            'projects': _load_json(self.projects),
+            'certifications': _load_json(self.certifications),
+            'created_at': _isoformat(self.created_at)
+        }
 
 
 class ResumeEvaluation(Base):
     """Resume evaluation results model."""
     
     __tablename__ = "resume_evaluations"
+    json_columns = frozenset({
+        'matched_skills', 'missing_skills', 'missing_certifications',
+        'missing_projects', 'missing_qualifications', 'strengths', 'weaknesses'
+    })
     
     id = Column(Integer, primary_key=True, index=True)
     resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
@@ -88,13 +165,83 @@ class ResumeEvaluation(Base):
     evaluation_time = Column(Float)  # Time taken in seconds
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # Ranking per job description, lookups per resume, and recency
+    __table_args__ = (
+        Index("ix_resume_evaluations_jd_score", "job_description_id", relevance_score.desc()),
+        Index("ix_resume_evaluations_jd_verdict", "job_description_id", "verdict"),
+        Index("ix_resume_evaluations_resume_id", "resume_id"),
+        Index("ix_resume_evaluations_created_at", "created_at"),
+    )
+    
     # Relationships
     resume = relationship("Resume", back_populates="evaluations")
     job_description = relationship("JobDescription", back_populates="evaluations")
+    missing_skill_rows = relationship(
+        "EvaluationMissingSkill", back_populates="evaluation", cascade="all, delete-orphan", passive_deletes=True
+    )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """API representation with JSON columns decoded."""
+        return {
+            'id': self.id,
+            'resume_id': self.resume_id,
+            'job_description_id': self.job_description_id,
+            'relevance_score': self.relevance_score,
+            'hard_match_score': self.hard_match_score,
+            'semantic_match_score': self.semantic_match_score,
+            'verdict': self.verdict,
+            'matched_skills': _load_json(self.matched_skills),
+            'missing_skills': _load_json(self.missing_skills),
+            'missing_certifications': _load_json(self.missing_certifications),
+            'missing_projects': _load_json(self.missing_projects),
+            'missing_qualifications': _load_json(self.missing_qualifications),
+            'strengths': _load_json(self.strengths),
+            'weaknesses': _load_json(self.weaknesses),
+            'improvement_suggestions': _load_json(self.improvement_suggestions, ''),
+            'overall_feedback': self.overall_feedback,
+            'evaluation_time': self.evaluation_time,
+            'created_at': _isoformat(self.created_at)
+        }
+
+
+class ResumeSkill(Base):
+    """One normalized skill of a resume (mirrors ``Resume.skills``)."""
+    
+    __tablename__ = "resume_skills"
+    
+    id = Column(Integer, primary_key=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False)
+    skill = Column(String(255), nullable=False)  # normalized, lowercase
+    
+    __table_args__ = (
+        Index("ix_resume_skills_skill_resume", "skill", "resume_id"),
+        Index("ix_resume_skills_resume_id", "resume_id"),
+    )
+    
+    resume = relationship("Resume", back_populates="skill_rows")
+
+
+class EvaluationMissingSkill(Base):
+    """One normalized skill an evaluated resume is missing (mirrors ``ResumeEvaluation.missing_skills``)."""
+    
+    __tablename__ = "evaluation_missing_skills"
+    
+    id = Column(Integer, primary_key=True)
+    evaluation_id = Column(Integer, ForeignKey("resume_evaluations.id", ondelete="CASCADE"), nullable=False)
+    # Denormalized from the evaluation so gap queries need no join
+    job_description_id = Column(Integer, nullable=False)
+    resume_id = Column(Integer, nullable=False)
+    skill = Column(String(255), nullable=False)  # normalized, lowercase
+    
+    __table_args__ = (
+        Index("ix_evaluation_missing_skills_jd_skill", "job_description_id", "skill"),
+        Index("ix_evaluation_missing_skills_evaluation_id", "evaluation_id"),
+    )
+    
+    evaluation = relationship("ResumeEvaluation", back_populates="missing_skill_rows")
 
 if __name__ == "__main__":
     from sqlalchemy import create_engine
-    from app.config.settings import settings  # pyright: ignore[reportMissingImports]
 
     engine = create_engine(settings.database_url)
     Base.metadata.create_all(bind=engine)
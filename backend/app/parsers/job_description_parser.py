@@ -1,9 +1,38 @@
 """Job description parsing utilities for extracting structured requirements."""
 
-import re
 import json
 from typing import Dict, List, Any, Optional
-from spacy import load as spacy_load
+from app.model_registry import get_spacy_model
+from app.parsers import layout, patterns
+from app.parsers.skill_taxonomy import get_skill_taxonomy
+
+# Section headings, matched against whole layout lines
+JOB_HEADINGS = layout.build_headings({
+    'description': ['job description', 'about the role', 'role overview', 'job summary', 'overview'],
+    'responsibilities': [
+        'responsibilities', 'key responsibilities', 'roles and responsibilities', 'job responsibilities',
+        'what you will do', 'duties'
+    ],
+    'required_skills': [
+        'required skills', 'skills required', 'must have', 'must have skills', 'mandatory skills', 'technical skills',
+        'key skills', 'skills', 'requirements'
+    ],
+    'preferred_skills': ['preferred skills', 'good to have', 'nice to have', 'preferred qualifications', 'bonus skills'],
+    'qualifications': ['qualifications', 'educational requirements', 'education requirements', 'education',
+                       'eligibility'],
+    'soft_skills': ['soft skills'],
+    # Sections nothing is extracted from; they only end the previous one
+    'other': [
+        'what we offer', 'benefits', 'perks', 'application process', 'how to apply', 'contact', 'contact information',
+        'about us', 'about the company', 'equal opportunity employer'
+    ]
+})
+
+# Headings that may be followed by content on the same line ("Required Skills: Python, SQL")
+JOB_INLINE_HEADINGS = [
+    'job description', 'responsibilities', 'key responsibilities', 'required skills', 'must have', 'technical skills',
+    'preferred skills', 'good to have', 'nice to have', 'qualifications'
+]
 
 
 class JobDescriptionParser:
@@ -11,37 +40,31 @@ class JobDescriptionParser:
     
     def __init__(self):
         """Initialize the parser with spaCy model."""
-        try:
-            self.nlp = spacy_load("en_core_web_sm")
-        except OSError:
-            print("spaCy model not found. Please install with: python -m spacy download en_core_web_sm")
-            self.nlp = None
+        self.nlp = get_spacy_model()
+        
+        self.skill_taxonomy = get_skill_taxonomy()
     
     def clean_text(self, text: str) -> str:
         """Clean and normalize job description text."""
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = patterns.WHITESPACE.sub(' ', text)
         # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s.,;:!?()-]', ' ', text)
+        text = patterns.SPECIAL_CHARACTERS.sub(' ', text)
         # Remove multiple spaces
-        text = re.sub(r' +', ' ', text)
+        text = patterns.MULTIPLE_SPACES.sub(' ', text)
         return text.strip()
     
+    def extract_sections(self, text: str) -> Dict[str, str]:
+        """Split the (layout) text into sections at heading lines."""
+        sections, _ = layout.segment_lines(layout.layout_lines(text), JOB_HEADINGS, JOB_INLINE_HEADINGS)
+        return sections
+    
     def extract_job_title(self, text: str) -> str:
         """Extract job title from job description."""
         # Common job title patterns
-        title_patterns = [
-            r'job\s+title[:\s]+([^\n]+)',
-            r'position[:\s]+([^\n]+)',
-            r'role[:\s]+([^\n]+)',
-            r'we\s+are\s+looking\s+for\s+([^\n]+)',
-            r'hiring\s+for\s+([^\n]+)'
-        ]
-        
-        for pattern in title_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
+        match = patterns.JOB_TITLE.first(text)
+        if match:
+            return match[1].strip()
         
         # If no specific pattern found, try to extract from first few lines
         lines = text.split('\n')[:5]
@@ -55,88 +78,64 @@ class JobDescriptionParser:
     def extract_company(self, text: str) -> str:
         """Extract company name from job description."""
         # Look for company name patterns
-        company_patterns = [
-            r'at\s+([A-Z][a-zA-Z\s&]+)',
-            r'company[:\s]+([A-Z][a-zA-Z\s&]+)',
-            r'organization[:\s]+([A-Z][a-zA-Z\s&]+)'
-        ]
-        
-        for pattern in company_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
+        match = patterns.COMPANY.first(text)
+        if match:
+            return match[1].strip()
         
         return "Company Name"  # Default fallback
     
     def extract_location(self, text: str) -> str:
         """Extract job location from job description."""
         # Common location patterns
-        location_patterns = [
-            r'location[:\s]+([^\n]+)',
-            r'based\s+in\s+([^\n]+)',
-            r'office\s+in\s+([^\n]+)',
-            r'hybrid\s+([^\n]+)',
-            r'remote\s+([^\n]+)'
-        ]
-        
-        for pattern in location_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
+        match = patterns.LOCATION.first(text)
+        if match:
+            return match[1].strip()
         
         # Look for common city names
-        cities = ['Hyderabad', 'Bangalore', 'Pune', 'Delhi', 'Mumbai', 'Chennai', 'Kolkata']
-        for city in cities:
-            if city.lower() in text.lower():
-                return city
+        match = patterns.CITY.first(text)
+        if match:
+            return match[0]
         
         return "Location Not Specified"
     
-    def extract_skills(self, text: str) -> Dict[str, List[str]]:
-        """Extract must-have and good-to-have skills."""
+    def extract_skills(self, text: str, sections: Optional[Dict[str, str]] = None) -> Dict[str, List[str]]:
+        """Extract must-have and good-to-have skills.
+        
+        Dictionary skills are routed by the section they appear in: a skill
+        in the required skills section is must-have, one only in the preferred
+        skills section is good-to-have. Skills mentioned elsewhere are
+        must-have if the posting marks its skills as mandatory at all.
+        """
         must_have_skills = []
         good_to_have_skills = []
-        
-        # Common technical skills
-        technical_skills = [
-            'python', 'java', 'javascript', 'react', 'angular', 'vue', 'node.js',
-            'django', 'flask', 'fastapi', 'spring', 'express', 'sql', 'mysql',
-            'postgresql', 'mongodb', 'redis', 'docker', 'kubernetes', 'aws',
-            'azure', 'gcp', 'git', 'github', 'gitlab', 'jenkins', 'ci/cd',
-            'machine learning', 'deep learning', 'tensorflow', 'pytorch',
-            'pandas', 'numpy', 'scikit-learn', 'opencv', 'nlp', 'computer vision',
-            'html', 'css', 'bootstrap', 'jquery', 'typescript', 'php', 'ruby',
-            'c++', 'c#', '.net', 'android', 'ios', 'swift', 'kotlin'
-        ]
-        
-        text_lower = text.lower()
-        
-        # Extract skills mentioned in requirements
-        for skill in technical_skills:
-            if skill in text_lower:
-                # Check if it's mentioned as must-have
-                if any(keyword in text_lower for keyword in ['must', 'required', 'mandatory', 'essential']):
-                    must_have_skills.append(skill.title())
-                else:
-                    good_to_have_skills.append(skill.title())
-        
-        # Look for specific skill sections
-        skills_section_patterns = [
-            r'required\s+skills[:\s]*([^\n]+)',
-            r'must\s+have[:\s]*([^\n]+)',
-            r'technical\s+skills[:\s]*([^\n]+)',
-            r'qualifications[:\s]*([^\n]+)'
+        sections = self.extract_sections(text) if sections is None else sections
+        
+        # Check once whether the posting marks its skills as must-have
+        is_mandatory = patterns.MANDATORY_KEYWORD.any_match(text)
+        required = set(self.skill_taxonomy.find_skills(sections.get('required_skills', '')))
+        preferred = set(self.skill_taxonomy.find_skills(sections.get('preferred_skills', ''))) - required
+        
+        # Extract dictionary skills in a single pass over the text
+        for skill in self.skill_taxonomy.find_skills(text):
+            if skill in required or (skill not in preferred and is_mandatory):
+                must_have_skills.append(skill.title())
+            else:
+                good_to_have_skills.append(skill.title())
+        
+        # Take listed skills from the skill sections, or from inline "required skills: ..." phrases
+        listed = [
+            (must_have_skills, sections.get('required_skills', '')),
+            (good_to_have_skills, sections.get('preferred_skills', ''))
         ]
+        if not any(section_text for _, section_text in listed):
+            listed = [(must_have_skills, skills_text) for _, skills_text in patterns.SKILL_SECTIONS.first_each(text)]
         
-        for pattern in skills_section_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                skills_text = match.group(1)
-                skills_list = re.split(r'[,;|\n]', skills_text)
-                for skill in skills_list:
-                    skill = skill.strip()
-                    if skill and len(skill) > 1:
-                        must_have_skills.append(skill)
+        for target, skills_text in listed:
+            skills_list = patterns.LIST_SEPARATORS.split(skills_text)
+            for skill in skills_list:
+                skill = skill.strip()
+                if skill and len(skill) > 1:
+                    target.append(skill)
         
         return {
             'must_have': list(set(must_have_skills)),
@@ -145,86 +144,60 @@ class JobDescriptionParser:
     
     def extract_qualifications(self, text: str) -> List[str]:
         """Extract educational qualifications required."""
-        qualifications = []
-        
         # Common qualification patterns
-        qual_patterns = [
-            r'bachelor[s]?\s+of\s+\w+',
-            r'master[s]?\s+of\s+\w+',
-            r'phd\s+in\s+\w+',
-            r'b\.?[a-z]\.?[a-z]\.?',
-            r'm\.?[a-z]\.?[a-z]\.?',
-            r'ph\.?d\.?',
-            r'degree\s+in\s+([^\n]+)',
-            r'qualification[:\s]+([^\n]+)'
-        ]
-        
-        for pattern in qual_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if isinstance(match, tuple):
-                    qualifications.append(match[0].strip())
-                else:
-                    qualifications.append(match.strip())
+        qualifications = [match.strip() for match in patterns.QUALIFICATION.findall(text)]
         
         return list(set(qualifications))
     
     def extract_experience_required(self, text: str) -> str:
         """Extract years of experience required."""
-        # Experience patterns
-        exp_patterns = [
-            r'(\d+)\s*[-+]?\s*years?\s+of\s+experience',
-            r'experience[:\s]+(\d+)\s*years?',
-            r'(\d+)\s*[-+]?\s*years?\s+in\s+',
-            r'minimum\s+(\d+)\s*years?'
-        ]
-        
-        for pattern in exp_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return f"{match.group(1)} years"
+        match = patterns.EXPERIENCE_REQUIRED.first(text)
+        if match:
+            return f"{match[1]} years"
         
         return "Not specified"
     
-    def extract_responsibilities(self, text: str) -> List[str]:
+    def extract_responsibilities(self, text: str, sections: Optional[Dict[str, str]] = None) -> List[str]:
         """Extract job responsibilities."""
         responsibilities = []
         
-        # Look for responsibility sections
-        resp_patterns = [
-            r'responsibilities[:\s]*([^\n]+)',
-            r'key\s+responsibilities[:\s]*([^\n]+)',
-            r'job\s+description[:\s]*([^\n]+)',
-            r'what\s+you\s+will\s+do[:\s]*([^\n]+)'
-        ]
-        
-        for pattern in resp_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                resp_text = match.group(1)
-                # Split by common delimiters
-                resp_list = re.split(r'[•\-\*\n]', resp_text)
-                for resp in resp_list:
-                    resp = resp.strip()
-                    if resp and len(resp) > 10:
-                        responsibilities.append(resp)
+        # One responsibility per line of the responsibilities section
+        sections = self.extract_sections(text) if sections is None else sections
+        for resp in sections.get('responsibilities', '').split('\n'):
+            resp = resp.strip()
+            if len(resp) > 10:
+                responsibilities.append(resp)
+        if responsibilities:
+            return responsibilities
+        
+        # Otherwise look for inline responsibility phrases
+        for _, resp_text in patterns.RESPONSIBILITY_SECTIONS.first_each(text):
+            # Split by common delimiters
+            resp_list = patterns.BULLET_SEPARATORS.split(resp_text)
+            for resp in resp_list:
+                resp = resp.strip()
+                if resp and len(resp) > 10:
+                    responsibilities.append(resp)
         
         return responsibilities
     
     def parse_job_description(self, text: str) -> Dict[str, Any]:
         """Parse a job description and extract structured data."""
         try:
-            # Clean text
+            # Clean text; fields are extracted from the line-preserving layout so
+            # line-anchored patterns stop at the end of their line
             clean_text = self.clean_text(text)
+            layout_text = layout.layout_text(text)
+            sections = self.extract_sections(layout_text)
             
             # Extract structured data
-            title = self.extract_job_title(clean_text)
-            company = self.extract_company(clean_text)
-            location = self.extract_location(clean_text)
-            skills = self.extract_skills(clean_text)
-            qualifications = self.extract_qualifications(clean_text)
-            experience_required = self.extract_experience_required(clean_text)
-            responsibilities = self.extract_responsibilities(clean_text)
+            title = self.extract_job_title(layout_text)
+            company = self.extract_company(layout_text)
+            location = self.extract_location(layout_text)
+            skills = self.extract_skills(layout_text, sections)
+            qualifications = self.extract_qualifications(layout_text)
+            experience_required = self.extract_experience_required(layout_text)
+            responsibilities = self.extract_responsibilities(layout_text, sections)
             
             return {
                 'title': title,
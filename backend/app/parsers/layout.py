@@ -0,0 +1,153 @@
+"""Line/block layout of extracted text and section segmentation over it.
+
+``clean_text`` collapses every run of whitespace into one space, which is
+what embeddings and content hashes want, but it throws away the line breaks
+that delimit resume and job posting sections. The layout track keeps them:
+each line is normalized the same way as the flat text and runs of blank
+lines become a single empty line separating blocks. Layout lines also keep
+``+``, ``#`` and ``/``, so skill names such as C++, C# and CI/CD survive for
+the skill dictionary scan.
+
+Sections are cut by ``slice_sections``: every heading position is collected
+in one pass, the positions are sorted once and each section is the slice
+between consecutive headings. The parsers use it both for layout lines and
+for spaCy tokens of text without line breaks.
+"""
+
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.parsers import patterns
+
+# Heading lookup: normalized heading text -> section name
+Headings = Dict[str, str]
+
+# A heading found at ``(position, section, strength)``; strength is in [0, 1]
+HeadingHit = Tuple[int, str, float]
+
+# Longest line prefix (before a colon) that is still considered a heading
+MAX_HEADING_CHARS = 60
+
+# Heading strength of a line that is only a heading, written in capitals or
+# ending in a colon; of any other heading-only line; and of an inline heading
+EMPHASIZED_HEADING = 1.0
+PLAIN_HEADING = 0.9
+INLINE_HEADING = 0.8
+
+# A section needs this many words for its confidence to reach its heading's strength
+FULL_SECTION_WORDS = 8
+
+_HEADING_NOISE = re.compile(r'[^a-z ]+')
+
+
+def normalize_line(line: str) -> str:
+    """Normalize one line like ``clean_text`` does (keeping skill symbols), dropping a leading bullet marker."""
+    line = patterns.LAYOUT_SPECIAL_CHARACTERS.sub(' ', line)
+    line = patterns.WHITESPACE.sub(' ', line).strip()
+    return patterns.BULLET_PREFIX.sub('', line)
+
+
+def layout_lines(text: str) -> List[str]:
+    """Normalized lines of ``text``, with blank-line runs reduced to one empty line."""
+    lines: List[str] = []
+    for line in text.splitlines():
+        line = normalize_line(line)
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    while lines and not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def layout_text(text: str) -> str:
+    """``layout_lines`` joined with newlines."""
+    return "\n".join(layout_lines(text))
+
+
+def heading_key(text: str) -> str:
+    """Lowercase words of ``text``, the form headings are looked up by."""
+    text = text.lower().replace('&', ' and ')
+    return ' '.join(_HEADING_NOISE.sub(' ', text).split())
+
+
+def build_headings(sections: Dict[str, Iterable[str]]) -> Headings:
+    """Heading lookup from ``{section: [heading, ...]}``."""
+    return {heading_key(heading): section for section, headings in sections.items() for heading in headings}
+
+
+def find_heading(line: str, headings: Headings, inline: Iterable[str] = ()) -> Optional[Tuple[str, str, float]]:
+    """``(section, rest, strength)`` if ``line`` opens a section, else ``None``.
+
+    A heading is either the whole line (optionally ending in a colon) or,
+    for the heading keys in ``inline``, the part before a colon with the
+    section's first content after it (``Skills: Python, SQL``).
+    """
+    head, colon, rest = line.partition(':')
+    if len(head) > MAX_HEADING_CHARS:
+        return None
+    key = heading_key(head)
+    section = headings.get(key)
+    if section is None:
+        return None
+    rest = rest.strip()
+    if rest:
+        return (section, rest, INLINE_HEADING) if key in inline else None
+    return section, rest, EMPHASIZED_HEADING if colon or head.isupper() else PLAIN_HEADING
+
+
+def slice_sections(hits: List[HeadingHit], count: int,
+                   body: Callable[[int, int], str]) -> Tuple[Dict[str, str], Dict[str, float]]:
+    """Cut ``count`` units (lines or tokens) into sections between consecutive headings.
+
+    ``hits`` may be in any order: they are sorted once and each section
+    runs from its heading to the next one, so segmentation costs
+    O(h log h + n) for h headings over n units. ``body(start, end)`` is the
+    content of the heading at ``start`` up to ``end``.
+
+    Returns ``(sections, confidence)``. A section that occurs more than once
+    has its contents joined and keeps its best confidence: the heading's
+    strength, scaled down for sections shorter than ``FULL_SECTION_WORDS``.
+    Units before the first heading belong to no section.
+    """
+    hits = sorted(hits)
+    ends = [position for position, _, _ in hits[1:]] + [count]
+    contents: Dict[str, List[str]] = {}
+    confidence: Dict[str, float] = {}
+
+    for (start, section, strength), end in zip(hits, ends):
+        content = body(start, end)
+        score = strength * min(1.0, len(content.split()) / FULL_SECTION_WORDS)
+        if content:
+            contents.setdefault(section, []).append(content)
+        confidence[section] = max(confidence.get(section, 0.0), score)
+
+    sections = {section: "\n".join(contents.get(section, [])) for section in confidence}
+    return sections, confidence
+
+
+def segment_lines(lines: List[str], headings: Headings,
+                  inline: Iterable[str] = ()) -> Tuple[Dict[str, str], Dict[str, float]]:
+    """Split layout lines into sections at heading lines (see ``slice_sections``).
+
+    Content keeps one line per layout line, with an inline heading's rest
+    as its first line; blank separator lines are dropped.
+    """
+    inline = frozenset(heading_key(heading) for heading in inline)
+    hits: List[HeadingHit] = []
+    first_lines: Dict[int, str] = {}
+
+    for position, line in enumerate(lines):
+        heading = find_heading(line, headings, inline) if line else None
+        if heading is not None:
+            section, rest, strength = heading
+            hits.append((position, section, strength))
+            if rest:
+                first_lines[position] = rest
+
+    def body(start: int, end: int) -> str:
+        block = [line for line in lines[start + 1:end] if line]
+        if start in first_lines:
+            block.insert(0, first_lines[start])
+        return "\n".join(block)
+
+    return slice_sections(hits, len(lines), body)
@@ -0,0 +1,165 @@
+"""Precompiled regex bank shared by the resume and job description parsers.
+
+Every field's patterns are compiled once at import into a ``PatternBank``
+of named alternatives instead of being rebuilt (and looked up in the ``re``
+cache) on every call.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+Alternatives = List[Tuple[str, str]]
+
+
+class PatternBank:
+    """Named regex alternatives for one field, in priority order.
+
+    Alternatives are written in lowercase and matched case-sensitively
+    against the lowercased text. ``re`` only uses its fast literal-prefix
+    scan for case-sensitive patterns, which makes each search about ten
+    times faster than with ``re.IGNORECASE``. Values are sliced from the
+    original text, so they keep their case. Text whose lowercase form has a
+    different length (a few non-ASCII letters) is matched with
+    ``re.IGNORECASE`` copies instead. When an alternative has a capture
+    group, that group is its value; otherwise the whole match is.
+    """
+
+    def __init__(self, alternatives: Alternatives):
+        """Compile ``alternatives``, highest priority first."""
+        self.alternatives = alternatives
+        self.names = [name for name, _ in alternatives]
+        self._folded = [re.compile(regex) for _, regex in alternatives]
+        self._ignorecase = [re.compile(regex, re.IGNORECASE) for _, regex in alternatives]
+
+    def _prepare(self, text: str) -> Tuple[str, List[re.Pattern]]:
+        """Text to scan and the compiled alternatives to scan it with."""
+        folded = text.lower()
+        if len(folded) == len(text):
+            return folded, self._folded
+        return text, self._ignorecase
+
+    @staticmethod
+    def _value(text: str, match: re.Match) -> str:
+        """Value of ``match``, taken from the original ``text``."""
+        start, end = match.span(1) if match.re.groups else match.span()
+        return text[start:end]
+
+    def any_match(self, text: str) -> bool:
+        """Whether any alternative occurs in ``text``."""
+        scanned, compiled = self._prepare(text)
+        return any(pattern.search(scanned) for pattern in compiled)
+
+    def first(self, text: str) -> Optional[Tuple[str, str]]:
+        """``(name, value)`` of the highest-priority alternative found in ``text``."""
+        scanned, compiled = self._prepare(text)
+        for name, pattern in zip(self.names, compiled):
+            match = pattern.search(scanned)
+            if match:
+                return name, self._value(text, match)
+        return None
+
+    def first_each(self, text: str) -> List[Tuple[str, str]]:
+        """``(name, value)`` of the leftmost match of every alternative that occurs, in priority order."""
+        scanned, compiled = self._prepare(text)
+        found = []
+        for name, pattern in zip(self.names, compiled):
+            match = pattern.search(scanned)
+            if match:
+                found.append((name, self._value(text, match)))
+        return found
+
+    def findall(self, text: str) -> List[str]:
+        """Values of all matches of every alternative, alternative by alternative."""
+        scanned, compiled = self._prepare(text)
+        return [self._value(text, match) for pattern in compiled for match in pattern.finditer(scanned)]
+
+
+# Text cleaning
+WHITESPACE = re.compile(r'\s+')
+SPECIAL_CHARACTERS = re.compile(r'[^\w\s.,;:!?()-]')
+# Layout lines also keep the symbols of skill names such as C++, C# and CI/CD
+LAYOUT_SPECIAL_CHARACTERS = re.compile(r'[^\w\s.,;:!?()+#/-]')
+MULTIPLE_SPACES = re.compile(r' +')
+BULLET_PREFIX = re.compile(r'^-+\s+')
+
+# Delimiters of inline lists
+LIST_SEPARATORS = re.compile(r'[,;|\n]')
+BULLET_SEPARATORS = re.compile(r'[•\-\*\n]')
+
+DEGREE_ALTERNATIVES = [
+    ('bachelor_of', r'bachelor[s]?\s+of\s+\w+'),
+    ('master_of', r'master[s]?\s+of\s+\w+'),
+    ('phd_in', r'phd\s+in\s+\w+'),
+    ('b_degree', r'b\.?[a-z]\.?[a-z]\.?'),
+    ('m_degree', r'm\.?[a-z]\.?[a-z]\.?'),
+    ('phd', r'ph\.?d\.?')
+]
+
+# Resume fields
+RESUME_DEGREE = PatternBank(DEGREE_ALTERNATIVES)
+
+RESUME_JOB_TITLE = PatternBank([
+    ('software_engineer', r'software\s+engineer'),
+    ('data_scientist', r'data\s+scientist'),
+    ('web_developer', r'web\s+developer'),
+    ('full_stack_developer', r'full\s+stack\s+developer'),
+    ('frontend_developer', r'frontend\s+developer'),
+    ('backend_developer', r'backend\s+developer'),
+    ('machine_learning_engineer', r'machine\s+learning\s+engineer'),
+    ('devops_engineer', r'devops\s+engineer')
+])
+
+# Job description fields
+JOB_TITLE = PatternBank([
+    ('job_title', r'job\s+title[:\s]+([^\n]+)'),
+    ('position', r'position[:\s]+([^\n]+)'),
+    ('role', r'role[:\s]+([^\n]+)'),
+    ('looking_for', r'we\s+are\s+looking\s+for\s+([^\n]+)'),
+    ('hiring_for', r'hiring\s+for\s+([^\n]+)')
+])
+
+COMPANY = PatternBank([
+    ('at', r'at\s+([a-z][a-z\s&]+)'),
+    ('company', r'company[:\s]+([a-z][a-z\s&]+)'),
+    ('organization', r'organization[:\s]+([a-z][a-z\s&]+)')
+])
+
+LOCATION = PatternBank([
+    ('location', r'location[:\s]+([^\n]+)'),
+    ('based_in', r'based\s+in\s+([^\n]+)'),
+    ('office_in', r'office\s+in\s+([^\n]+)'),
+    ('hybrid', r'hybrid\s+([^\n]+)'),
+    ('remote', r'remote\s+([^\n]+)')
+])
+
+CITY = PatternBank([
+    (city, city.lower()) for city in ['Hyderabad', 'Bangalore', 'Pune', 'Delhi', 'Mumbai', 'Chennai', 'Kolkata']
+])
+
+MANDATORY_KEYWORD = PatternBank([(keyword, keyword) for keyword in ['must', 'required', 'mandatory', 'essential']])
+
+SKILL_SECTIONS = PatternBank([
+    ('required_skills', r'required\s+skills[:\s]*([^\n]+)'),
+    ('must_have', r'must\s+have[:\s]*([^\n]+)'),
+    ('technical_skills', r'technical\s+skills[:\s]*([^\n]+)'),
+    ('qualifications', r'qualifications[:\s]*([^\n]+)')
+])
+
+QUALIFICATION = PatternBank(DEGREE_ALTERNATIVES + [
+    ('degree_in', r'degree\s+in\s+([^\n]+)'),
+    ('qualification', r'qualification[:\s]+([^\n]+)')
+])
+
+EXPERIENCE_REQUIRED = PatternBank([
+    ('years_of_experience', r'(\d+)\s*[-+]?\s*years?\s+of\s+experience'),
+    ('experience_years', r'experience[:\s]+(\d+)\s*years?'),
+    ('years_in', r'(\d+)\s*[-+]?\s*years?\s+in\s+'),
+    ('minimum_years', r'minimum\s+(\d+)\s*years?')
+])
+
+RESPONSIBILITY_SECTIONS = PatternBank([
+    ('responsibilities', r'responsibilities[:\s]*([^\n]+)'),
+    ('key_responsibilities', r'key\s+responsibilities[:\s]*([^\n]+)'),
+    ('job_description', r'job\s+description[:\s]*([^\n]+)'),
+    ('what_you_will_do', r'what\s+you\s+will\s+do[:\s]*([^\n]+)')
+])
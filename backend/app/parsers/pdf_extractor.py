@@ -0,0 +1,136 @@
+"""Page-streaming PDF text extraction with a pdfplumber fallback and a per-document budget."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
+
+import fitz  # PyMuPDF
+import pdfplumber
+
+# Bump whenever the extracted text for the same file can change
+PDF_EXTRACTOR_VERSION = 1
+
+# Below this share of readable characters PyMuPDF output is treated as garbled
+MIN_READABLE_RATIO = 0.6
+READABLE_PUNCTUATION = frozenset(".,;:!?()-/&%+@#'\"*")
+
+
+class ExtractionBudget:
+    """Wall-time and output-size limits for extracting one document.
+
+    ``None`` disables a limit. Extraction stops at the first page boundary
+    after a limit is hit and keeps the text gathered so far.
+    """
+
+    def __init__(self, max_seconds: Optional[float] = None, max_chars: Optional[int] = None):
+        """Start the clock for one document."""
+        self.max_seconds = max_seconds
+        self.max_chars = max_chars
+        self.started = time.perf_counter()
+        self.chars = 0
+        self.exceeded = False
+
+    def elapsed(self) -> float:
+        """Seconds since the budget was created."""
+        return time.perf_counter() - self.started
+
+    def consume(self, text: str) -> bool:
+        """Account for one page of ``text``; ``False`` once a limit has been reached."""
+        self.chars += len(text)
+        if self.max_chars is not None and self.chars >= self.max_chars:
+            self.exceeded = True
+        if self.max_seconds is not None and self.elapsed() >= self.max_seconds:
+            self.exceeded = True
+        return not self.exceeded
+
+
+def is_garbled(text: str) -> bool:
+    """Whether ``text`` looks like a failed extraction (empty, or mostly replacement/unmapped glyphs)."""
+    visible = [char for char in text if not char.isspace()]
+    if not visible:
+        return True
+    readable = sum(1 for char in visible if char.isalnum() or char in READABLE_PUNCTUATION)
+    return readable / len(visible) < MIN_READABLE_RATIO
+
+
+def iter_pdf_pages(file_path: str, start: int = 0, stop: Optional[int] = None,
+                   budget: Optional[ExtractionBudget] = None) -> Iterator[str]:
+    """Yield the PyMuPDF text of pages ``start``..``stop`` one page at a time."""
+    with fitz.open(file_path) as doc:
+        stop = doc.page_count if stop is None else min(stop, doc.page_count)
+        for number in range(start, stop):
+            text = doc[number].get_text()
+            yield text
+            if budget is not None and not budget.consume(text):
+                return
+
+
+def iter_pdfplumber_pages(file_path: str, budget: Optional[ExtractionBudget] = None) -> Iterator[str]:
+    """Yield layout-preserving pdfplumber text one page at a time (trailing padding stripped)."""
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text(layout=True) or ""
+            text = "\n".join(line.rstrip() for line in text.splitlines()).strip("\n") + "\n"
+            page.close()
+            yield text
+            if budget is not None and not budget.consume(text):
+                return
+
+
+def _page_count(file_path: str) -> int:
+    """Number of pages in the PDF."""
+    with fitz.open(file_path) as doc:
+        return doc.page_count
+
+
+def _extract_pages_parallel(file_path: str, page_count: int, workers: int) -> List[str]:
+    """Extract contiguous page ranges on worker threads, each with its own document handle."""
+    step = (page_count + workers - 1) // workers
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+        parts = pool.map(lambda bounds: list(iter_pdf_pages(file_path, *bounds)), ranges)
+        return [page for part in parts for page in part]
+
+
+def extract_pdf_text(file_path: str, max_seconds: Optional[float] = None, max_chars: Optional[int] = None,
+                     page_workers: int = 1, parallel_min_pages: int = 8) -> str:
+    """Extract the text of a PDF.
+
+    PyMuPDF is tried first, page by page, and the pages are joined once at
+    the end. Documents with at least ``parallel_min_pages`` pages are split
+    across ``page_workers`` threads. Only when PyMuPDF returns empty or
+    garbled text is pdfplumber's layout-aware extraction tried, with
+    whatever remains of the time budget.
+    """
+    budget = ExtractionBudget(max_seconds, max_chars)
+
+    page_count = _page_count(file_path) if page_workers > 1 else 0
+    if page_workers > 1 and page_count >= parallel_min_pages:
+        # Threads cannot stop mid-range, so the budget is applied to the result
+        pages = _extract_pages_parallel(file_path, page_count, page_workers)
+        kept = []
+        for page in pages:
+            kept.append(page)
+            if not budget.consume(page):
+                break
+        pages = kept
+    else:
+        pages = list(iter_pdf_pages(file_path, budget=budget))
+    text = "".join(pages)
+
+    if is_garbled(text) and not budget.exceeded:
+        remaining = None if max_seconds is None else max(max_seconds - budget.elapsed(), 0.0)
+        fallback_budget = ExtractionBudget(remaining, max_chars)
+        try:
+            fallback = "".join(iter_pdfplumber_pages(file_path, budget=fallback_budget))
+        except Exception as e:
+            print(f"pdfplumber fallback failed for {file_path}: {e}")
+            fallback = ""
+        if fallback.strip() and not is_garbled(fallback):
+            text = fallback
+            budget.chars = fallback_budget.chars
+        budget.exceeded = fallback_budget.exceeded
+
+    if budget.exceeded:
+        print(f"Extraction budget reached for {file_path} after {budget.elapsed():.2f}s and {budget.chars} characters")
+    return text
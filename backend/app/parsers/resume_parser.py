@@ -1,76 +1,215 @@
 """Resume parsing utilities for extracting text and structured data from PDF/DOCX files."""
 
 import os
-import json
-import re
-from typing import Dict, List, Optional, Any
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Tuple
 from pathlib import Path
 
-import fitz  # PyMuPDF
-import pdfplumber
-from docx import Document
 import docx2txt
-import spacy
 from spacy.matcher import Matcher
 
+from app.hashing import file_sha256
+from app.model_registry import get_spacy_model
+from app.parsers import layout, patterns
+from app.parsers.pdf_extractor import PDF_EXTRACTOR_VERSION, extract_pdf_text
+from app.parsers.skill_taxonomy import get_skill_taxonomy
+from app.parsers.text_cache import get_text_cache
+
+# Bump when clean_text changes; cached raw text is then re-cleaned, not re-extracted
+CLEAN_TEXT_VERSION = 1
+
+# Text extractor version per file type, part of the extracted-text cache key
+EXTRACTOR_VERSIONS = {
+    '.pdf': f"pdf-{PDF_EXTRACTOR_VERSION}",
+    '.docx': "docx-1",
+    '.txt': "txt-1"
+}
+
+# Section headings, matched against whole layout lines
+RESUME_HEADINGS = layout.build_headings({
+    'skills': [
+        'skills', 'technical skills', 'key skills', 'core skills', 'skill set', 'skillset', 'technologies',
+        'technical proficiency', 'tech stack', 'programming languages', 'computer skills', 'it skills',
+        'core competencies', 'competencies', 'areas of expertise', 'technical expertise', 'tools and technologies',
+        'skills and tools', 'skills and technologies', 'soft skills'
+    ],
+    'education': [
+        'education', 'academic background', 'academics', 'academic details', 'academic qualifications',
+        'educational qualifications', 'educational background', 'education details', 'qualifications',
+        'education and training'
+    ],
+    'experience': [
+        'experience', 'work experience', 'professional experience', 'employment', 'employment history',
+        'work history', 'career history', 'internships', 'internship experience', 'experience and internships',
+        'relevant experience'
+    ],
+    'projects': ['projects', 'project', 'academic projects', 'personal projects', 'key projects', 'major projects',
+                 'project work'],
+    'certifications': ['certifications', 'certification', 'certificates', 'courses', 'certifications and courses',
+                       'licenses and certifications', 'trainings'],
+    # Sections nothing is extracted from; they only end the previous one
+    'other': [
+        'summary', 'professional summary', 'profile', 'profile summary', 'objective', 'career objective',
+        'about me', 'achievements', 'awards', 'honors', 'awards and achievements', 'publications', 'references',
+        'interests', 'hobbies', 'languages', 'extracurricular activities', 'activities', 'declaration',
+        'personal details', 'personal information', 'contact', 'contact information', 'strengths', 'volunteering',
+        'leadership', 'positions of responsibility'
+    ]
+})
+
+# Headings that may be followed by content on the same line ("Skills: Python, SQL")
+RESUME_INLINE_HEADINGS = [
+    'skills', 'technical skills', 'key skills', 'education', 'experience', 'work experience', 'projects',
+    'certifications', 'summary', 'objective', 'career objective'
+]
+
+# Sections reported for every resume
+RESUME_SECTIONS = ['skills', 'education', 'experience', 'projects', 'certifications']
+
+# Single-token headings for text without line breaks, by matcher label
+TOKEN_HEADINGS = {
+    'SKILLS': ['skills', 'technical', 'technologies', 'tools', 'programming'],
+    'EDUCATION': ['education', 'academic', 'qualification', 'degree'],
+    'EXPERIENCE': ['experience', 'work', 'employment', 'career'],
+    'PROJECTS': ['projects'],
+    'CERTIFICATIONS': ['certifications'],
+    'OTHER': ['achievements', 'awards', 'publications', 'references']
+}
+
+# Strength of a token heading followed by a colon, or written in capitals or title case;
+# lowercase heading words without a colon are ordinary prose ("tools for work")
+COLON_TOKEN_HEADING = 0.6
+CASED_TOKEN_HEADING = 0.5
+
+
+class ParseContext:
+    """Shared state for a single resume parse.
+
+    Holds two views of the resume: ``text``, the flat cleaned text the
+    extractors and embeddings work on, and ``layout``, the same text with its
+    line structure kept (see ``app.parsers.layout``). Tokenizes the cleaned
+    text once and segments sections once, so every extractor works off the
+    same spaCy ``Doc`` and section map; ``section_confidence`` scores each
+    section in [0, 1]. Time spent in each stage is recorded in ``timings``
+    (seconds).
+    """
+
+    def __init__(self, parser: "ResumeParser", text: str, doc=None, layout_text: Optional[str] = None):
+        """Tokenize the text with the parser's spaCy pipeline.
+
+        A ``doc`` that was already produced for ``text`` (e.g. by ``nlp.pipe``)
+        is used as-is instead of being tokenized again. ``layout_text``
+        defaults to the layout of ``text`` itself.
+        """
+        self.parser = parser
+        self.text = text
+        self.layout = layout_text if layout_text is not None else layout.layout_text(text)
+        self.timings: Dict[str, float] = {}
+        self._sections: Optional[Dict[str, str]] = None
+        self._section_confidence: Dict[str, float] = {}
+
+        if doc is not None:
+            self.doc = doc
+        else:
+            with self.timed('tokenize'):
+                self.doc = parser.nlp(text) if parser.nlp else None
+
+    @contextmanager
+    def timed(self, stage: str):
+        """Accumulate wall time spent in ``stage``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] = self.timings.get(stage, 0.0) + time.perf_counter() - start
+
+    def _segment(self):
+        """Segment sections once: at layout lines, or at tokens for text without line breaks."""
+        if self._sections is None:
+            with self.timed('sections'):
+                if '\n' in self.layout:
+                    found = self.parser._sections_from_layout(self.layout)
+                else:
+                    found = self.parser._sections_from_doc(self.doc)
+                self._sections, self._section_confidence = found
+
+    @property
+    def sections(self) -> Dict[str, str]:
+        """Section map, computed on first access and reused afterwards."""
+        self._segment()
+        return self._sections
+
+    @property
+    def section_confidence(self) -> Dict[str, float]:
+        """Confidence of each entry of ``sections``, 0.0 for sections that were not found."""
+        self._segment()
+        return self._section_confidence
+
+
+def _extract_worker(file_path: str) -> Tuple[str, str, str, str]:
+    """Process-pool entry point: extract and clean the text of one file.
+
+    Returns ``(file_path, raw_text, clean_text, error)``; ``error`` is empty on success.
+    """
+    try:
+        raw_text, clean_text = ResumeParser.load_text(file_path)
+        if not raw_text:
+            return file_path, "", "", "Could not extract text from file"
+        return file_path, raw_text, clean_text, ""
+    except Exception as e:
+        return file_path, "", "", str(e)
+
 
 class ResumeParser:
     """Parse resumes from PDF and DOCX files."""
     
     def __init__(self):
         """Initialize the parser with spaCy model."""
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            print("spaCy model not found. Please install with: python -m spacy download en_core_web_sm")
-            self.nlp = None
+        self.nlp = get_spacy_model()
         
         self.matcher = Matcher(self.nlp.vocab) if self.nlp else None
         self._setup_patterns()
+        self.skill_taxonomy = get_skill_taxonomy()
     
     def _setup_patterns(self):
-        """Setup regex patterns for extracting resume sections."""
-        if not self.matcher:
+        """Setup token patterns for section headings in text without line breaks."""
+        if self.matcher is None:
             return
-            
-        # Skills patterns
-        skills_pattern = [
-            {"LOWER": {"IN": ["skills", "technical", "technologies", "tools", "programming"]}},
-            {"OP": ":"},
-            {"OP": "?"}
-        ]
-        self.matcher.add("SKILLS", [skills_pattern])
-        
-        # Education patterns
-        education_pattern = [
-            {"LOWER": {"IN": ["education", "academic", "qualification", "degree"]}},
-            {"OP": ":"},
-            {"OP": "?"}
-        ]
-        self.matcher.add("EDUCATION", [education_pattern])
         
-        # Experience patterns
-        experience_pattern = [
-            {"LOWER": {"IN": ["experience", "work", "employment", "career"]}},
-            {"OP": ":"},
-            {"OP": "?"}
-        ]
-        self.matcher.add("EXPERIENCE", [experience_pattern])
+        # One heading token, optionally followed by a colon; overlaps keep the longer span
+        for label, words in TOKEN_HEADINGS.items():
+            pattern = [
+                {"LOWER": {"IN": words}},
+                {"ORTH": ":", "OP": "?"}
+            ]
+            self.matcher.add(label, [pattern], greedy="LONGEST")
     
-    def extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file using PyMuPDF."""
+    @staticmethod
+    def extract_text_from_pdf(file_path: str) -> str:
+        """Extract text from PDF file using PyMuPDF, falling back to pdfplumber for unreadable output."""
+        from app.config import (
+            PDF_EXTRACT_MAX_SECONDS,
+            PDF_EXTRACT_MAX_CHARS,
+            PDF_PAGE_WORKERS,
+            PDF_PARALLEL_MIN_PAGES
+        )
         try:
-            doc = fitz.open(file_path)
-            text = ""
-            for page in doc:
-                text += page.get_text()
-            doc.close()
-            return text
+            return extract_pdf_text(
+                file_path,
+                max_seconds=PDF_EXTRACT_MAX_SECONDS or None,
+                max_chars=PDF_EXTRACT_MAX_CHARS or None,
+                page_workers=PDF_PAGE_WORKERS,
+                parallel_min_pages=PDF_PARALLEL_MIN_PAGES
+            )
         except Exception as e:
             print(f"Error extracting text from PDF: {e}")
             return ""
     
-    def extract_text_from_docx(self, file_path: str) -> str:
+    @staticmethod
+    def extract_text_from_docx(file_path: str) -> str:
         """Extract text from DOCX file."""
         try:
             return docx2txt.process(file_path)
@@ -78,14 +217,15 @@ class ResumeParser:
             print(f"Error extracting text from DOCX: {e}")
             return ""
     
-    def extract_text(self, file_path: str) -> str:
+    @staticmethod
+    def extract_text(file_path: str) -> str:
         """Extract text from file based on extension."""
         file_ext = Path(file_path).suffix.lower()
         
         if file_ext == '.pdf':
-            return self.extract_text_from_pdf(file_path)
+            return ResumeParser.extract_text_from_pdf(file_path)
         elif file_ext == '.docx':
-            return self.extract_text_from_docx(file_path)
+            return ResumeParser.extract_text_from_docx(file_path)
         elif file_ext == '.txt':  # <-- Add support for plain text files
             try:
                 with open(file_path, "r", encoding="utf-8") as f:
@@ -95,172 +235,262 @@ class ResumeParser:
         else:
             raise ValueError(f"Unsupported file format: {file_ext}")
     
-    def clean_text(self, text: str) -> str:
+    @staticmethod
+    def load_text(file_path: str, file_hash: Optional[str] = None) -> Tuple[str, str]:
+        """Raw and cleaned text of a file, served from the extracted-text cache when possible.
+
+        The cache is keyed by the file's SHA-256 (``file_hash``, computed if
+        not given) and the extractor version for its type, so a hit never
+        opens the document itself.
+        """
+        cache = get_text_cache()
+        version = EXTRACTOR_VERSIONS.get(Path(file_path).suffix.lower())
+        if cache is None or version is None:
+            raw_text = ResumeParser.extract_text(file_path)
+            return raw_text, ResumeParser.clean_text(raw_text)
+        
+        file_hash = file_hash or file_sha256(file_path)
+        entry = cache.get(file_hash, version)
+        if entry is not None and entry['clean_version'] == CLEAN_TEXT_VERSION:
+            return entry['raw'], entry['clean']
+        
+        raw_text = entry['raw'] if entry is not None else ResumeParser.extract_text(file_path)
+        clean_text = ResumeParser.clean_text(raw_text)
+        if raw_text:
+            cache.put(file_hash, version, raw_text, clean_text, CLEAN_TEXT_VERSION)
+        return raw_text, clean_text
+    
+    @staticmethod
+    def clean_text(text: str) -> str:
         """Clean and normalize extracted text."""
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = patterns.WHITESPACE.sub(' ', text)
         # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s.,;:!?()-]', ' ', text)
+        text = patterns.SPECIAL_CHARACTERS.sub(' ', text)
         # Remove multiple spaces
-        text = re.sub(r' +', ' ', text)
+        text = patterns.MULTIPLE_SPACES.sub(' ', text)
         return text.strip()
     
-    def extract_sections(self, text: str) -> Dict[str, str]:
+    def create_context(self, text: str, layout_text: Optional[str] = None) -> ParseContext:
+        """Build a shared parse context for ``text`` (and its layout, if already known)."""
+        return ParseContext(self, text, layout_text=layout_text)
+    
+    def extract_sections(self, text: str, context: Optional[ParseContext] = None) -> Dict[str, str]:
         """Extract structured sections from resume text."""
-        sections = {
-            'skills': '',
-            'education': '',
-            'experience': '',
-            'projects': '',
-            'certifications': ''
-        }
-        
-        if not self.nlp:
-            return sections
+        context = context or self.create_context(text)
+        return context.sections
+    
+    @staticmethod
+    def _resume_sections(sections: Dict[str, str], confidence: Dict[str, float]) -> Tuple[Dict[str, str], Dict[str, float]]:
+        """Restrict segmenter output to ``RESUME_SECTIONS``, filling in missing ones."""
+        return (
+            {section: sections.get(section, '') for section in RESUME_SECTIONS},
+            {section: round(confidence.get(section, 0.0), 3) for section in RESUME_SECTIONS}
+        )
+    
+    def _sections_from_layout(self, layout_text: str) -> Tuple[Dict[str, str], Dict[str, float]]:
+        """Segment sections at heading lines of the layout text, in one pass over its lines."""
+        found = layout.segment_lines(layout_text.split('\n'), RESUME_HEADINGS, RESUME_INLINE_HEADINGS)
+        return self._resume_sections(*found)
+    
+    def _sections_from_doc(self, doc) -> Tuple[Dict[str, str], Dict[str, float]]:
+        """Segment a tokenized document without line structure at single-token headings.
         
-        doc = self.nlp(text)
+        The matcher finds every heading in one pass; headings sort by
+        position and each section is the slice up to the next heading, so
+        the cost stays linear in the number of tokens however many heading
+        words the text contains. A heading token directly after another
+        one extends it and names the section ("Academic Projects").
+        """
+        if doc is None:
+            return self._resume_sections({}, {})
         
-        # Find section headers
-        for match_id, start, end in self.matcher(doc):
-            label = self.nlp.vocab.strings[match_id]
-            section_text = doc[start:end].text
-            
-            # Extract content after the header
-            next_section_start = self._find_next_section(doc, end)
-            content = doc[end:next_section_start].text.strip()
+        hits = []
+        content_starts = {}
+        previous_end = None
+        for match_id, start, end in sorted(self.matcher(doc), key=lambda match: match[1]):
+            token = doc[start]
+            if doc[end - 1].text == ':':
+                strength = COLON_TOKEN_HEADING
+            elif token.is_upper or token.is_title:
+                strength = CASED_TOKEN_HEADING
+            else:
+                continue
             
-            if label.lower() in sections:
-                sections[label.lower()] = content
-        
-        return sections
-    
-    def _find_next_section(self, doc, start_pos: int) -> int:
-        """Find the start of the next section."""
-        # Look for common section headers
-        section_headers = [
-            'education', 'experience', 'skills', 'projects', 'certifications',
-            'achievements', 'awards', 'publications', 'references'
-        ]
+            section = self.nlp.vocab.strings[match_id].lower()
+            if start == previous_end:
+                position, _, previous_strength = hits[-1]
+                hits[-1] = (position, section, max(previous_strength, strength))
+                content_starts[position] = end
+            else:
+                hits.append((start, section, strength))
+                content_starts[start] = end
+            previous_end = end
         
-        for i in range(start_pos, len(doc)):
-            token = doc[i]
-            if token.text.lower() in section_headers and i > start_pos + 5:
-                return i
+        def body(start: int, end: int) -> str:
+            return doc[content_starts[start]:end].text.strip()
         
-        return len(doc)
+        return self._resume_sections(*layout.slice_sections(hits, len(doc), body))
     
-    def extract_skills(self, text: str) -> List[str]:
+    def extract_skills(self, text: str, context: Optional[ParseContext] = None) -> List[str]:
         """Extract skills from resume text."""
-        skills = []
-        
-        # Common technical skills
-        technical_skills = [
-            'python', 'java', 'javascript', 'react', 'angular', 'vue', 'node.js',
-            'django', 'flask', 'fastapi', 'spring', 'express', 'sql', 'mysql',
-            'postgresql', 'mongodb', 'redis', 'docker', 'kubernetes', 'aws',
-            'azure', 'gcp', 'git', 'github', 'gitlab', 'jenkins', 'ci/cd',
-            'machine learning', 'deep learning', 'tensorflow', 'pytorch',
-            'pandas', 'numpy', 'scikit-learn', 'opencv', 'nlp', 'computer vision'
-        ]
-        
-        text_lower = text.lower()
-        for skill in technical_skills:
-            if skill in text_lower:
-                skills.append(skill.title())
+        # Dictionary skills, found in a single pass over the layout text, which
+        # unlike the flat text keeps names such as C++, C# and CI/CD intact
+        layout_text = context.layout if context is not None else layout.layout_text(text)
+        skills = [skill.title() for skill in self.skill_taxonomy.find_skills(layout_text)]
         
         # Extract skills from skills section
-        skills_section = self.extract_sections(text)['skills']
+        skills_section = self.extract_sections(text, context)['skills']
         if skills_section:
             # Split by common delimiters
-            skill_list = re.split(r'[,;|\n]', skills_section)
-            for skill in skill_list:
-                skill = skill.strip()
-                if skill and len(skill) > 1:
-                    skills.append(skill)
+            for line in skills_section.split('\n'):
+                # Drop a group label such as "Programming Languages:"
+                label, colon, items = line.partition(':')
+                if colon and len(label) <= layout.MAX_HEADING_CHARS:
+                    line = items
+                # Split by common delimiters
+                for skill in patterns.LIST_SEPARATORS.split(line):
+                    skill = skill.strip()
+                    if skill and len(skill) > 1:
+                        skills.append(skill)
         
         return list(set(skills))  # Remove duplicates
     
-    def extract_education(self, text: str) -> List[Dict[str, str]]:
+    def extract_education(self, text: str, context: Optional[ParseContext] = None) -> List[Dict[str, str]]:
         """Extract education information."""
         education = []
         
         # Common degree patterns
-        degree_patterns = [
-            r'bachelor[s]?\s+of\s+\w+',
-            r'master[s]?\s+of\s+\w+',
-            r'phd\s+in\s+\w+',
-            r'b\.?[a-z]\.?[a-z]\.?',
-            r'm\.?[a-z]\.?[a-z]\.?',
-            r'ph\.?d\.?'
-        ]
-        
-        education_section = self.extract_sections(text)['education']
+        education_section = self.extract_sections(text, context)['education']
         if education_section:
             lines = education_section.split('\n')
             for line in lines:
                 line = line.strip()
-                if any(re.search(pattern, line, re.IGNORECASE) for pattern in degree_patterns):
+                if patterns.RESUME_DEGREE.any_match(line):
                     education.append({'degree': line})
         
         return education
     
-    def extract_experience(self, text: str) -> List[Dict[str, str]]:
+    def extract_experience(self, text: str, context: Optional[ParseContext] = None) -> List[Dict[str, str]]:
         """Extract work experience information."""
         experience = []
         
         # Look for common job title patterns
-        job_patterns = [
-            r'software\s+engineer',
-            r'data\s+scientist',
-            r'web\s+developer',
-            r'full\s+stack\s+developer',
-            r'frontend\s+developer',
-            r'backend\s+developer',
-            r'machine\s+learning\s+engineer',
-            r'devops\s+engineer'
-        ]
-        
-        experience_section = self.extract_sections(text)['experience']
+        experience_section = self.extract_sections(text, context)['experience']
         if experience_section:
             lines = experience_section.split('\n')
             for line in lines:
                 line = line.strip()
-                if any(re.search(pattern, line, re.IGNORECASE) for pattern in job_patterns):
+                if patterns.RESUME_JOB_TITLE.any_match(line):
                     experience.append({'position': line})
         
         return experience
     
-    def parse_resume(self, file_path: str, student_name: str = "", student_email: str = "") -> Dict[str, Any]:
-        """Parse a resume file and extract structured data."""
+    def parse_resume(self, file_path: str, student_name: str = "", student_email: str = "",
+                     file_hash: Optional[str] = None) -> Dict[str, Any]:
+        """Parse a resume file and extract structured data.
+        
+        ``file_hash`` is the file's SHA-256 if the caller already has it; it
+        keys the extracted-text cache (see ``load_text``).
+        """
         try:
-            # Extract raw text
-            raw_text = self.extract_text(file_path)
+            # Extract (or look up) raw and cleaned text
+            raw_text, clean_text = self.load_text(file_path, file_hash)
             if not raw_text:
                 raise ValueError("Could not extract text from file")
             
-            # Clean text
-            clean_text = self.clean_text(raw_text)
-            
-            # Extract sections
-            sections = self.extract_sections(clean_text)
-            
-            # Extract structured data
-            skills = self.extract_skills(clean_text)
-            education = self.extract_education(clean_text)
-            experience = self.extract_experience(clean_text)
+            # Tokenize and segment once; every extractor shares the context
+            context = self.create_context(clean_text, layout.layout_text(raw_text))
             
-            return {
-                'filename': os.path.basename(file_path),
-                'student_name': student_name,
-                'student_email': student_email,
-                'content': clean_text,
-                'raw_content': raw_text,
-                'sections': sections,
-                'skills': skills,
-                'education': education,
-                'experience': experience,
-                'file_path': file_path
-            }
+            return self._build_result(file_path, raw_text, context, student_name, student_email)
         
         except Exception as e:
             raise ValueError(f"Error parsing resume: {str(e)}")
+    
+    def _build_result(self, file_path: str, raw_text: str, context: ParseContext,
+                      student_name: str = "", student_email: str = "") -> Dict[str, Any]:
+        """Run every extractor over a prepared context and assemble the parsed record."""
+        clean_text = context.text
+        sections = context.sections
+        
+        # Extract structured data
+        with context.timed('skills'):
+            skills = self.extract_skills(clean_text, context)
+        with context.timed('education'):
+            education = self.extract_education(clean_text, context)
+        with context.timed('experience'):
+            experience = self.extract_experience(clean_text, context)
+        
+        return {
+            'filename': os.path.basename(file_path),
+            'student_name': student_name,
+            'student_email': student_email,
+            'content': clean_text,
+            'raw_content': raw_text,
+            'sections': sections,
+            'section_confidence': context.section_confidence,
+            'skills': skills,
+            'education': education,
+            'experience': experience,
+            'file_path': file_path,
+            'timings': context.timings
+        }
+    
+    def parse_many(self, file_paths: Iterable[str], batch_size: int = 32, n_process: int = 1,
+                   extract_workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Parse many resume files, yielding each parsed record as soon as it is ready.
+        
+        Text extraction (PyMuPDF/docx2txt) runs in a process pool of
+        ``extract_workers`` processes (defaults to the CPU count), and the
+        cleaned texts are streamed through ``nlp.pipe`` with the given
+        ``batch_size`` and ``n_process``. At most a few batches of files are in
+        flight at once, so arbitrarily long path iterables can be consumed.
+        
+        Files that fail to extract are yielded as ``{'filename', 'file_path', 'error'}``
+        records instead of aborting the whole run.
+        """
+        workers = extract_workers or os.cpu_count() or 1
+        window = max(batch_size, 1) * workers
+        
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            extracted = self._extract_stream(pool, iter(file_paths), window)
+            yield from self._parse_stream(extracted, batch_size, n_process)
+    
+    @staticmethod
+    def _extract_stream(pool: ProcessPoolExecutor, paths: Iterator[str], window: int) -> Iterator[Tuple[str, str, str, str]]:
+        """Extract texts through ``pool`` with at most ``window`` files outstanding."""
+        while True:
+            chunk = list(islice(paths, window))
+            if not chunk:
+                return
+            yield from pool.map(_extract_worker, chunk)
+    
+    def _parse_stream(self, extracted: Iterator[Tuple[str, str, str, str]], batch_size: int,
+                      n_process: int) -> Iterator[Dict[str, Any]]:
+        """Tokenize extracted texts with ``nlp.pipe`` and run the extractors on each."""
+        failures: List[Dict[str, Any]] = []
+        
+        def texts():
+            # Failed files never reach spaCy; they are reported between batches
+            for file_path, raw_text, clean_text, error in extracted:
+                if error:
+                    failures.append({
+                        'filename': os.path.basename(file_path),
+                        'file_path': file_path,
+                        'error': f"Error parsing resume: {error}"
+                    })
+                    continue
+                yield clean_text, (file_path, raw_text, clean_text)
+        
+        if self.nlp:
+            docs = self.nlp.pipe(texts(), as_tuples=True, batch_size=batch_size, n_process=n_process)
+        else:
+            docs = ((None, meta) for _, meta in texts())
+        
+        for doc, (file_path, raw_text, clean_text) in docs:
+            while failures:
+                yield failures.pop(0)
+            context = ParseContext(self, clean_text, doc=doc, layout_text=layout.layout_text(raw_text))
+            yield self._build_result(file_path, raw_text, context)
+        
+        yield from failures
@@ -0,0 +1,124 @@
+"""Shared skill taxonomy compiled into a single-pass Aho-Corasick automaton."""
+
+import json
+import os
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), "skill_taxonomy.json")
+
+
+def _is_word_char(char: str) -> bool:
+    """Characters that may not touch either end of a skill match."""
+    return char.isalnum() or char == '_'
+
+
+class SkillAutomaton:
+    """Aho-Corasick automaton over lowercase skill surface forms.
+
+    Scanning is one pass over the text regardless of dictionary size; matches
+    are only reported on word boundaries, so "java" does not fire inside
+    "javascript" and "git" does not fire inside "digital".
+    """
+
+    def __init__(self, patterns: Dict[str, str]):
+        """Compile ``patterns`` (surface form -> canonical skill name)."""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str]]] = [[]]
+
+        for surface, canonical in patterns.items():
+            self._add(surface.lower(), canonical)
+        self._build_failure_links()
+
+    def _add(self, surface: str, canonical: str):
+        """Insert one surface form into the trie."""
+        state = 0
+        for char in surface:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append((len(surface), canonical))
+
+    def _build_failure_links(self):
+        """Breadth-first construction of failure links and merged outputs."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state].extend(self._out[self._fail[next_state]])
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """Return ``(start, end, canonical)`` for every word-bounded match in ``text``."""
+        text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        length = len(text)
+        matches = []
+        state = 0
+
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            if end < length and _is_word_char(text[end]) and _is_word_char(char):
+                continue
+            for size, canonical in out[state]:
+                start = end - size
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                matches.append((start, end, canonical))
+
+        return matches
+
+
+class SkillTaxonomy:
+    """Loadable skill dictionary (canonical names plus aliases)."""
+
+    def __init__(self, skills: List[Dict[str, object]], version: int = 1):
+        """Build the taxonomy from ``[{'name': ..., 'aliases': [...]}, ...]``."""
+        self.version = version
+        self.skills = [str(entry['name']).lower() for entry in skills]
+
+        patterns: Dict[str, str] = {}
+        for entry in skills:
+            name = str(entry['name']).lower()
+            patterns[name] = name
+            for alias in entry.get('aliases', []) or []:
+                patterns.setdefault(str(alias).lower(), name)
+        self.automaton = SkillAutomaton(patterns)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "SkillTaxonomy":
+        """Load a taxonomy JSON file (defaults to the bundled dictionary)."""
+        with open(path or DEFAULT_TAXONOMY_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data['skills'], data.get('version', 1))
+
+    def find_skills(self, text: str) -> List[str]:
+        """Canonical names of all skills mentioned in ``text``, in order of first mention."""
+        found = dict.fromkeys(canonical for _, _, canonical in self.automaton.find(text))
+        return list(found)
+
+
+@lru_cache(maxsize=None)
+def get_skill_taxonomy(path: Optional[str] = None) -> SkillTaxonomy:
+    """Process-wide taxonomy instance shared by all parsers."""
+    if path is None:
+        from app.config import SKILL_TAXONOMY_PATH
+        path = SKILL_TAXONOMY_PATH or None
+    return SkillTaxonomy.load(path)
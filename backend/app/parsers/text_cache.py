@@ -0,0 +1,147 @@
+"""Content-addressed cache of extracted resume text, stored as compressed blobs in SQLite."""
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+
+class ExtractedTextCache:
+    """Raw and cleaned text of uploaded files keyed by file SHA-256 and extractor version.
+
+    Both texts are zlib-compressed. The cleaned text records the cleaner
+    version that produced it, so a cleaner change only re-cleans the cached
+    raw text instead of re-extracting the file. Once the stored blobs exceed
+    ``max_bytes`` the least recently used entries are evicted.
+
+    The total blob size is kept in a meta row updated in the same transaction
+    as every insert and eviction, so checking the size limit on ``put`` does
+    not scan the table and stays exact when several processes share the file.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024):
+        """Open (or create) the cache database at ``path``."""
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS extracted_text (
+                file_sha256 TEXT NOT NULL,
+                extractor_version TEXT NOT NULL,
+                raw BLOB NOT NULL,
+                clean BLOB NOT NULL,
+                clean_version INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (file_sha256, extractor_version)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_extracted_text_last_used ON extracted_text (last_used)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS extracted_text_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        # Seeded once from the stored entries (for caches created before the meta row existed)
+        self._conn.execute(
+            "INSERT OR IGNORE INTO extracted_text_meta (key, value) "
+            "SELECT 'total_size', COALESCE(SUM(size), 0) FROM extracted_text"
+        )
+        self._conn.commit()
+
+    def get(self, file_sha256: str, extractor_version: str) -> Optional[Dict[str, Any]]:
+        """Cached ``{'raw', 'clean', 'clean_version'}`` for a file, or ``None`` on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT raw, clean, clean_version FROM extracted_text WHERE file_sha256 = ? AND extractor_version = ?",
+                (file_sha256, extractor_version)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE extracted_text SET last_used = ? WHERE file_sha256 = ? AND extractor_version = ?",
+                (time.time(), file_sha256, extractor_version)
+            )
+            self._conn.commit()
+
+        return {
+            'raw': zlib.decompress(row[0]).decode("utf-8"),
+            'clean': zlib.decompress(row[1]).decode("utf-8"),
+            'clean_version': row[2]
+        }
+
+    def put(self, file_sha256: str, extractor_version: str, raw: str, clean: str, clean_version: int):
+        """Store the texts of a file, evicting old entries if the cache is over its size limit."""
+        raw_blob = zlib.compress(raw.encode("utf-8"))
+        clean_blob = zlib.compress(clean.encode("utf-8"))
+
+        size = len(raw_blob) + len(clean_blob)
+
+        with self._lock:
+            # Adjust the running total first: this write opens the transaction,
+            # so the size of an entry being replaced is read under the write lock
+            self._conn.execute(
+                "UPDATE extracted_text_meta SET value = value + ? - COALESCE("
+                "(SELECT size FROM extracted_text WHERE file_sha256 = ? AND extractor_version = ?), 0) "
+                "WHERE key = 'total_size'",
+                (size, file_sha256, extractor_version)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extracted_text "
+                "(file_sha256, extractor_version, raw, clean, clean_version, size, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (file_sha256, extractor_version, raw_blob, clean_blob, clean_version, size, time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the blobs fit in ``max_bytes`` (lock held)."""
+        total = self._conn.execute("SELECT value FROM extracted_text_meta WHERE key = 'total_size'").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        cutoff = None
+        freed = 0
+        for last_used, size in self._conn.execute("SELECT last_used, size FROM extracted_text ORDER BY last_used"):
+            freed += size
+            cutoff = last_used
+            if total - freed <= self.max_bytes:
+                break
+        # Entries sharing the cutoff timestamp are deleted too; count what actually went
+        freed = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM extracted_text WHERE last_used <= ?", (cutoff,)
+        ).fetchone()[0]
+        self._conn.execute("DELETE FROM extracted_text WHERE last_used <= ?", (cutoff,))
+        self._conn.execute("UPDATE extracted_text_meta SET value = value - ? WHERE key = 'total_size'", (freed,))
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+
+def get_text_cache() -> Optional[ExtractedTextCache]:
+    """Per-process cache instance, or ``None`` when ``EXTRACTED_TEXT_CACHE_PATH`` is empty.
+
+    Instances are keyed by process id: a SQLite connection must not be used
+    across ``fork``, so a forked ``parse_many`` worker opens its own instead
+    of sharing the one it inherited from the parent.
+    """
+    return _text_cache_for_process(os.getpid())
+
+
+@lru_cache(maxsize=None)
+def _text_cache_for_process(pid: int) -> Optional[ExtractedTextCache]:
+    """Cache instance opened by process ``pid``."""
+    from app.config import EXTRACTED_TEXT_CACHE_PATH, EXTRACTED_TEXT_CACHE_MAX_MB
+    if not EXTRACTED_TEXT_CACHE_PATH:
+        return None
+    return ExtractedTextCache(EXTRACTED_TEXT_CACHE_PATH, EXTRACTED_TEXT_CACHE_MAX_MB * 1024 * 1024)
@@ -0,0 +1,293 @@
+"""SQLite-backed evaluation job queue served by a pool of preloaded worker processes."""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# Per-process models, loaded once by the pool initializer
+_worker_state: Dict[str, Any] = {}
+
+
+class QueueFullError(Exception):
+    """Raised when the queue is at capacity and new jobs must be retried later."""
+
+
+def _init_worker():
+    """Load the parsers and evaluator once per worker process."""
+    from app.database import engine
+    from app.services.resume_service import ResumeService
+
+    # Connections inherited from the parent process must not be reused
+    engine.dispose(close=False)
+    _worker_state['service'] = ResumeService()
+
+
+def _run_evaluation(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Evaluate the stored resume against the stored job description and persist the result."""
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        evaluation = _worker_state['service'].evaluate_resume_against_job(
+            db, payload['resume_id'], payload['job_description_id']
+        )
+        return evaluation.to_dict()
+    finally:
+        db.close()
+
+
+class EvaluationQueue:
+    """Durable job queue for resume evaluations.
+
+    Jobs are stored in SQLite so they survive restarts; a dispatcher thread
+    hands them to a bounded process pool whose workers keep the models
+    loaded. ``submit`` applies backpressure by refusing work once
+    ``max_pending`` jobs are waiting or running.
+
+    Several processes (e.g. uvicorn workers) may share one store. A claimed
+    job records its owner and a lease that the owner renews while the job
+    runs; only jobs whose lease has expired, because their owner died, are
+    returned to pending.
+    """
+
+    def __init__(self, path: str, workers: int = 2, max_pending: int = 100, lease_seconds: float = 60.0):
+        """Open the job store; call ``start`` to begin processing."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.workers = workers
+        self.max_pending = max_pending
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._last_heartbeat = 0.0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._in_flight = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS evaluation_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT,
+                owner TEXT,
+                lease_expires REAL
+            )
+            """
+        )
+        # Stores created before leases existed
+        columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(evaluation_jobs)")}
+        if 'owner' not in columns:
+            self._conn.execute("ALTER TABLE evaluation_jobs ADD COLUMN owner TEXT")
+        if 'lease_expires' not in columns:
+            self._conn.execute("ALTER TABLE evaluation_jobs ADD COLUMN lease_expires REAL")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_evaluation_jobs_status ON evaluation_jobs (status, created_at)")
+        self._conn.commit()
+
+    def start(self):
+        """Start the worker pool and the dispatcher thread."""
+        # Jobs whose owner died while running them are picked up again
+        self._reclaim_expired()
+
+        self._stopping.clear()
+        self._pool = self._new_pool()
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="evaluation-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def stop(self):
+        """Stop dispatching and shut the worker pool down."""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+            self._dispatcher = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def submit(self, payload: Dict[str, Any]) -> str:
+        """Enqueue an evaluation and return its job id without waiting for it."""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            backlog = self._conn.execute(
+                "SELECT COUNT(*) FROM evaluation_jobs WHERE status IN (?, ?)",
+                (PENDING, RUNNING)
+            ).fetchone()[0]
+            if backlog >= self.max_pending:
+                raise QueueFullError(f"Evaluation queue is full ({backlog} jobs outstanding)")
+
+            self._conn.execute(
+                "INSERT INTO evaluation_jobs (id, status, payload, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, PENDING, json.dumps(payload), datetime.utcnow().isoformat())
+            )
+            self._conn.commit()
+
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the status (and result, once finished) of a job."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM evaluation_jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+
+        return {
+            'id': row['id'],
+            'status': row['status'],
+            'result': json.loads(row['result']) if row['result'] else None,
+            'error': row['error'],
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at']
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth per status plus worker utilisation."""
+        with self._lock:
+            counts = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM evaluation_jobs GROUP BY status"
+            ).fetchall())
+            in_flight = self._in_flight
+
+        backlog = counts.get(PENDING, 0) + counts.get(RUNNING, 0)
+        return {
+            'pending': counts.get(PENDING, 0),
+            'running': counts.get(RUNNING, 0),
+            'completed': counts.get(COMPLETED, 0),
+            'failed': counts.get(FAILED, 0),
+            'workers': self.workers,
+            'busy_workers': in_flight,
+            'max_pending': self.max_pending,
+            'accepting': backlog < self.max_pending
+        }
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        """A fresh worker pool."""
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+
+    def _reclaim_expired(self):
+        """Return running jobs whose owner's lease has expired to pending."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE evaluation_jobs SET status = ?, started_at = NULL, owner = NULL, lease_expires = NULL "
+                "WHERE status = ? AND (lease_expires IS NULL OR lease_expires < ?)",
+                (PENDING, RUNNING, time.time())
+            )
+            self._conn.commit()
+
+    def _heartbeat(self):
+        """Renew the leases of this process's running jobs and reclaim expired ones."""
+        now = time.time()
+        if now - self._last_heartbeat < self.lease_seconds / 3:
+            return
+        self._last_heartbeat = now
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE evaluation_jobs SET lease_expires = ? WHERE status = ? AND owner = ?",
+                (now + self.lease_seconds, RUNNING, self.owner)
+            )
+            self._conn.commit()
+        self._reclaim_expired()
+
+    def _release(self, job_id: str):
+        """Return a job this process claimed but could not start to pending."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE evaluation_jobs SET status = ?, started_at = NULL, owner = NULL, lease_expires = NULL "
+                "WHERE id = ? AND owner = ?",
+                (PENDING, job_id, self.owner)
+            )
+            self._conn.commit()
+            self._in_flight -= 1
+
+    def _claim_next(self) -> Optional[sqlite3.Row]:
+        """Atomically move the oldest pending job to running, leased to this process."""
+        with self._lock:
+            while True:
+                row = self._conn.execute(
+                    "SELECT id, payload FROM evaluation_jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                    (PENDING,)
+                ).fetchone()
+                if row is None:
+                    return None
+                # Another process sharing the store may claim the same row first
+                claimed = self._conn.execute(
+                    "UPDATE evaluation_jobs SET status = ?, started_at = ?, owner = ?, lease_expires = ? "
+                    "WHERE id = ? AND status = ?",
+                    (RUNNING, datetime.utcnow().isoformat(), self.owner, time.time() + self.lease_seconds,
+                     row['id'], PENDING)
+                ).rowcount
+                self._conn.commit()
+                if claimed:
+                    self._in_flight += 1
+                    return row
+
+    def _dispatch_loop(self):
+        """Feed pending jobs to the pool, never exceeding one job per worker."""
+        while not self._stopping.is_set():
+            self._wakeup.clear()
+            self._heartbeat()
+
+            while self._in_flight < self.workers and not self._stopping.is_set():
+                row = self._claim_next()
+                if row is None:
+                    break
+                try:
+                    future = self._pool.submit(_run_evaluation, json.loads(row['payload']))
+                except BrokenProcessPool:
+                    # A worker died (OOM, crash in a native model); jobs it was running
+                    # fail through their futures, this one goes back to the queue
+                    self._release(row['id'])
+                    self._pool.shutdown(wait=False)
+                    self._pool = self._new_pool()
+                    break
+                future.add_done_callback(lambda f, job_id=row['id']: self._finish(job_id, f))
+
+            self._wakeup.wait(timeout=1.0)
+
+    def _finish(self, job_id: str, future):
+        """Record a finished job's result or error and wake the dispatcher."""
+        try:
+            result, error, status = json.dumps(future.result(), default=str), None, COMPLETED
+        except Exception as e:
+            result, error, status = None, str(e), FAILED
+
+        with self._lock:
+            # A job whose lease was lost has been handed to another owner; leave it to them
+            self._conn.execute(
+                "UPDATE evaluation_jobs SET status = ?, result = ?, error = ?, finished_at = ?, lease_expires = NULL "
+                "WHERE id = ? AND owner = ?",
+                (status, result, error, datetime.utcnow().isoformat(), job_id, self.owner)
+            )
+            self._conn.commit()
+            self._in_flight -= 1
+
+        self._wakeup.set()
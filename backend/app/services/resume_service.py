@@ -2,12 +2,29 @@
 
 import os
 import json
-from typing import Dict, List, Any, Optional
-from sqlalchemy.orm import Session
-from backend.app.models.database import Resume, JobDescription, ResumeEvaluation
-from backend.app.parsers.resume_parser import ResumeParser
-from backend.app.parsers.job_description_parser import JobDescriptionParser
-from backend.app.evaluators.resume_evaluator import ResumeEvaluator
+import hashlib
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+from sqlalchemy import and_, func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, load_only
+from app.models.database import (
+    Resume,
+    JobDescription,
+    ResumeEvaluation,
+    ResumeSkill,
+    EvaluationMissingSkill,
+    project_row
+)
+from app.parsers.resume_parser import ResumeParser
+from app.parsers.job_description_parser import JobDescriptionParser
+from app.evaluators.resume_evaluator import ResumeEvaluator
+from app.evaluators.keyword_model import KeywordModel
+from app.evaluators.features import FEATURE_VERSION, job_features, resume_features
+from app.evaluators.candidate_index import CandidateIndex
+from app.evaluators.job_index import JobIndex
+from app.hashing import file_sha256
+from app.evaluators.skill_index import normalize_skill, normalized_skills
 
 
 class ResumeService:
@@ -18,16 +35,61 @@ class ResumeService:
         self.resume_parser = ResumeParser()
         self.jd_parser = JobDescriptionParser()
         self.evaluator = ResumeEvaluator()
+        self._candidate_index: Optional[CandidateIndex] = None
+        self._candidate_index_lock = threading.Lock()
+        self.job_index = JobIndex()
     
-    def save_resume(self, db: Session, file_path: str, student_name: str, student_email: str) -> Resume:
-        """Save resume to database."""
+    @property
+    def candidate_index(self) -> CandidateIndex:
+        """Nearest-neighbour index of resume embeddings, opened on first use."""
+        if self._candidate_index is None:
+            with self._candidate_index_lock:
+                if self._candidate_index is None:
+                    from app.config import CANDIDATE_INDEX_PATH, EMBEDDING_STORE_DTYPE
+                    self._candidate_index = CandidateIndex(
+                        self.evaluator.semantic_matcher.model_id, CANDIDATE_INDEX_PATH or None,
+                        dtype=EMBEDDING_STORE_DTYPE or 'float32'
+                    )
+        return self._candidate_index
+    
+    def find_resume_by_hash(self, db: Session, file_hash: str) -> Optional[Resume]:
+        """Return the stored resume with the same file content, if any."""
+        return db.query(Resume).filter(Resume.file_hash == file_hash).first()
+    
+    def save_resume(self, db: Session, file_path: str, student_name: str, student_email: str,
+                    file_hash: Optional[str] = None, filename: Optional[str] = None) -> Resume:
+        """Save resume to database.
+        
+        A resume whose file content (``file_hash``, computed if not given) is
+        already stored is returned as-is instead of being parsed again.
+        ``filename`` overrides the stored name (defaults to the file's basename).
+        """
+        file_hash = file_hash or file_sha256(file_path)
+        existing = self.find_resume_by_hash(db, file_hash)
+        if existing:
+            return existing
+        resume, _ = self.create_resume(db, file_path, student_name, student_email, file_hash, filename)
+        return resume
+    
+    def create_resume(self, db: Session, file_path: str, student_name: str, student_email: str,
+                      file_hash: str, filename: Optional[str] = None,
+                      source_path: Optional[str] = None) -> Tuple[Resume, bool]:
+        """Parse and store a resume not found by ``find_resume_by_hash``.
+        
+        Returns ``(resume, created)``. ``file_hash`` is unique, so when a
+        concurrent upload of the same file is stored first the insert fails
+        and that resume is returned with ``created`` False. ``source_path``
+        is the file to parse when it has not been moved to ``file_path`` yet.
+        """
         try:
             # Parse resume
-            parsed_data = self.resume_parser.parse_resume(file_path, student_name, student_email)
+            parsed_data = self.resume_parser.parse_resume(
+                source_path or file_path, student_name, student_email, file_hash
+            )
             
             # Create resume record
             resume = Resume(
-                filename=parsed_data['filename'],
+                filename=filename or parsed_data['filename'],
                 student_name=parsed_data['student_name'],
                 student_email=parsed_data['student_email'],
                 content=parsed_data['content'],
@@ -36,22 +98,63 @@ class ResumeService:
                 experience=json.dumps(parsed_data['experience']),
                 projects=json.dumps(parsed_data['sections'].get('projects', [])),
                 certifications=json.dumps(parsed_data['sections'].get('certifications', [])),
-                file_path=file_path
+                sections=json.dumps(parsed_data['sections']),
+                file_path=file_path,
+                file_hash=file_hash
             )
+            resume.skill_rows = [ResumeSkill(skill=skill) for skill in normalized_skills(parsed_data['skills'])]
+            self._resume_features(resume)
             
             db.add(resume)
             db.commit()
             db.refresh(resume)
             
-            return resume
+            try:
+                self.index_resumes([resume.id], [resume.content], [json.loads(resume.features)['embedding_id']])
+            except Exception as e:
+                # The startup sync picks up resumes that could not be indexed here
+                print(f"Could not index resume {resume.id}: {e}")
             
+            return resume, True
+            
+        except IntegrityError as e:
+            db.rollback()
+            existing = self.find_resume_by_hash(db, file_hash)
+            if existing is None:
+                raise ValueError(f"Error saving resume: {str(e)}")
+            return existing, False
         except Exception as e:
             db.rollback()
             raise ValueError(f"Error saving resume: {str(e)}")
     
+    def job_description_hash(self, content: str) -> str:
+        """Dedup key for a job description: SHA-256 of its cleaned text."""
+        return hashlib.sha256(self.jd_parser.clean_text(content).encode('utf-8')).hexdigest()
+    
+    def find_job_description_by_content(self, db: Session, content: str) -> Optional[JobDescription]:
+        """Return the stored job description with the same cleaned text, if any."""
+        content_hash = self.job_description_hash(content)
+        return db.query(JobDescription).filter(JobDescription.content_hash == content_hash).first()
+    
     def save_job_description(self, db: Session, content: str, title: str = "", company: str = "", location: str = "") -> JobDescription:
-        """Save job description to database."""
+        """Save job description to database; identical postings are stored once."""
+        existing = self.find_job_description_by_content(db, content)
+        if existing:
+            return existing
+        job_description, _ = self.create_job_description(db, content, title, company, location)
+        return job_description
+    
+    def create_job_description(self, db: Session, content: str, title: str = "", company: str = "",
+                               location: str = "") -> Tuple[JobDescription, bool]:
+        """Parse and store a job description not found by ``find_job_description_by_content``.
+        
+        Returns ``(job_description, created)``; as in ``create_resume`` a
+        concurrent insert of the same posting wins and is returned with
+        ``created`` False.
+        """
+        content_hash = self.job_description_hash(content)
         try:
+            
             # Parse job description
             parsed_data = self.jd_parser.parse_job_description(content)
             
@@ -66,22 +169,115 @@ class ResumeService:
                 company=final_company,
                 location=final_location,
                 content=parsed_data['content'],
+                content_hash=content_hash,
                 must_have_skills=json.dumps(parsed_data['must_have_skills']),
                 good_to_have_skills=json.dumps(parsed_data['good_to_have_skills']),
                 qualifications=json.dumps(parsed_data['qualifications']),
-                experience_required=parsed_data['experience_required']
+                experience_required=parsed_data['experience_required'],
+                responsibilities=json.dumps(parsed_data['responsibilities'])
             )
+            self._job_features(job_description)
             
             db.add(job_description)
             db.commit()
             db.refresh(job_description)
             
-            return job_description
+            return job_description, True
             
+        except IntegrityError as e:
+            db.rollback()
+            existing = db.query(JobDescription).filter(JobDescription.content_hash == content_hash).first()
+            if existing is None:
+                raise ValueError(f"Error saving job description: {str(e)}")
+            return existing, False
         except Exception as e:
             db.rollback()
             raise ValueError(f"Error saving job description: {str(e)}")
     
+    def _resume_data(self, resume: Resume) -> Dict[str, Any]:
+        """Decode a stored resume into the dict the evaluator expects."""
+        return {
+            'content': resume.content,
+            'skills': json.loads(resume.skills or '[]'),
+            'education': json.loads(resume.education or '[]'),
+            'experience': json.loads(resume.experience or '[]'),
+            'projects': json.loads(resume.projects or '[]'),
+            'certifications': json.loads(resume.certifications or '[]'),
+            'sections': json.loads(resume.sections or '{}')
+        }
+    
+    def _semantic_resume_data(self, resume: Resume) -> Dict[str, Any]:
+        """The parts of a stored resume that semantic matching reads."""
+        return {
+            'content': resume.content,
+            'sections': json.loads(resume.sections or '{}')
+        }
+    
+    def _job_data(self, job_description: JobDescription) -> Dict[str, Any]:
+        """Decode a stored job description into the dict the evaluator expects."""
+        return {
+            'content': job_description.content,
+            'must_have_skills': json.loads(job_description.must_have_skills or '[]'),
+            'good_to_have_skills': json.loads(job_description.good_to_have_skills or '[]'),
+            'qualifications': json.loads(job_description.qualifications or '[]'),
+            'experience_required': job_description.experience_required,
+            'responsibilities': json.loads(job_description.responsibilities or '[]')
+        }
+    
+    def _semantic_job_data(self, job_description: JobDescription) -> Dict[str, Any]:
+        """The parts of a stored job description that semantic matching reads."""
+        return {
+            'content': job_description.content,
+            'responsibilities': json.loads(job_description.responsibilities or '[]')
+        }
+    
+    def _resume_features(self, resume: Resume) -> Dict[str, Any]:
+        """Feature record of ``resume``, rebuilt from its parsed columns if missing or stale.
+        
+        A rebuilt record is assigned to the row and saved with the next commit.
+        """
+        if resume.features and resume.features_version == FEATURE_VERSION:
+            return json.loads(resume.features)
+        features = resume_features(self._resume_data(resume))
+        resume.features = json.dumps(features)
+        resume.features_version = FEATURE_VERSION
+        return features
+    
+    def _job_features(self, job_description: JobDescription) -> Dict[str, Any]:
+        """Feature record of ``job_description``, rebuilt if missing or stale."""
+        if job_description.features and job_description.features_version == FEATURE_VERSION:
+            return json.loads(job_description.features)
+        features = job_features(self._job_data(job_description))
+        job_description.features = json.dumps(features)
+        job_description.features_version = FEATURE_VERSION
+        return features
+    
+    def _build_evaluation(self, resume_id: int, job_description_id: int, evaluation_results: Dict[str, Any]) -> ResumeEvaluation:
+        """Create (but do not add) the evaluation row and its missing-skill rows."""
+        evaluation = ResumeEvaluation(
+            resume_id=resume_id,
+            job_description_id=job_description_id,
+            relevance_score=evaluation_results.get('relevance_score', 0),
+            hard_match_score=evaluation_results.get('hard_match_score', 0),
+            semantic_match_score=evaluation_results.get('semantic_match_score', 0),
+            verdict=evaluation_results.get('verdict', ''),
+            matched_skills=json.dumps(evaluation_results.get('matched_skills', [])), 
+            missing_skills=json.dumps(evaluation_results.get('missing_skills', [])),
+            missing_certifications=json.dumps(evaluation_results.get('missing_certifications', [])),
+            missing_projects=json.dumps(evaluation_results.get('missing_projects', [])),
+            strengths=json.dumps(evaluation_results.get('strengths', [])),
+            weaknesses=json.dumps(evaluation_results.get('weaknesses', [])),
+            improvement_suggestions=json.dumps(evaluation_results.get('improvement_suggestions', [])),
+            missing_qualifications=json.dumps(evaluation_results.get('missing_qualifications', [])),
+            overall_feedback=evaluation_results.get('overall_feedback', ''),
+            evaluation_time=evaluation_results.get('evaluation_time', 0)
+        )
+        evaluation.missing_skill_rows = [
+            EvaluationMissingSkill(job_description_id=job_description_id, resume_id=resume_id, skill=skill)
+            for skill in normalized_skills(evaluation_results.get('missing_skills', []))
+        ]
+        return evaluation
+    
     def evaluate_resume_against_job(self, db: Session, resume_id: int, job_description_id: int) -> ResumeEvaluation:
         """Evaluate a resume against a job description."""
         try:
@@ -92,47 +288,16 @@ class ResumeService:
             if not resume or not job_description:
                 raise ValueError("Resume or job description not found")
 
-            # Prepare data for evaluation
-            resume_data = {
-                'content': resume.content,
-                'skills': json.loads(resume.skills or '[]'),
-                'education': json.loads(resume.education or '[]'),
-                'experience': json.loads(resume.experience or '[]'),
-                'projects': json.loads(resume.projects or '[]'),
-                'certifications': json.loads(resume.certifications or '[]')
-            }
-
-            job_data = {
-                'content': job_description.content,
-                'must_have_skills': json.loads(job_description.must_have_skills or '[]'),
-                'good_to_have_skills': json.loads(job_description.good_to_have_skills or '[]'),
-                'qualifications': json.loads(job_description.qualifications or '[]'),
-                'experience_required': job_description.experience_required,
-                'responsibilities': []
-            }
-
-            # Evaluate resume
-            evaluation_results = self.evaluator.evaluate_resume(resume_data, job_data)
+            # Evaluate resume from the precomputed feature records
+            evaluation_results = self.evaluator.evaluate_resume(
+                self._semantic_resume_data(resume),
+                self._semantic_job_data(job_description),
+                resume_features=self._resume_features(resume),
+                job_features=self._job_features(job_description)
+            )
 
             # Save evaluation to DB
-            evaluation = ResumeEvaluation(
-                resume_id=resume_id,
-                job_description_id=job_description_id,
-                relevance_score=evaluation_results.get('relevance_score', 0),
-                hard_match_score=evaluation_results.get('hard_match_score', 0),
-                semantic_match_score=evaluation_results.get('semantic_match_score', 0),
-                verdict=evaluation_results.get('verdict', ''),
-                matched_skills=json.dumps(evaluation_results.get('matched_skills', [])), 
-                missing_skills=json.dumps(evaluation_results.get('missing_skills', [])),
-                missing_certifications=json.dumps(evaluation_results.get('missing_certifications', [])),
-                missing_projects=json.dumps(evaluation_results.get('missing_projects', [])),
-                strengths=json.dumps(evaluation_results.get('strengths', [])),
-                weaknesses=json.dumps(evaluation_results.get('weaknesses', [])),
-                improvement_suggestions=json.dumps(evaluation_results.get('improvement_suggestions', [])),
-                missing_qualifications=json.dumps(evaluation_results.get('missing_qualifications', [])),
-                overall_feedback=evaluation_results.get('overall_feedback', ''),
-                evaluation_time=evaluation_results.get('evaluation_time', 0)
-            )
+            evaluation = self._build_evaluation(resume_id, job_description_id, evaluation_results)
 
             db.add(evaluation)
             db.commit()
@@ -143,16 +308,386 @@ class ResumeService:
         except Exception as e:
             db.rollback()
             raise ValueError(f"Error evaluating resume: {str(e)}")
+    
+    def evaluate_many(self, db: Session, resume_ids: List[int], job_description_id: int,
+                      batch_size: int = 64, chunk_size: int = 500) -> List[ResumeEvaluation]:
+        """Evaluate many stored resumes against one job description.
+        
+        Resumes are loaded with ``IN`` queries of ``chunk_size`` ids (keeping
+        under SQLite's bound-parameter limit), scored together by the batched
+        evaluator from their feature records, and all evaluations plus their
+        missing-skill rows are inserted in a single transaction. Ids that do
+        not exist are skipped; results come back in the order of ``resume_ids``.
+        """
+        try:
+            job_description = db.query(JobDescription).filter(JobDescription.id == job_description_id).first()
+            if not job_description:
+                raise ValueError("Job description not found")
+            
+            resume_ids = list(dict.fromkeys(resume_ids))
+            resumes_by_id = {}
+            for start in range(0, len(resume_ids), chunk_size):
+                chunk = resume_ids[start:start + chunk_size]
+                # The parsed JSON columns are only loaded if a feature record needs rebuilding
+                query = db.query(Resume).options(
+                    load_only(Resume.id, Resume.content, Resume.sections, Resume.features, Resume.features_version)
+                )
+                for resume in query.filter(Resume.id.in_(chunk)):
+                    resumes_by_id[resume.id] = resume
+            found_ids = [resume_id for resume_id in resume_ids if resume_id in resumes_by_id]
+            if not found_ids:
+                return []
+            
+            found = [resumes_by_id[resume_id] for resume_id in found_ids]
+            results = self.evaluator.batch_evaluate(
+                [self._semantic_resume_data(resume) for resume in found],
+                self._semantic_job_data(job_description),
+                batch_size=batch_size,
+                resume_features=[self._resume_features(resume) for resume in found],
+                job_features=self._job_features(job_description)
+            )
+            
+            evaluations = [
+                self._build_evaluation(resume_id, job_description_id, evaluation_results)
+                for resume_id, evaluation_results in zip(found_ids, results)
+            ]
+            # One flush issues batched INSERTs for all evaluations, then their skill rows
+            db.add_all(evaluations)
+            db.commit()
+            
+            return evaluations
+        
+        except Exception as e:
+            db.rollback()
+            raise ValueError(f"Error evaluating resumes: {str(e)}")
 
     
-    def get_resume_evaluations(self, db: Session, job_description_id: Optional[int] = None) -> List[ResumeEvaluation]:
-        """Get resume evaluations, optionally filtered by job description."""
+    def index_resumes(self, resume_ids: List[int], contents: List[str], embedding_ids: Optional[List[str]] = None,
+                      batch_size: int = 64):
+        """Embed resumes (reusing cached vectors) and add them to the candidate index."""
+        embeddings = self.evaluator.semantic_matcher.embed_texts(contents, batch_size=batch_size, embedding_ids=embedding_ids)
+        self.candidate_index.add(list(resume_ids), embeddings)
+    
+    def sync_candidate_index(self, db: Session, batch_size: int = 256) -> Dict[str, int]:
+        """Add stored resumes missing from the candidate index and drop deleted ones."""
+        indexed = self.candidate_index.ids()
+        stored = set()
+        added = 0
+        batch_ids, batch_contents = [], []
+        
+        for resume_id, content in db.query(Resume.id, Resume.content).order_by(Resume.id).yield_per(batch_size):
+            stored.add(resume_id)
+            if resume_id in indexed:
+                continue
+            batch_ids.append(resume_id)
+            batch_contents.append(content)
+            if len(batch_ids) >= batch_size:
+                self.index_resumes(batch_ids, batch_contents, batch_size=batch_size)
+                added += len(batch_ids)
+                batch_ids, batch_contents = [], []
+        if batch_ids:
+            self.index_resumes(batch_ids, batch_contents, batch_size=batch_size)
+            added += len(batch_ids)
+        
+        removed = indexed - stored
+        self.candidate_index.remove(removed)
+        return {'added': added, 'removed': len(removed), 'indexed': len(self.candidate_index)}
+    
+    def top_candidates(self, db: Session, job_description_id: int, k: int = 50,
+                       shortlist_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Best ``k`` resumes for a job description, without scoring the whole pool.
+        
+        The candidate index first retrieves the ``shortlist_size`` resumes
+        (default ``k * CANDIDATE_SHORTLIST_FACTOR``) nearest to the job
+        description's embedding; only those get the full hard + semantic
+        evaluation, and the top ``k`` by relevance score are returned. Nothing
+        is persisted.
+        """
+        job_description = db.query(JobDescription).filter(JobDescription.id == job_description_id).first()
+        if not job_description:
+            raise ValueError("Job description not found")
+        
+        if shortlist_size is None:
+            from app.config import CANDIDATE_SHORTLIST_FACTOR
+            shortlist_size = k * CANDIDATE_SHORTLIST_FACTOR
+        shortlist_size = max(shortlist_size, k)
+        
+        job_embedding = self.evaluator.semantic_matcher.embed_text(job_description.content)
+        shortlist = self.candidate_index.query(job_embedding, shortlist_size)
+        if not shortlist:
+            return []
+        
+        resumes = db.query(Resume).options(
+            load_only(Resume.id, Resume.filename, Resume.student_name, Resume.student_email,
+                      Resume.content, Resume.sections, Resume.features, Resume.features_version)
+        ).filter(Resume.id.in_([resume_id for resume_id, _ in shortlist])).all()
+        if not resumes:
+            return []
+        
+        results = self.evaluator.batch_evaluate(
+            [self._semantic_resume_data(resume) for resume in resumes],
+            self._semantic_job_data(job_description),
+            resume_features=[self._resume_features(resume) for resume in resumes],
+            job_features=self._job_features(job_description)
+        )
+        # Persist any feature records that had to be rebuilt
+        db.commit()
+        
+        ranked = sorted(zip(resumes, results), key=lambda pair: pair[1].get('relevance_score', 0), reverse=True)
+        return [
+            {
+                'resume_id': resume.id,
+                'filename': resume.filename,
+                'student_name': resume.student_name,
+                'student_email': resume.student_email,
+                'relevance_score': result.get('relevance_score', 0),
+                'hard_match_score': result.get('hard_match_score', 0),
+                'semantic_match_score': result.get('semantic_match_score', 0),
+                'verdict': result.get('verdict', ''),
+                'missing_skills': result.get('missing_skills', [])
+            }
+            for resume, result in ranked[:k]
+        ]
+    
+    def sync_job_index(self, db: Session, chunk_size: int = 500) -> JobIndex:
+        """Bring the in-memory job index up to date with the stored job descriptions.
+        
+        Only the id column is read when nothing changed; new job descriptions
+        are embedded in one batch (cached vectors are reused).
+        """
+        stored = {job_id for job_id, in db.query(JobDescription.id)}
+        indexed = self.job_index.ids()
+        self.job_index.remove(indexed - stored)
+        
+        missing = sorted(stored - indexed)
+        for start in range(0, len(missing), chunk_size):
+            job_descriptions = db.query(JobDescription).options(
+                load_only(JobDescription.id, JobDescription.content, JobDescription.features, JobDescription.features_version)
+            ).filter(JobDescription.id.in_(missing[start:start + chunk_size])).all()
+            features = [self._job_features(job_description) for job_description in job_descriptions]
+            embeddings = self.evaluator.semantic_matcher.embed_texts(
+                [job_description.content for job_description in job_descriptions],
+                embedding_ids=[record['embedding_id'] for record in features]
+            )
+            self.job_index.add([job_description.id for job_description in job_descriptions], embeddings, features)
+        if missing:
+            # Persist any feature records that had to be rebuilt
+            db.commit()
+        
+        return self.job_index
+    
+    def top_job_descriptions(self, db: Session, resume_id: int, k: int = 20,
+                             shortlist_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Best ``k`` job descriptions for a resume.
+        
+        Every job description is scored at once by ``JobIndex.rank`` from
+        whole-document embeddings; the ``shortlist_size`` best (default
+        ``k * CANDIDATE_SHORTLIST_FACTOR``) are then re-scored exactly with
+        ``HardMatcher.score_features`` and chunk-level semantic similarity.
+        Nothing is persisted.
+        """
+        resume = db.query(Resume).filter(Resume.id == resume_id).first()
+        if not resume:
+            raise ValueError("Resume not found")
+        
+        if shortlist_size is None:
+            from app.config import CANDIDATE_SHORTLIST_FACTOR
+            shortlist_size = k * CANDIDATE_SHORTLIST_FACTOR
+        shortlist_size = max(shortlist_size, k)
+        
+        features = self._resume_features(resume)
+        embedding = self.evaluator.semantic_matcher.embed_texts([resume.content], embedding_ids=[features['embedding_id']])[0]
+        from app.config import settings
+        shortlist = self.sync_job_index(db).rank(
+            embedding, features, shortlist_size, settings.hard_match_weight, settings.semantic_match_weight
+        )
+        if not shortlist:
+            return []
+        
+        job_descriptions = db.query(JobDescription).options(
+            load_only(JobDescription.id, JobDescription.title, JobDescription.company, JobDescription.location,
+                      JobDescription.content, JobDescription.responsibilities)
+        ).filter(JobDescription.id.in_([job_id for job_id, _, _ in shortlist])).all()
+        
+        # Exact semantic scores use the same chunk max-sim as evaluations
+        similarities = self.evaluator.semantic_matcher.job_similarities(
+            self._semantic_resume_data(resume),
+            [self._semantic_job_data(job_description) for job_description in job_descriptions]
+        )
+        
+        ranked = []
+        for job_description, similarity in zip(job_descriptions, similarities):
+            job_id = job_description.id
+            hard_match_results = self.evaluator.hard_matcher.score_features(features, self.job_index.features(job_id))
+            semantic_score = round(float(similarity) * 100, 2)
+            relevance_score = self.evaluator.calculate_final_score(hard_match_results['hard_match_score'], semantic_score)
+            ranked.append({
+                'job_description_id': job_id,
+                'title': job_description.title,
+                'company': job_description.company,
+                'location': job_description.location,
+                'relevance_score': round(relevance_score, 2),
+                'hard_match_score': round(hard_match_results['hard_match_score'], 2),
+                'semantic_match_score': semantic_score,
+                'verdict': self.evaluator.determine_verdict(relevance_score),
+                'matched_skills': hard_match_results['must_have_skills']['matched_skills'],
+                'missing_skills': hard_match_results['missing_skills']
+            })
+        
+        ranked.sort(key=lambda result: result['relevance_score'], reverse=True)
+        return ranked[:k]
+    
+    def refit_keyword_model(self, db: Session, path: Optional[str] = None) -> KeywordModel:
+        """Fit the TF-IDF keyword model over all stored resumes and job descriptions and persist it."""
+        if path is None:
+            from app.config import KEYWORD_MODEL_PATH
+            path = KEYWORD_MODEL_PATH
+        
+        corpus = [row.content for row in db.query(Resume.content)]
+        corpus.extend(row.content for row in db.query(JobDescription.content))
+        
+        model = KeywordModel().fit(corpus)
+        model.save(path)
+        
+        # Score new evaluations with the refreshed vocabulary; other processes
+        # pick the saved file up on their next evaluation
+        self.evaluator.hard_matcher.use_keyword_model(model)
+        return model
+    
+    def ensure_keyword_model(self, db: Session) -> Optional[KeywordModel]:
+        """Fit the keyword model if none is fitted yet and the corpus is not empty."""
+        model = self.evaluator.hard_matcher.current_keyword_model()
+        if model is not None:
+            return model
+        if db.query(Resume.id).first() is None and db.query(JobDescription.id).first() is None:
+            return None
+        return self.refit_keyword_model(db)
+    
+    @staticmethod
+    def keyset(db: Session, query, model, sort: str = "id", after_id: Optional[int] = None):
+        """Order ``query`` by ``sort`` and start it right after the row ``after_id``.
+        
+        ``sort`` is a column name, prefixed with ``-`` for descending order;
+        ties are broken by id. Rows whose sort value is NULL come last in
+        either direction, so the position of every row is well defined and
+        no row is skipped between pages. No OFFSET scan is needed.
+        """
+        descending = sort.startswith('-')
+        sort_name = sort.lstrip('-')
+        if sort_name not in model.__table__.columns:
+            raise ValueError(f"Unknown sort field for {model.__tablename__}: {sort_name}")
+        sort_column = getattr(model, sort_name)
+        
+        if after_id is not None:
+            after_row = model.id < after_id if descending else model.id > after_id
+            if sort_name == 'id':
+                query = query.filter(after_row)
+            else:
+                anchor = db.query(sort_column).filter(model.id == after_id).first()
+                if anchor is None:
+                    raise ValueError(f"after_id {after_id} does not match a row")
+                anchor = anchor[0]
+                if anchor is None:
+                    query = query.filter(sort_column.is_(None), after_row)
+                else:
+                    beyond = sort_column < anchor if descending else sort_column > anchor
+                    query = query.filter(or_(
+                        beyond, and_(sort_column == anchor, after_row), sort_column.is_(None)
+                    ))
+        
+        if descending:
+            return query.order_by(sort_column.is_(None), sort_column.desc(), model.id.desc())
+        return query.order_by(sort_column.is_(None), sort_column.asc(), model.id.asc())
+    
+    def paginate(self, db: Session, model, fields: List[str], filters: Optional[List[Any]] = None,
+                 sort: str = "id", after_id: Optional[int] = None, limit: Optional[int] = 50,
+                 count: bool = False) -> Tuple[List[Dict[str, Any]], Optional[int], Optional[int]]:
+        """Keyset-paginated, column-projected listing of ``model``.
+        
+        Rows are ordered as described in ``keyset``; ``after_id`` is the id
+        of the last row of the previous page. ``limit=None`` returns every
+        remaining row. Returns the rows as dicts (only ``fields``, plus
+        ``id``), the ``after_id`` for the next page (``None`` on the last
+        page) and, with ``count``, the total number of rows matching
+        ``filters`` (else ``None``, saving a full count per page).
+        """
+        unknown = [name for name in fields if name not in model.__table__.columns]
+        if unknown:
+            raise ValueError(f"Unknown field(s) for {model.__tablename__}: {', '.join(unknown)}")
+        
+        fields = ['id'] + [field for field in dict.fromkeys(fields) if field != 'id']
+        filtered = db.query(*[getattr(model, field) for field in fields]).filter(*(filters or []))
+        query = self.keyset(db, filtered, model, sort, after_id)
+        if limit is not None:
+            query = query.limit(limit)
+        
+        rows = [project_row(model, fields, row) for row in query]
+        next_after_id = rows[-1]['id'] if limit is not None and len(rows) == limit else None
+        total = filtered.order_by(None).count() if count else None
+        return rows, next_after_id, total
+    
+    def get_candidates_missing_skill(self, db: Session, job_description_id: int, skill: str,
+                                     limit: int = 100) -> List[ResumeEvaluation]:
+        """Evaluations for a job description whose resume lacks ``skill``, best score first."""
+        missing = db.query(EvaluationMissingSkill.evaluation_id).filter(
+            EvaluationMissingSkill.job_description_id == job_description_id,
+            EvaluationMissingSkill.skill == normalize_skill(skill)
+        )
+        return (
+            db.query(ResumeEvaluation)
+            .filter(ResumeEvaluation.job_description_id == job_description_id, ResumeEvaluation.id.in_(missing))
+            .order_by(ResumeEvaluation.relevance_score.desc())
+            .limit(limit)
+            .all()
+        )
+    
+    def get_skill_gaps(self, db: Session, job_description_id: int, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most frequently missing skills among a job description's evaluated candidates."""
+        count = func.count(EvaluationMissingSkill.id)
+        rows = (
+            db.query(EvaluationMissingSkill.skill, count)
+            .filter(EvaluationMissingSkill.job_description_id == job_description_id)
+            .group_by(EvaluationMissingSkill.skill)
+            .order_by(count.desc())
+            .limit(limit)
+        )
+        return [{'skill': skill, 'missing_count': missing_count} for skill, missing_count in rows]
+    
+    def get_resume_evaluations(self, db: Session, job_description_id: Optional[int] = None,
+                               limit: Optional[int] = None, after_id: Optional[int] = None) -> List[ResumeEvaluation]:
+        """Get resume evaluations, best score first, optionally filtered by job description.
+        
+        ``limit``/``after_id`` page through them as in ``keyset``.
+        """
         query = db.query(ResumeEvaluation)
         
         if job_description_id:
             query = query.filter(ResumeEvaluation.job_description_id == job_description_id)
         
-        return query.order_by(ResumeEvaluation.relevance_score.desc()).all()
+        query = self.keyset(db, query, ResumeEvaluation, "-relevance_score", after_id)
+        return query.limit(limit).all() if limit is not None else query.all()
+    
+    def get_evaluation_summary(self, db: Session, job_description_id: Optional[int] = None) -> Dict[str, Any]:
+        """Number of evaluations, their average relevance score and the count per verdict.
+        
+        Aggregated in one grouped query, optionally for a single job description.
+        """
+        query = db.query(
+            ResumeEvaluation.verdict,
+            func.count(ResumeEvaluation.id),
+            func.sum(ResumeEvaluation.relevance_score)
+        )
+        if job_description_id is not None:
+            query = query.filter(ResumeEvaluation.job_description_id == job_description_id)
+        rows = query.group_by(ResumeEvaluation.verdict).all()
+        
+        count = sum(verdict_count for _, verdict_count, _ in rows)
+        score_sum = sum(verdict_sum or 0.0 for _, _, verdict_sum in rows)
+        return {
+            'count': count,
+            'average_score': round(score_sum / count, 2) if count else None,
+            'verdicts': {verdict: verdict_count for verdict, verdict_count, _ in rows}
+        }
     
     def get_resume_by_id(self, db: Session, resume_id: int) -> Optional[Resume]:
         """Get resume by ID."""
@@ -162,13 +697,16 @@ class ResumeService:
         """Get job description by ID."""
         return db.query(JobDescription).filter(JobDescription.id == job_description_id).first()
     
-    def get_all_resumes(self, db: Session) -> List[Resume]:
-        """Get all resumes."""
-        return db.query(Resume).all()
+    def get_all_resumes(self, db: Session, limit: Optional[int] = None, after_id: Optional[int] = None) -> List[Resume]:
+        """Get resumes in id order, all of them or one keyset page."""
+        query = self.keyset(db, db.query(Resume), Resume, "id", after_id)
+        return query.limit(limit).all() if limit is not None else query.all()
     
-    def get_all_job_descriptions(self, db: Session) -> List[JobDescription]:
-        """Get all job descriptions."""
-        return db.query(JobDescription).all()
+    def get_all_job_descriptions(self, db: Session, limit: Optional[int] = None,
+                                 after_id: Optional[int] = None) -> List[JobDescription]:
+        """Get job descriptions in id order, all of them or one keyset page."""
+        query = self.keyset(db, db.query(JobDescription), JobDescription, "id", after_id)
+        return query.limit(limit).all() if limit is not None else query.all()
     
     def delete_resume(self, db: Session, resume_id: int) -> bool:
         """Delete a resume and its evaluations."""
@@ -183,6 +721,7 @@ class ResumeService:
             # Delete resume
             db.delete(resume)
             db.commit()
+            self.candidate_index.remove([resume_id])
             
             return True
             
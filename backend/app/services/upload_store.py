@@ -0,0 +1,74 @@
+"""Streaming, content-addressed storage for uploaded files."""
+
+import hashlib
+import os
+import tempfile
+from typing import Any, BinaryIO, Dict
+
+from starlette.concurrency import run_in_threadpool
+
+from app.hashing import CHUNK_SIZE
+
+
+def _copy_and_hash(source: BinaryIO, upload_dir: str, filename: str) -> Dict[str, Any]:
+    """Copy ``source`` into a temporary file in ``upload_dir`` chunk by chunk while hashing it.
+
+    The temporary file keeps the upload's extension so it can be parsed
+    before it is stored; ``keep_upload`` later moves it to ``file_path``.
+    """
+    os.makedirs(upload_dir, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+
+    filename = os.path.basename(filename)
+    fd, temp_path = tempfile.mkstemp(dir=upload_dir, prefix=".upload-", suffix=os.path.splitext(filename)[1])
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+    except Exception:
+        discard_upload({'temp_path': temp_path})
+        raise
+
+    sha256 = digest.hexdigest()
+    return {
+        'temp_path': temp_path,
+        'file_path': os.path.join(upload_dir, f"{sha256[:16]}_{filename}"),
+        'sha256': sha256,
+        'size': size
+    }
+
+
+async def save_upload(upload, upload_dir: str) -> Dict[str, Any]:
+    """Stream a FastAPI ``UploadFile`` to a temporary file off the event loop and hash it.
+
+    Returns ``temp_path``, ``file_path`` (the name the file is stored under
+    by ``keep_upload``), ``sha256`` and ``size``. Callers check the hash for
+    duplicates first and then either keep or discard the upload, so a
+    duplicate never leaves a file behind.
+    """
+    await upload.seek(0)
+    return await run_in_threadpool(_copy_and_hash, upload.file, upload_dir, upload.filename or "upload")
+
+
+def keep_upload(stored: Dict[str, Any]) -> str:
+    """Move a saved upload to its content-addressed ``file_path`` and return that path.
+
+    Identical uploads share a path and same-named uploads with different
+    content never overwrite each other.
+    """
+    if os.path.exists(stored['file_path']):
+        discard_upload(stored)
+    else:
+        os.replace(stored['temp_path'], stored['file_path'])
+    return stored['file_path']
+
+
+def discard_upload(stored: Dict[str, Any]):
+    """Delete the temporary file of a saved upload (no-op once kept or discarded)."""
+    try:
+        os.remove(stored['temp_path'])
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,138 @@
+"""Benchmark the embedding backends for accuracy against PyTorch and CPU latency.
+
+Every resume in the uploads directory is scored against a job description
+with the same chunked max-sim used by ``SemanticMatcher``, once per backend.
+The PyTorch scores are the reference: for the other backends the script
+reports how far their scores (and candidate ranking) drift from it next to
+how long encoding took, so the backend can be picked per deployment via
+``EMBEDDING_BACKEND``.
+
+Usage (from the backend directory):
+    python benchmark_embeddings.py --backends torch onnx int8 --repeat 3
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from app.evaluators.semantic_matcher import SemanticMatcher, job_chunks, resume_chunks
+from app.model_registry import DEFAULT_EMBEDDING_MODEL, EMBEDDING_BACKENDS, get_sentence_transformer
+from app.parsers.resume_parser import ResumeParser
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_documents(uploads_dir: str, job_path: str):
+    """Cleaned resume texts from ``uploads_dir`` and the job description text."""
+    resumes = []
+    for filename in sorted(os.listdir(uploads_dir)):
+        if not filename.lower().endswith(('.pdf', '.docx')):
+            continue
+        try:
+            text = ResumeParser.clean_text(ResumeParser.extract_text(os.path.join(uploads_dir, filename)))
+        except Exception as e:
+            print(f"Skipping {filename}: {e}")
+            continue
+        resumes.append((filename, text))
+
+    with open(job_path, "r", encoding="utf-8") as f:
+        job_text = ResumeParser.clean_text(f.read())
+    return resumes, job_text
+
+
+def rank_correlation(a: np.ndarray, b: np.ndarray) -> float:
+    """Spearman rank correlation (no tie correction)."""
+    if len(a) < 2:
+        return 1.0
+    rank_a = np.argsort(np.argsort(a))
+    rank_b = np.argsort(np.argsort(b))
+    return float(np.corrcoef(rank_a, rank_b)[0, 1])
+
+
+def benchmark_backend(backend: str, resume_texts, job_text: str, repeat: int, batch_size: int):
+    """Load one backend, encode all chunks ``repeat`` times and score the resumes."""
+    start = time.perf_counter()
+    model = get_sentence_transformer(DEFAULT_EMBEDDING_MODEL, backend)
+    load_time = time.perf_counter() - start
+
+    chunks_per_resume = [resume_chunks({'content': text}) for text in resume_texts]
+    job_chunk_texts = job_chunks({'content': job_text})
+    texts = job_chunk_texts + [chunk for chunks in chunks_per_resume for chunk in chunks]
+
+    # One untimed pass so lazy initialisation does not count
+    model.encode(texts[:batch_size], batch_size=batch_size)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        embeddings = np.asarray(model.encode(texts, batch_size=batch_size), dtype=np.float32)
+        timings.append(time.perf_counter() - start)
+
+    embeddings = SemanticMatcher.normalize_rows(embeddings)
+    scores = SemanticMatcher.max_sim(
+        embeddings[:len(job_chunk_texts)],
+        embeddings[len(job_chunk_texts):],
+        [len(chunks) for chunks in chunks_per_resume]
+    ) * 100
+
+    return {
+        'backend': backend,
+        'load_time': load_time,
+        'encode_time': min(timings),
+        'chunks': len(texts),
+        'embeddings': embeddings,
+        'scores': scores
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--backends", nargs="+", default=list(EMBEDDING_BACKENDS), choices=EMBEDDING_BACKENDS)
+    parser.add_argument("--uploads", default=os.path.join(ROOT_DIR, "data", "uploads"))
+    parser.add_argument("--job", default=os.path.join(ROOT_DIR, "data", "sample_job_description.txt"))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    resumes, job_text = load_documents(args.uploads, args.job)
+    if not resumes:
+        print(f"No resumes found in {args.uploads}")
+        return
+    print(f"Scoring {len(resumes)} resumes against {os.path.basename(args.job)}")
+
+    backends = ["torch"] + [backend for backend in args.backends if backend != "torch"]
+    results = []
+    for backend in backends:
+        try:
+            results.append(benchmark_backend(backend, [text for _, text in resumes], job_text, args.repeat, args.batch_size))
+        except Exception as e:
+            print(f"{backend}: could not run ({e})")
+    if not results or results[0]['backend'] != "torch":
+        print("The PyTorch reference backend is required for the comparison")
+        return
+    reference = results[0]
+
+    print()
+    print(f"{'backend':<8} {'load s':>8} {'encode s':>9} {'ms/chunk':>9} {'speedup':>8} "
+          f"{'mean |d|':>9} {'max |d|':>8} {'rank rho':>9} {'cos':>7}")
+    for result in results:
+        diff = np.abs(result['scores'] - reference['scores'])
+        cosine = float(np.mean(np.sum(result['embeddings'] * reference['embeddings'], axis=1)))
+        print(
+            f"{result['backend']:<8} {result['load_time']:>8.2f} {result['encode_time']:>9.3f} "
+            f"{result['encode_time'] / result['chunks'] * 1000:>9.2f} "
+            f"{reference['encode_time'] / result['encode_time']:>7.2f}x "
+            f"{diff.mean():>9.3f} {diff.max():>8.3f} "
+            f"{rank_correlation(result['scores'], reference['scores']):>9.4f} {cosine:>7.4f}"
+        )
+
+    print("\nScores per resume (semantic match, 0-100):")
+    print(f"{'resume':<24}" + "".join(f"{result['backend']:>10}" for result in results))
+    for i, (filename, _) in enumerate(resumes):
+        print(f"{filename[:24]:<24}" + "".join(f"{result['scores'][i]:>10.2f}" for result in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Microbenchmark the precompiled regex bank against per-pattern ``re.search`` loops.
+
+For every job description field the script times three ways of extracting
+it from the same layout text:
+
+- loop: how the parsers used to do it, with one ``re.search``/``re.findall``
+  call (``re.IGNORECASE``) per pattern, in priority order.
+- one-regex: all patterns combined into a single named-group alternation.
+- bank: ``app.parsers.patterns``, precompiled and matched on case-folded text.
+
+It also checks that the bank returns exactly what the loop did. One-regex
+is shown for reference only: CPython's ``re`` gives up its literal-prefix
+scan for alternations, so a single combined pass ends up slower than
+separate prefix-anchored searches.
+
+Usage (from the backend directory):
+    python benchmark_parsers.py --number 2000
+"""
+
+import argparse
+import os
+import re
+import timeit
+
+from app.parsers import layout, patterns
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def one_regex(bank: patterns.PatternBank) -> re.Pattern:
+    """All alternatives of ``bank`` as one named-group alternation."""
+    return re.compile("|".join(f"(?P<a{i}>{regex})" for i, (_, regex) in enumerate(bank.alternatives)), re.IGNORECASE)
+
+
+def loop_first(bank: patterns.PatternBank, text: str):
+    """Per-pattern loop: first alternative (in priority order) that matches."""
+    for name, regex in bank.alternatives:
+        match = re.search(regex, text, re.IGNORECASE)
+        if match:
+            return name, match.group(1) if match.groups() else match.group()
+    return None
+
+
+def loop_first_each(bank: patterns.PatternBank, text: str):
+    """Per-pattern loop: leftmost match of every alternative."""
+    found = []
+    for name, regex in bank.alternatives:
+        match = re.search(regex, text, re.IGNORECASE)
+        if match:
+            found.append((name, match.group(1) if match.groups() else match.group()))
+    return found
+
+
+def loop_findall(bank: patterns.PatternBank, text: str):
+    """Per-pattern loop: all matches of every alternative."""
+    found = []
+    for _, regex in bank.alternatives:
+        found.extend(re.findall(regex, text, re.IGNORECASE))
+    return found
+
+
+FIELDS = [
+    ('job_title', patterns.JOB_TITLE, 'first'),
+    ('company', patterns.COMPANY, 'first'),
+    ('location', patterns.LOCATION, 'first'),
+    ('city', patterns.CITY, 'first'),
+    ('skill_sections', patterns.SKILL_SECTIONS, 'first_each'),
+    ('qualifications', patterns.QUALIFICATION, 'findall'),
+    ('experience_required', patterns.EXPERIENCE_REQUIRED, 'first'),
+    ('responsibilities', patterns.RESPONSIBILITY_SECTIONS, 'first_each')
+]
+
+LOOPS = {
+    'first': loop_first,
+    'first_each': loop_first_each,
+    'findall': loop_findall
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--job", default=os.path.join(ROOT_DIR, "data", "sample_job_description.txt"))
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(args.job, "r", encoding="utf-8") as f:
+        text = layout.layout_text(f.read())
+    print(f"{os.path.basename(args.job)}: {len(text)} characters, {args.number} runs x best of {args.repeat}")
+    print()
+    print(f"{'field':<20} {'loop us':>9} {'one-regex us':>13} {'bank us':>9} {'speedup':>8}  same")
+
+    def best(function):
+        return min(timeit.repeat(function, number=args.number, repeat=args.repeat)) / args.number
+
+    totals = [0.0, 0.0, 0.0]
+    for name, bank, mode in FIELDS:
+        loop = LOOPS[mode]
+        method = getattr(bank, mode)
+        combined = one_regex(bank)
+        scan = combined.findall if mode == 'findall' else combined.search
+        times = [best(lambda: loop(bank, text)), best(lambda: scan(text)), best(lambda: method(text))]
+        totals = [total + time for total, time in zip(totals, times)]
+
+        same = "yes" if method(text) == loop(bank, text) else "no"
+        print(f"{name:<20} {times[0] * 1e6:>9.1f} {times[1] * 1e6:>13.1f} {times[2] * 1e6:>9.1f} "
+              f"{times[0] / times[2]:>7.2f}x  {same}")
+
+    print(f"{'total':<20} {totals[0] * 1e6:>9.1f} {totals[1] * 1e6:>13.1f} {totals[2] * 1e6:>9.1f} "
+          f"{totals[0] / totals[2]:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
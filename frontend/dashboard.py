@@ -7,7 +7,7 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import time
 import base64
 from io import BytesIO
@@ -28,6 +28,12 @@ st.set_page_config(
 # API Configuration
 API_BASE_URL = "https://resume-evalution-system-backend.onrender.com"
 
+# Rows requested per page when the dashboard walks a whole list endpoint
+LIST_PAGE_SIZE = 500
+
+# Evaluations shown per page of the evaluations view
+EVALUATIONS_PAGE_SIZE = 100
+
 # Custom CSS - Professional Design
 st.markdown("""
 <style>
@@ -624,6 +630,40 @@ def make_api_request(endpoint: str, method: str = "GET", data: Dict = None, file
         st.error(f"Connection Error: {str(e)}")
         return {}
 
+def get_total_count(endpoint: str) -> int:
+    """Number of rows a list endpoint holds, read from its ``X-Total-Count`` header."""
+    try:
+        response = requests.get(f"{API_BASE_URL}{endpoint}", params={"limit": 1, "fields": "id", "count": "true"},
+                                timeout=10)
+        if response.status_code == 200:
+            return int(response.headers.get("X-Total-Count", 0))
+    except Exception:
+        pass
+    return 0
+
+def get_page(endpoint: str, params: Dict = None) -> Tuple[List[Dict], Optional[int]]:
+    """One page of a list endpoint and the ``after_id`` of the next page (``None`` on the last one)."""
+    try:
+        response = requests.get(f"{API_BASE_URL}{endpoint}", params=params, timeout=10)
+        if response.status_code == 200:
+            next_after_id = response.headers.get("X-Next-After-Id")
+            return response.json(), int(next_after_id) if next_after_id else None
+        st.error(f"API Error: {response.status_code} - {response.text}")
+    except requests.exceptions.Timeout:
+        st.error("Request timed out. Please try again.")
+    except Exception as e:
+        st.error(f"Connection Error: {str(e)}")
+    return [], None
+
+def get_all_pages(endpoint: str, params: Dict = None) -> List[Dict]:
+    """Every row of a list endpoint, fetched page by page through its ``after_id`` cursor."""
+    params = dict(params or {}, limit=LIST_PAGE_SIZE)
+    rows, next_after_id = get_page(endpoint, params)
+    while next_after_id is not None:
+        page, next_after_id = get_page(endpoint, dict(params, after_id=next_after_id))
+        rows.extend(page)
+    return rows
+
 def show_loading_spinner(message: str = "Processing..."):
     """Show loading spinner with message."""
     with st.spinner(message):
@@ -817,9 +857,9 @@ def upload_resume():
         
         # Recent uploads
         st.markdown("### 📋 Recent Uploads")
-        resumes = make_api_request("/resumes/")
+        resumes = make_api_request("/resumes/?sort=-id&limit=3&fields=student_name,filename")
         if resumes:
-            for resume in resumes[-3:]:  # Show last 3
+            for resume in reversed(resumes):  # Show last 3
                 st.markdown(f"• **{resume['student_name']}** - {resume['filename']}")
         else:
             st.info("No resumes uploaded yet")
@@ -1040,9 +1080,9 @@ def upload_job_description():
         
         # Recent job descriptions
         st.markdown("### 📋 Recent Job Descriptions")
-        job_descriptions = make_api_request("/job-descriptions/")
+        job_descriptions = make_api_request("/job-descriptions/?sort=-id&limit=3&fields=title,company")
         if job_descriptions:
-            for jd in job_descriptions[-3:]:  # Show last 3
+            for jd in reversed(job_descriptions):  # Show last 3
                 st.markdown(f"• **{jd['title']}** at {jd['company']}")
         else:
             st.info("No job descriptions uploaded yet")
@@ -1052,8 +1092,8 @@ def evaluate_resume():
     st.markdown("### 🔍 Evaluate Resume")
     
     # Get resumes and job descriptions
-    resumes = make_api_request("/resumes/")
-    job_descriptions = make_api_request("/job-descriptions/")
+    resumes = get_all_pages("/resumes/", {"fields": "student_name,student_email,filename"})
+    job_descriptions = get_all_pages("/job-descriptions/")
     
     if not resumes or not job_descriptions:
         st.markdown("""
@@ -1225,9 +1265,9 @@ def evaluate_resume():
         
         # Recent evaluations
         st.markdown("#### 🔍 Recent Evaluations")
-        evaluations = make_api_request("/evaluations/")
+        evaluations = make_api_request("/evaluations/?sort=-id&limit=3&fields=verdict,relevance_score")
         if evaluations:
-            for eval in evaluations[-3:]:  # Show last 3
+            for eval in reversed(evaluations):  # Show last 3
                 verdict_icon = get_verdict_icon(eval['verdict'])
                 st.markdown(f"• {verdict_icon} **{eval['verdict']}** - Score: {eval['relevance_score']:.1f}")
         else:
@@ -1466,10 +1506,10 @@ def view_evaluations():
     """View all evaluations with enhanced UI."""
     st.markdown("### 📋 All Evaluations")
     
-    # Get evaluations
-    evaluations = make_api_request("/evaluations/")
+    # Totals come from the server-side aggregate; rows are fetched one page at a time
+    summary = make_api_request("/evaluations/summary")
     
-    if not evaluations:
+    if not summary or not summary.get('count'):
         st.markdown("""
         <div class="info-message">
             <h4>ℹ️ No Evaluations Found</h4>
@@ -1478,8 +1518,7 @@ def view_evaluations():
         """, unsafe_allow_html=True)
         return
     
-    # Create DataFrame
-    df = pd.DataFrame(evaluations)
+    verdicts = summary.get('verdicts', {})
     
     # Summary statistics with enhanced cards
     st.markdown("#### 📊 Summary Statistics")
@@ -1487,84 +1526,105 @@ def view_evaluations():
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        avg_score = df['relevance_score'].mean()
+        avg_score = summary['average_score']
         st.markdown(create_metric_card("Average Score", f"{avg_score:.1f}", "📊", "#1f77b4"), unsafe_allow_html=True)
     
     with col2:
-        high_count = len(df[df['verdict'] == 'High'])
+        high_count = verdicts.get('High', 0)
         st.markdown(create_metric_card("High Suitability", str(high_count), "🟢", "#28a745"), unsafe_allow_html=True)
     
     with col3:
-        medium_count = len(df[df['verdict'] == 'Medium'])
+        medium_count = verdicts.get('Medium', 0)
         st.markdown(create_metric_card("Medium Suitability", str(medium_count), "🟡", "#ffc107"), unsafe_allow_html=True)
     
     with col4:
-        total_count = len(df)
+        total_count = summary['count']
         st.markdown(create_metric_card("Total Evaluations", str(total_count), "📋", "#6c757d"), unsafe_allow_html=True)
     
+    # Filtering and search
+    st.markdown("#### 🔍 Filter & Search")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        verdict_filter = st.selectbox("Filter by Verdict", ["All", "High", "Medium", "Low"])
+    
+    with col2:
+        score_range = st.slider("Score Range", 0, 100, (0, 100))
+    
+    with col3:
+        search_term = st.text_input("Search", placeholder="Search by ID or other fields")
+    
+    # Verdict and score filters run on the server; the page cursors restart when they change
+    params = {"sort": "-id", "limit": EVALUATIONS_PAGE_SIZE, "min_score": score_range[0], "max_score": score_range[1]}
+    if verdict_filter != "All":
+        params["verdict"] = verdict_filter
+    filter_key = (verdict_filter, score_range)
+    if st.session_state.get('evaluation_filter') != filter_key:
+        st.session_state.evaluation_filter = filter_key
+        st.session_state.evaluation_cursors = [None]
+    cursors = st.session_state.evaluation_cursors
+    
+    if cursors[-1] is not None:
+        params["after_id"] = cursors[-1]
+    evaluations, next_after_id = get_page("/evaluations/", params)
+    
+    # Create DataFrame
+    df = pd.DataFrame(evaluations, columns=[
+        'id', 'resume_id', 'job_description_id', 'relevance_score', 'hard_match_score',
+        'semantic_match_score', 'verdict', 'created_at'
+    ])
+    
     # Charts section
     st.markdown("#### 📈 Analytics Dashboard")
     
     col1, col2 = st.columns(2)
     
     with col1:
-        # Verdict distribution
-        verdict_counts = df['verdict'].value_counts()
-        fig = px.pie(values=verdict_counts.values, names=verdict_counts.index, 
+        # Verdict distribution over every evaluation
+        fig = px.pie(values=list(verdicts.values()), names=list(verdicts.keys()), 
                      title="Verdict Distribution",
                      color_discrete_map={'High': '#28a745', 'Medium': '#ffc107', 'Low': '#dc3545'})
         fig.update_traces(textposition='inside', textinfo='percent+label')
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        # Score distribution
+        # Score distribution of the current page
         fig = px.histogram(df, x='relevance_score', nbins=20, 
-                          title="Score Distribution",
+                          title="Score Distribution (current page)",
                           color_discrete_sequence=['#1f77b4'])
         fig.update_layout(xaxis_title="Relevance Score", yaxis_title="Count")
         st.plotly_chart(fig, use_container_width=True)
     
     # Score trends over time
-    if 'created_at' in df.columns:
+    if len(df) > 0:
         df['created_at'] = pd.to_datetime(df['created_at'])
         df_sorted = df.sort_values('created_at')
         
         fig = px.line(df_sorted, x='created_at', y='relevance_score',
-                     title="Score Trends Over Time",
+                     title="Score Trends Over Time (current page)",
                      color_discrete_sequence=['#ff7f0e'])
         fig.update_layout(xaxis_title="Date", yaxis_title="Relevance Score")
         st.plotly_chart(fig, use_container_width=True)
     
-    # Filtering and search
-    st.markdown("#### 🔍 Filter & Search")
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        verdict_filter = st.selectbox("Filter by Verdict", ["All", "High", "Medium", "Low"])
-    
-    with col2:
-        score_range = st.slider("Score Range", 0, 100, (0, 100))
-    
-    with col3:
-        search_term = st.text_input("Search", placeholder="Search by ID or other fields")
-    
-    # Apply filters
+    # Search within the current page
     filtered_df = df.copy()
     
-    if verdict_filter != "All":
-        filtered_df = filtered_df[filtered_df['verdict'] == verdict_filter]
-    
-    filtered_df = filtered_df[
-        (filtered_df['relevance_score'] >= score_range[0]) & 
-        (filtered_df['relevance_score'] <= score_range[1])
-    ]
-    
     if search_term:
         filtered_df = filtered_df[filtered_df.astype(str).apply(lambda x: x.str.contains(search_term, case=False, na=False)).any(axis=1)]
     
     # Results table with enhanced display
-    st.markdown(f"#### 📋 Evaluation Results ({len(filtered_df)} found)")
+    st.markdown(f"#### 📋 Evaluation Results (page {len(cursors)}, {len(filtered_df)} shown)")
+    
+    col_prev, col_next = st.columns(2)
+    with col_prev:
+        if st.button("⬅️ Previous Page", use_container_width=True, disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with col_next:
+        if st.button("Next Page ➡️", use_container_width=True, disabled=next_after_id is None):
+            cursors.append(next_after_id)
+            st.rerun()
     
     if len(filtered_df) > 0:
         # Add color coding for verdicts
@@ -1623,7 +1683,7 @@ def manage_data():
     
     with tab1:
         st.write("**Resumes**")
-        resumes = make_api_request("/resumes/")
+        resumes = get_all_pages("/resumes/")
         
         if resumes:
             for resume in resumes:
@@ -1641,7 +1701,7 @@ def manage_data():
     
     with tab2:
         st.write("**Job Descriptions**")
-        job_descriptions = make_api_request("/job-descriptions/")
+        job_descriptions = get_all_pages("/job-descriptions/")
         
         if job_descriptions:
             for jd in job_descriptions:
@@ -2066,17 +2126,17 @@ def main():
         # Quick stats in sidebar
         st.markdown("### 📊 Quick Stats")
         
-        resumes = make_api_request("/resumes/")
-        job_descriptions = make_api_request("/job-descriptions/")
-        evaluations = make_api_request("/evaluations/")
+        total_resumes = get_total_count("/resumes/")
+        total_job_descriptions = get_total_count("/job-descriptions/")
+        evaluation_summary = make_api_request("/evaluations/summary")
+        total_evaluations = evaluation_summary.get('count', 0) if evaluation_summary else 0
         
-        st.metric("Resumes", len(resumes) if resumes else 0)
-        st.metric("Job Descriptions", len(job_descriptions) if job_descriptions else 0)
-        st.metric("Evaluations", len(evaluations) if evaluations else 0)
+        st.metric("Resumes", total_resumes)
+        st.metric("Job Descriptions", total_job_descriptions)
+        st.metric("Evaluations", total_evaluations)
         
-        if evaluations:
-            avg_score = sum(e['relevance_score'] for e in evaluations) / len(evaluations)
-            st.metric("Avg Score", f"{avg_score:.1f}")
+        if total_evaluations:
+            st.metric("Avg Score", f"{evaluation_summary['average_score']:.1f}")
         
         st.markdown("---")
         
@@ -2111,17 +2171,17 @@ def main():
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.markdown(create_metric_card("Total Resumes", str(len(resumes) if resumes else 0), "📄", "#1f77b4"), unsafe_allow_html=True)
+            st.markdown(create_metric_card("Total Resumes", str(total_resumes), "📄", "#1f77b4"), unsafe_allow_html=True)
         
         with col2:
-            st.markdown(create_metric_card("Total Job Descriptions", str(len(job_descriptions) if job_descriptions else 0), "💼", "#ff7f0e"), unsafe_allow_html=True)
+            st.markdown(create_metric_card("Total Job Descriptions", str(total_job_descriptions), "💼", "#ff7f0e"), unsafe_allow_html=True)
         
         with col3:
-            st.markdown(create_metric_card("Total Evaluations", str(len(evaluations) if evaluations else 0), "🔍", "#28a745"), unsafe_allow_html=True)
+            st.markdown(create_metric_card("Total Evaluations", str(total_evaluations), "🔍", "#28a745"), unsafe_allow_html=True)
         
         with col4:
-            if evaluations:
-                avg_score = sum(e['relevance_score'] for e in evaluations) / len(evaluations)
+            if total_evaluations:
+                avg_score = evaluation_summary['average_score']
                 st.markdown(create_metric_card("Average Score", f"{avg_score:.1f}", "📊", "#6c757d"), unsafe_allow_html=True)
             else:
                 st.markdown(create_metric_card("Average Score", "N/A", "📊", "#6c757d"), unsafe_allow_html=True)
@@ -2147,12 +2207,11 @@ def main():
                 st.rerun()
         
         # Recent activity
-        if evaluations:
+        recent_evaluations = make_api_request("/evaluations/?sort=-id&limit=5&fields=verdict,relevance_score") if total_evaluations else []
+        if recent_evaluations:
             st.markdown("### 📈 Recent Activity")
             
-            recent_evaluations = evaluations[-5:]  # Last 5 evaluations
-            
-            for eval in recent_evaluations:
+            for eval in reversed(recent_evaluations):  # Last 5 evaluations
                 verdict_icon = get_verdict_icon(eval['verdict'])
                 st.markdown(f"""
                 <div class="evaluation-card" style="margin: 0.5rem 0;">